@@ -0,0 +1,5 @@
+"""
+Offline benchmarks for WhatsApp Bot SMGM.
+
+Run from the repository root with ``python -m benchmarks.run_benchmark``.
+"""
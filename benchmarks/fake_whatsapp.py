@@ -0,0 +1,448 @@
+"""
+Local WhatsApp Web stand-in for WhatsApp Bot SMGM benchmarks.
+
+This module serves a small single-page app that honours the DOM contracts the
+bot relies on (the #app container, the #pane-side chat list and its search
+box, the conversation header with the group subtitle, the group info panel
+with its virtualized participant list, the contact-info drawer, the
+send?phone= footer with its compose box and send button, in-app wa.me deep
+links and the in-page collections used by the bulk extractor). Every step
+answers after a configurable latency, so the real bot code can be timed
+without a phone or a real group.
+
+Author: Diego Bloise
+Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
+"""
+
+import json
+import threading
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class FakeWhatsAppConfig:
+    """
+    Shape and timing of the fake WhatsApp Web.
+
+    Attributes:
+        group_name (str): Title of the benchmark group
+        members (int): Number of participants besides the logged-in account
+        saved_ratio (float): Fraction of participants saved as named contacts
+        business_ratio (float): Fraction of participants flagged as business
+        invalid_ratio (float): Fraction of participants whose phone is not on
+            WhatsApp, answered with the invalid number dialog
+        bulk_enabled (bool): Whether the in-page collections are exposed
+        header_limit (int): Names listed in the group subtitle before it is
+            truncated with "and N others", 0 to list everyone
+        list_rows (int): Participant rows visible at once in group info
+        startup_latency_ms (int): Delay before the chat list appears
+        search_latency_ms (int): Delay before search results are rendered
+        open_chat_latency_ms (int): Delay before an opened chat is rendered
+        drawer_latency_ms (int): Delay before the contact drawer is rendered
+        list_render_latency_ms (int): Delay before scrolled participant rows
+            are rendered
+        send_latency_ms (int): Delay before a send?phone= chat is ready after
+            the page reload
+        dispatch_latency_ms (int): Delay before a sent message leaves the box
+        ack_latency_ms (int): Delay before a sent message gets its tick
+    """
+
+    group_name: str = "Benchmark Group"
+    members: int = 50
+    saved_ratio: float = 0.2
+    business_ratio: float = 0.05
+    invalid_ratio: float = 0.0
+    bulk_enabled: bool = True
+    header_limit: int = 0
+    list_rows: int = 12
+    startup_latency_ms: int = 300
+    search_latency_ms: int = 150
+    open_chat_latency_ms: int = 100
+    drawer_latency_ms: int = 100
+    list_render_latency_ms: int = 30
+    send_latency_ms: int = 300
+    dispatch_latency_ms: int = 50
+    ack_latency_ms: int = 100
+
+
+def build_participants(config: FakeWhatsAppConfig) -> List[Dict[str, Any]]:
+    """
+    Generate the participants of the benchmark group.
+
+    Args:
+        config (FakeWhatsAppConfig): Shape of the fake group
+
+    Returns:
+        List[Dict[str, Any]]: Participants with phone digits, name and flags
+    """
+    saved = int(config.members * config.saved_ratio)
+    business = int(config.members * config.business_ratio)
+    invalid = int(config.members * config.invalid_ratio)
+    participants = []
+
+    for index in range(config.members):
+        participants.append({
+            "user": f"55119{index:08d}",
+            "name": f"Contact {index:05d}" if index < saved else "",
+            "is_business": index >= config.members - business,
+            "is_me": False,
+            # Unsaved members, so they are among the benchmark's recipients
+            "invalid": saved <= index < saved + invalid,
+        })
+
+    return participants
+
+
+def format_phone(user: str) -> str:
+    """Format phone digits the way WhatsApp Web displays them."""
+    return f"+{user[:2]} {user[2:4]} {user[4:9]}-{user[9:]}"
+
+
+_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>WhatsApp</title>
+<style>
+  #app { min-height: 100vh; }
+  #pane-side { min-height: 50px; }
+  [role=button], button, span[title] { display: inline-block; min-width: 10px; min-height: 10px; }
+  .row { display: block; padding: 2px; }
+</style>
+</head>
+<body>
+<div id="app"></div>
+<script>
+var DATA = __DATA__;
+(function () {
+  var CFG = DATA.config;
+  var app = document.getElementById('app');
+  var chats = {};
+  var directChats = {};
+  var activeId = null;
+  var searchSeq = 0;
+
+  function el(tag, attrs, text) {
+    var node = document.createElement(tag);
+    Object.keys(attrs || {}).forEach(function (key) { node.setAttribute(key, attrs[key]); });
+    if (text !== undefined) { node.textContent = text; }
+    return node;
+  }
+
+  function wid(user, server) {
+    return { user: user, server: server, _serialized: user + '@' + server };
+  }
+
+  // Chats: the group itself plus one chat per saved contact
+  var groupId = wid('120363000000000000', 'g.us');
+  chats[DATA.config.group_name] = { id: groupId, isGroup: true, title: CFG.group_name, subtitle: DATA.subtitle };
+  DATA.participants.forEach(function (p) {
+    if (p.name) {
+      chats[p.name] = { id: wid(p.user, 'c.us'), isGroup: false, title: p.name, phone: DATA.formatted[p.user] };
+    }
+  });
+
+  // Phones that are not on WhatsApp
+  var INVALID = {};
+  DATA.participants.forEach(function (p) { if (p.invalid) { INVALID[p.user] = true; } });
+
+  if (CFG.bulk_enabled) {
+    var models = DATA.participants.map(function (p) {
+      return { id: wid(p.user, 'c.us'), name: p.name, isBusiness: p.is_business, isMe: p.is_me };
+    });
+    var collections = {
+      Chat: { getModelsArray: function () {
+        var all = Object.keys(chats).map(function (key) { return chats[key]; });
+        Object.keys(directChats).forEach(function (key) { all.push(directChats[key]); });
+        return all.map(function (chat) {
+          return { id: chat.id, isGroup: chat.isGroup, active: chat.id._serialized === activeId };
+        });
+      } },
+      GroupMetadata: { get: function (id) {
+        if (id._serialized !== groupId._serialized) { return null; }
+        return { participants: { getModels: function () { return models.map(function (m) { return { id: m.id }; }); } } };
+      } },
+      Contact: { get: function (id) {
+        for (var i = 0; i < models.length; i++) {
+          if (models[i].id._serialized === id._serialized) { return models[i]; }
+        }
+        return null;
+      } }
+    };
+    window.require = function (name) {
+      if (name === 'WAWebCollections') { return collections; }
+      throw new Error('Unknown module ' + name);
+    };
+  }
+
+  function shell() {
+    var header = el('header');
+    var status = el('button', { 'data-testid': 'menu-bar-status', 'aria-label': 'Status' }, 'S');
+    var chatsButton = el('button', { 'data-testid': 'menu-bar-chats', 'aria-label': 'Chats' }, 'C');
+    status.addEventListener('click', function () { side.style.display = 'none'; });
+    chatsButton.addEventListener('click', function () { side.style.display = 'block'; });
+    header.appendChild(status);
+    header.appendChild(chatsButton);
+
+    var side = el('div', { id: 'side' });
+    var search = el('div', { role: 'textbox', contenteditable: 'true', 'data-testid': 'chat-list-search' });
+    search.style.minHeight = '20px';
+    search.addEventListener('input', function () {
+      var seq = ++searchSeq;
+      var query = search.textContent;
+      setTimeout(function () { if (seq === searchSeq) { results(query); } }, CFG.search_latency_ms);
+    });
+    side.appendChild(search);
+    side.appendChild(el('div', { id: 'pane-side' }));
+
+    app.appendChild(header);
+    app.appendChild(side);
+    app.appendChild(el('div', { id: 'main' }));
+    results('');
+  }
+
+  function results(query) {
+    var pane = document.getElementById('pane-side');
+    pane.innerHTML = '';
+    query = query.trim().toLowerCase();
+    Object.keys(chats).forEach(function (key) {
+      if (key.toLowerCase().indexOf(query) === -1) { return; }
+      var row = el('div', { role: 'row', 'class': 'row' });
+      var title = el('span', { title: key }, key);
+      title.addEventListener('click', function () { openChat(chats[key]); });
+      row.appendChild(title);
+      pane.appendChild(row);
+    });
+  }
+
+  function renderHeader(main, title, subtitle) {
+    var header = el('header', { 'data-testid': 'conversation-header' });
+    var info = el('div', { role: 'button', title: 'Profile details', 'data-testid': 'conversation-info-header' });
+    info.appendChild(el('span', { title: title }, title));
+    header.appendChild(info);
+    if (subtitle) {
+      var sub = el('div', { 'data-testid': 'chat-subtitle' });
+      sub.appendChild(el('span', { title: subtitle }, subtitle));
+      header.appendChild(sub);
+    }
+    main.appendChild(header);
+    return info;
+  }
+
+  function openChat(chat) {
+    setTimeout(function () {
+      var main = document.getElementById('main');
+      main.innerHTML = '';
+      activeId = chat.id._serialized;
+      var info = renderHeader(main, chat.title, chat.subtitle);
+      info.addEventListener('click', function () {
+        setTimeout(function () {
+          if (chat.isGroup) { openGroupInfo(); } else { openDrawer(chat); }
+        }, CFG.drawer_latency_ms);
+      });
+    }, CFG.open_chat_latency_ms);
+  }
+
+  function openDrawer(chat) {
+    var drawer = el('section');
+    drawer.appendChild(el('span', { 'data-testid': 'contact-info-phone', 'class': 'copyable-text' }, chat.phone || ''));
+    document.getElementById('main').appendChild(drawer);
+  }
+
+  // Like the real app, only the rows around the visible part are rendered
+  function openGroupInfo() {
+    var ROW = 60;
+    var rows = [{ title: 'You', sub: '' }].concat(DATA.participants.map(function (p, i) {
+      return p.name ? { title: p.name, sub: '' } : { title: DATA.formatted[p.user], sub: '~ Member ' + i };
+    }));
+    var section = el('section', { 'data-testid': 'section-participants' });
+    section.appendChild(el('span', { 'data-testid': 'participant-count' }, rows.length + ' members'));
+    var scroller = el('div');
+    scroller.style.height = (CFG.list_rows * ROW) + 'px';
+    scroller.style.overflowY = 'auto';
+    var list = el('div', { role: 'list' });
+    list.style.position = 'relative';
+    list.style.height = (rows.length * ROW) + 'px';
+    scroller.appendChild(list);
+    section.appendChild(scroller);
+
+    function render() {
+      var first = Math.max(0, Math.floor(scroller.scrollTop / ROW) - 2);
+      var last = Math.min(rows.length, first + CFG.list_rows + 4);
+      list.innerHTML = '';
+      for (var i = first; i < last; i++) {
+        var item = el('div', { role: 'listitem' });
+        item.style.position = 'absolute';
+        item.style.top = (i * ROW) + 'px';
+        item.style.height = ROW + 'px';
+        item.appendChild(el('span', { title: rows[i].title }, rows[i].title));
+        if (rows[i].sub) { item.appendChild(el('div', {}, rows[i].sub)); }
+        list.appendChild(item);
+      }
+    }
+    scroller.addEventListener('scroll', function () { setTimeout(render, CFG.list_render_latency_ms); });
+    render();
+    document.getElementById('main').appendChild(section);
+  }
+
+  function openSendChat(phone, text) {
+    if (INVALID[phone]) {
+      var popup = el('div', { role: 'dialog', 'data-animate-modal-popup': 'true' },
+        'Phone number shared via url is invalid.');
+      var ok = el('button', {}, 'OK');
+      ok.addEventListener('click', function () { popup.remove(); });
+      popup.appendChild(ok);
+      app.appendChild(popup);
+      return;
+    }
+    var main = document.getElementById('main');
+    main.innerHTML = '';
+    var id = wid(phone, 'c.us');
+    directChats[id._serialized] = { id: id, isGroup: false };
+    activeId = id._serialized;
+    renderHeader(main, '+' + phone, '');
+    var footer = el('footer');
+    var box = el('div', {
+      role: 'textbox', contenteditable: 'true', 'data-testid': 'conversation-compose-box-input'
+    }, text);
+    box.style.minHeight = '20px';
+    var send = el('button', { 'data-testid': 'compose-btn-send', 'aria-label': 'Send' }, '>');
+    // Like the real app, the send button only shows while there is a draft
+    function refresh() {
+      if (box.textContent.trim()) {
+        if (!send.parentNode) { footer.appendChild(send); }
+      } else if (send.parentNode) {
+        send.remove();
+      }
+    }
+    box.addEventListener('input', refresh);
+    send.addEventListener('click', function () {
+      var sent = box.innerText;
+      setTimeout(function () {
+        box.textContent = '';
+        refresh();
+        // The message shows a clock until the server acknowledges it
+        var tick = el('span', { 'data-icon': 'msg-time' });
+        var message = el('div', { 'class': 'message-out' }, sent);
+        message.appendChild(tick);
+        main.appendChild(el('div', { 'data-id': 'true_' + Date.now() + '_' + Math.random() }, message));
+        setTimeout(function () { tick.setAttribute('data-icon', 'msg-check'); }, CFG.ack_latency_ms);
+      }, CFG.dispatch_latency_ms);
+    });
+    footer.appendChild(box);
+    main.appendChild(footer);
+    refresh();
+  }
+
+  // wa.me links are handled inside the app, without reloading it
+  document.addEventListener('click', function (event) {
+    var link = event.target.closest ? event.target.closest('a[href]') : null;
+    var match = link && /^https:\/\/wa\.me\/(\d+)/.exec(link.href);
+    if (!match) { return; }
+    event.preventDefault();
+    setTimeout(function () { openSendChat(match[1], ''); }, CFG.open_chat_latency_ms);
+  });
+
+  setTimeout(function () {
+    shell();
+    if (window.location.pathname.indexOf('/send') === 0) {
+      var params = new URLSearchParams(window.location.search);
+      setTimeout(function () {
+        openSendChat(params.get('phone') || '', params.get('text') || '');
+      }, CFG.send_latency_ms);
+    }
+  }, CFG.startup_latency_ms);
+})();
+</script>
+</body>
+</html>
+"""
+
+
+class FakeWhatsAppServer:
+    """
+    In-process HTTP server hosting the fake WhatsApp Web.
+
+    Attributes:
+        config (FakeWhatsAppConfig): Shape and timing of the fake app
+        participants (List[Dict[str, Any]]): Generated group participants
+    """
+
+    def __init__(self, config: Optional[FakeWhatsAppConfig] = None, host: str = "127.0.0.1") -> None:
+        """
+        Initialize the server (not started yet).
+
+        Args:
+            config (Optional[FakeWhatsAppConfig]): Shape and timing of the app
+            host (str): Interface to listen on; a free port is picked
+        """
+        self.config = config or FakeWhatsAppConfig()
+        self.participants = build_participants(self.config)
+        self._page = self._render_page().encode("utf-8")
+        self._server = ThreadingHTTPServer((host, 0), self._handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def expected_phones(self) -> List[str]:
+        """Phones the bot should extract from the benchmark group."""
+        return [format_phone(p["user"]) for p in self.participants]
+
+    def _render_page(self) -> str:
+        """Embed the configuration and participants into the page."""
+        formatted = {p["user"]: format_phone(p["user"]) for p in self.participants}
+        names = ["You"] + [p["name"] or formatted[p["user"]] for p in self.participants]
+        limit = self.config.header_limit
+        if limit and len(names) > limit:
+            # WhatsApp shortens the subtitle of large groups
+            names = names[:limit] + [f"and {len(names) - limit} others"]
+        subtitle = ", ".join(names)
+        data = {
+            "config": asdict(self.config),
+            "participants": self.participants,
+            "formatted": formatted,
+            "subtitle": subtitle,
+        }
+        # Keep "</script>" out of the inline JSON
+        return _PAGE.replace("__DATA__", json.dumps(data).replace("</", "<\\/"))
+
+    def _handler(self) -> type:
+        """Build the request handler class bound to this server's page."""
+        page = self._page
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.startswith("/favicon"):
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(page)))
+                self.end_headers()
+                self.wfile.write(page)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    def start(self) -> "FakeWhatsAppServer":
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fake-whatsapp", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and release its port."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
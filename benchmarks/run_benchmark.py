@@ -0,0 +1,217 @@
+"""
+Offline throughput benchmark for WhatsApp Bot SMGM.
+
+This script starts the local WhatsApp Web stand-in, drives the real WhatsAppBot
+against it and reports per-phase timings (startup, group search, extraction
+per member, and send per message both through in-app navigation and through a
+full page reload) as JSON, so results can be tracked across versions without
+a phone or a real group.
+
+Author: Diego Bloise
+Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
+
+Usage:
+    python -m benchmarks.run_benchmark [--members N] [--messages N] [--lean] [--output FILE]
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.fake_whatsapp import FakeWhatsAppConfig, FakeWhatsAppServer
+from contact_cache import ContactCache
+from journal import SendOutcome
+from logger import Logger
+from throttle import RateGovernor
+from whatsapp_bot import WhatsAppBot
+
+BENCHMARK_ACCOUNT = "benchmark"
+
+
+def git_revision() -> Optional[str]:
+    """Get the current git revision of the bot, if available."""
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def digits(phone: str) -> str:
+    """Keep only the digits of a phone so formats can be compared."""
+    return "".join(c for c in phone if c.isdigit())
+
+
+def timed(phases: Dict[str, Dict[str, float]], name: str, items: int, action: Callable[[], Any]) -> Any:
+    """
+    Run an action and store its timing as a phase.
+
+    Args:
+        phases (Dict[str, Dict[str, float]]): Phase timings being collected
+        name (str): Phase name
+        items (int): Number of items processed by the phase
+        action (Callable[[], Any]): The work to time
+
+    Returns:
+        Any: The value returned by the action
+    """
+    start = time.perf_counter()
+    result = action()
+    elapsed = time.perf_counter() - start
+    phases[name] = {
+        "total_s": round(elapsed, 4),
+        "items": items,
+        "per_item_s": round(elapsed / items, 4) if items else 0.0,
+    }
+    return result
+
+
+def run(config: FakeWhatsAppConfig, messages: int, headless: bool, lean: bool = False) -> Dict[str, Any]:
+    """
+    Run one benchmark against a fresh fake WhatsApp Web.
+
+    Args:
+        config (FakeWhatsAppConfig): Shape and timing of the fake app
+        messages (int): Number of messages to send
+        headless (bool): Whether to run the browser headless
+        lean (bool): Whether the browser uses the lean profile
+
+    Returns:
+        Dict[str, Any]: Machine-readable benchmark report
+    """
+    server = FakeWhatsAppServer(config).start()
+    cache_dir = tempfile.mkdtemp(prefix="bench-cache-")
+    cache = ContactCache(os.path.join(cache_dir, "contacts.db"))
+    Logger.configure_metrics(True, os.path.join(cache_dir, "metrics"))
+    phases: Dict[str, Dict[str, float]] = {}
+    bot = None
+
+    try:
+        bot = timed(phases, "launch", 1, lambda: WhatsAppBot(
+            headless=headless, account=BENCHMARK_ACCOUNT,
+            contact_cache=cache, base_url=server.url,
+            # Measure the bot itself, not the pacing meant for real accounts
+            throttle=RateGovernor(enabled=False), lean=lean
+        ))
+        timed(phases, "startup", 1, bot.start_whatsapp)
+        timed(phases, "search", 1, lambda: bot.find_group(config.group_name))
+        phones: List[str] = timed(
+            phases, "extraction", config.members, bot.get_group_phones
+        )
+
+        recipients = phones[:messages]
+        results = timed(
+            phases, "send", len(recipients),
+            lambda: [bot.send_message(phone, "Benchmark message") for phone in recipients]
+        )
+
+        # Same recipients again, reloading the app for every chat; invalid
+        # phones are tried again so both passes do the same work
+        bot.in_app_navigation = False
+        for phone in recipients:
+            cache.forget_invalid(phone)
+        reload_results = timed(
+            phases, "send_reload", len(recipients),
+            lambda: [bot.send_message(phone, "Benchmark message") for phone in recipients]
+        )
+        send_per_item = phases["send"]["per_item_s"]
+
+        expected = {digits(phone) for phone in server.expected_phones()}
+        return {
+            "revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "config": asdict(config),
+            "phases": phases,
+            "extracted": len(phones),
+            "extraction_correct": len(expected.intersection(map(digits, phones))),
+            "sent": sum(1 for sent in results if sent),
+            "sent_reload": sum(1 for sent in reload_results if sent),
+            "invalid": sum(1 for outcome in results if outcome == SendOutcome.INVALID),
+            "send_speedup": (
+                round(phases["send_reload"]["per_item_s"] / send_per_item, 2)
+                if send_per_item else None
+            ),
+            "waits": bot.get_wait_stats(),
+            "locators": bot.get_locator_stats(),
+            "throttle": bot.get_throttle_stats(),
+            "browser": bot.get_browser_stats(),
+            "spans": Logger.metrics.summary(),
+        }
+    finally:
+        if bot:
+            bot.cleanup()
+        cache.close()
+        server.stop()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    defaults = FakeWhatsAppConfig()
+    parser = argparse.ArgumentParser(description="Benchmark WhatsAppBot against a local fake WhatsApp Web.")
+    parser.add_argument("--members", type=int, default=defaults.members)
+    parser.add_argument("--saved-ratio", type=float, default=defaults.saved_ratio)
+    parser.add_argument("--no-bulk", action="store_true", help="Hide the in-page collections")
+    parser.add_argument(
+        "--invalid-ratio", type=float, default=defaults.invalid_ratio,
+        help="Fraction of members whose phone is not on WhatsApp"
+    )
+    parser.add_argument(
+        "--header-limit", type=int, default=defaults.header_limit, metavar="N",
+        help="Truncate the group subtitle after N names, like WhatsApp does for large groups"
+    )
+    parser.add_argument("--list-rows", type=int, default=defaults.list_rows, metavar="N")
+    parser.add_argument("--messages", type=int, default=10, help="Messages to send")
+    parser.add_argument("--startup-latency", type=int, default=defaults.startup_latency_ms, metavar="MS")
+    parser.add_argument("--search-latency", type=int, default=defaults.search_latency_ms, metavar="MS")
+    parser.add_argument("--open-chat-latency", type=int, default=defaults.open_chat_latency_ms, metavar="MS")
+    parser.add_argument("--drawer-latency", type=int, default=defaults.drawer_latency_ms, metavar="MS")
+    parser.add_argument("--send-latency", type=int, default=defaults.send_latency_ms, metavar="MS")
+    parser.add_argument("--dispatch-latency", type=int, default=defaults.dispatch_latency_ms, metavar="MS")
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--lean", action="store_true", help="Use the lean browser profile")
+    parser.add_argument("--output", help="Also append the JSON report as one line to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark and print its JSON report."""
+    args = parse_args(argv)
+    config = FakeWhatsAppConfig(
+        members=args.members,
+        saved_ratio=args.saved_ratio,
+        bulk_enabled=not args.no_bulk,
+        invalid_ratio=args.invalid_ratio,
+        header_limit=args.header_limit,
+        list_rows=args.list_rows,
+        startup_latency_ms=args.startup_latency,
+        search_latency_ms=args.search_latency,
+        open_chat_latency_ms=args.open_chat_latency,
+        drawer_latency_ms=args.drawer_latency,
+        send_latency_ms=args.send_latency,
+        dispatch_latency_ms=args.dispatch_latency,
+    )
+
+    Logger.info(f"Benchmarking {config.members} members, {args.messages} messages...")
+    report = run(config, args.messages, args.headless, args.lean)
+    line = json.dumps(report, sort_keys=True)
+
+    print(line)
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as output:
+            output.write(line + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
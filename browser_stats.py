@@ -0,0 +1,192 @@
+"""
+Browser resource reporting for WhatsApp Bot SMGM.
+
+This module measures what a bot's browser costs the host: the resident memory
+of the whole Firefox process tree (the main process and its content
+processes) and how long WhatsApp Web took to load. Memory is read through
+psutil when it is installed, and straight from /proc on Linux otherwise.
+
+Author: Diego Bloise
+Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+try:
+    import psutil
+except ImportError:  # psutil is optional
+    psutil = None
+
+_PROC_DIR = "/proc"
+
+# Navigation timing of the current page, in milliseconds since it started
+_PAGE_LOAD_SCRIPT = """
+var nav = performance.getEntriesByType ? performance.getEntriesByType('navigation')[0] : null;
+if (nav) {
+    return {dom_content_loaded: nav.domContentLoadedEventEnd, load: nav.loadEventEnd};
+}
+var t = performance.timing;
+return {dom_content_loaded: t.domContentLoadedEventEnd - t.navigationStart, load: t.loadEventEnd - t.navigationStart};
+"""
+
+
+@dataclass(frozen=True)
+class MemoryUsage:
+    """
+    Resident memory of a process tree.
+
+    Attributes:
+        rss_bytes (int): Summed resident set size of every process
+        processes (int): Number of processes in the tree
+    """
+
+    rss_bytes: int
+    processes: int
+
+    @property
+    def rss_mb(self) -> float:
+        """Resident memory in megabytes."""
+        return round(self.rss_bytes / (1024 * 1024), 1)
+
+
+def _proc_children() -> Dict[int, List[int]]:
+    """Map every process to its children by reading /proc."""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir(_PROC_DIR):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(os.path.join(_PROC_DIR, entry, "stat"), encoding="utf-8") as stat_file:
+                # The command name may contain spaces; fields resume after ")"
+                ppid = int(stat_file.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def _proc_rss(pid: int) -> Optional[int]:
+    """Read the resident memory of a process from /proc, in bytes."""
+    try:
+        with open(os.path.join(_PROC_DIR, str(pid), "status"), encoding="utf-8") as status_file:
+            for line in status_file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, IndexError, ValueError):
+        return None
+    # Kernel threads and zombies have no VmRSS
+    return 0
+
+
+def process_tree_memory(pid: int) -> Optional[MemoryUsage]:
+    """
+    Measure the resident memory of a process and all its descendants.
+
+    Args:
+        pid (int): Root of the process tree
+
+    Returns:
+        Optional[MemoryUsage]: The summed memory, or None if the process is
+        gone or memory cannot be read on this platform
+    """
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return None
+
+        rss = 0
+        for process in processes:
+            try:
+                rss += process.memory_info().rss
+            except psutil.Error:
+                # Content processes come and go while we walk the tree
+                continue
+        return MemoryUsage(rss, len(processes))
+
+    if not os.path.isdir(_PROC_DIR):
+        return None
+
+    children = _proc_children()
+    pids = [pid]
+    rss_bytes = 0
+    processes = 0
+    while pids:
+        current = pids.pop()
+        rss = _proc_rss(current)
+        if rss is None:
+            continue
+        rss_bytes += rss
+        processes += 1
+        pids.extend(children.get(current, []))
+
+    return MemoryUsage(rss_bytes, processes) if processes else None
+
+
+def browser_pid(driver: Any) -> Optional[int]:
+    """
+    Get the process ID of the Firefox instance behind a WebDriver.
+
+    Args:
+        driver: Firefox WebDriver
+
+    Returns:
+        Optional[int]: Firefox's PID, or geckodriver's (whose tree contains
+        Firefox) when the browser does not report it
+    """
+    pid = (getattr(driver, "capabilities", None) or {}).get("moz:processID")
+    if pid:
+        return int(pid)
+
+    service = getattr(driver, "service", None)
+    process = getattr(service, "process", None)
+    return process.pid if process is not None else None
+
+
+def page_load_times(driver: Any) -> Optional[Dict[str, float]]:
+    """
+    Get the navigation timing of the page currently loaded.
+
+    Args:
+        driver: WebDriver showing the page
+
+    Returns:
+        Optional[Dict[str, float]]: Seconds until DOMContentLoaded and until
+        the load event, or None if the browser does not expose them
+    """
+    try:
+        timing = driver.execute_script(_PAGE_LOAD_SCRIPT)
+    except Exception:
+        return None
+    if not timing:
+        return None
+
+    return {
+        "dom_content_loaded_s": round(max(timing["dom_content_loaded"], 0) / 1000, 3),
+        "load_s": round(max(timing["load"], 0) / 1000, 3),
+    }
+
+
+def collect(driver: Any) -> Dict[str, Any]:
+    """
+    Gather the memory and page-load figures of a browser.
+
+    Args:
+        driver: Firefox WebDriver
+
+    Returns:
+        Dict[str, Any]: rss_mb and processes (None when unavailable) plus the
+        page load timings
+    """
+    pid = browser_pid(driver)
+    memory = process_tree_memory(pid) if pid else None
+    stats: Dict[str, Any] = {
+        "pid": pid,
+        "rss_mb": memory.rss_mb if memory else None,
+        "processes": memory.processes if memory else None,
+    }
+    stats.update(page_load_times(driver) or {})
+    return stats
@@ -8,7 +8,14 @@ Author: Diego Bloise
 Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
 """
 
-from typing import List, Final
+from typing import Any, Dict, List, Final, Tuple
+
+# =============================================================================
+# WhatsApp Web Address
+# =============================================================================
+
+"""Base URL of WhatsApp Web."""
+WHATSAPP_WEB_URL: Final[str] = "https://web.whatsapp.com"
 
 # =============================================================================
 # WhatsApp Web XPath Selectors
@@ -22,10 +29,17 @@ QR_CODE_XPATH: Final[str] = f"{QR_CODE_BOX_XPATH}/div[2]/div[1]/div[2]/div/div/c
 MESSAGES_XPATH: Final[str] = "/html/body/div[1]/div/div/div/div/div[3]/div/header/div/div[1]/div/div[1]/span/button"
 STATUS_XPATH: Final[str] = "/html/body/div[1]/div/div/div/div/div[3]/div/header/div/div[1]/div/div[2]/span/button"
 
+"""Selectors for the chat search box and its results."""
+SEARCH_BOX_XPATH: Final[str] = "//div[@id='side']//*[@role='textbox' or self::input[@type='text']]"
+SEARCH_RESULT_TITLE_SELECTOR: Final[str] = "#pane-side span[title]"
+
 """XPath selectors for group and contact information."""
 GROUP_MEMBERS_XPATH: Final[str] = "/html/body/div[1]/div/div/div/div/div[3]/div/div[5]/div/header/div[2]/div[2]/span"
 CONTACT_INFO_XPATH: Final[str] = "/html/body/div[1]/div/div/div/div/div[3]/div/div[5]/div/header/div[2]/div/div/div/div/span"
 
+"""Labels WhatsApp Web uses for the logged-in account in the members list."""
+SELF_MEMBER_LABELS: Final[List[str]] = ["You", "Você", "Tú"]
+
 """XPath selectors for phone number extraction."""
 CONTACT_PHONE_XPATH: Final[str] = "/html/body/div[1]/div/div/div/div/div[3]/div/div[6]/span/div/span/div/div/section/div[1]/div[2]/div[2]/span/div/span"
 
@@ -36,6 +50,12 @@ BUSINESS_PHONE_XPATHS: Final[List[str]] = [
     "/html/body/div[1]/div/div/div/div/div[3]/div/div[6]/span/div/span/div/div/section/div[12]/div[3]/div/div/span/span/span"
 ]
 
+"""XPath selector for the header of the currently open conversation."""
+CONVERSATION_HEADER_XPATH: Final[str] = "//div[@id='main']//header"
+
+"""CSS selector for the chat rows of the forward dialog."""
+FORWARD_RESULT_SELECTOR: Final[str] = "div[role='dialog'] [role='listitem']"
+
 """XPath selector for message send button."""
 SEND_BUTTON_XPATH: Final[str] = "/html/body/div[1]/div/div/div/div/div[3]/div/div[5]/div/footer/div[1]/div/span/div/div/div/div[4]/div/span/button"
 
@@ -47,6 +67,296 @@ SEND_BUTTON_XPATH: Final[str] = "/html/body/div[1]/div/div/div/div/div[3]/div/di
 INITIAL_STARTUP_ID: Final[str] = "app"
 PANE_SIDE_ID: Final[str] = "pane-side"
 
+# =============================================================================
+# Locator Fallback Chains
+# =============================================================================
+
+"""
+Ordered (strategy, value) candidates per logical element.
+
+Strategies are Selenium's By values ("css selector", "xpath", "id"). Stable
+data-testid attributes come first, ARIA roles and labels next, and the
+absolute XPaths above are kept as the last resort. The candidate that
+resolved last time is tried first on the next lookup.
+"""
+LOCATORS: Final[Dict[str, List[Tuple[str, str]]]] = {
+    "app": [
+        ("id", INITIAL_STARTUP_ID),
+    ],
+    "pane_side": [
+        ("id", PANE_SIDE_ID),
+        ("css selector", "[data-testid='chat-list']"),
+        ("xpath", "//div[@role='grid'][@aria-label]"),
+    ],
+    "qr_code_box": [
+        ("css selector", "div[data-ref]"),
+        ("xpath", QR_CODE_BOX_XPATH),
+    ],
+    "qr_code": [
+        ("css selector", "div[data-ref] canvas"),
+        ("xpath", "//canvas[@role='img']"),
+        ("xpath", QR_CODE_XPATH),
+    ],
+    "status_button": [
+        ("css selector", "[data-testid='menu-bar-status']"),
+        ("xpath", "//header//*[@role='button' or self::button][@aria-label='Status']"),
+        ("xpath", STATUS_XPATH),
+    ],
+    "messages_button": [
+        ("css selector", "[data-testid='menu-bar-chats']"),
+        ("xpath", "//header//*[@role='button' or self::button][@aria-label='Chats']"),
+        ("xpath", MESSAGES_XPATH),
+    ],
+    "search_box": [
+        ("css selector", "[data-testid='chat-list-search']"),
+        ("xpath", "//div[@id='side']//*[@role='textbox'][@contenteditable='true']"),
+        ("xpath", SEARCH_BOX_XPATH),
+    ],
+    "conversation_header": [
+        ("css selector", "[data-testid='conversation-header']"),
+        ("css selector", "#main header"),
+        ("xpath", CONVERSATION_HEADER_XPATH),
+    ],
+    "group_members": [
+        ("css selector", "[data-testid='chat-subtitle'] span[title]"),
+        ("xpath", "//div[@id='main']//header//span[contains(@title, ', ')]"),
+        ("xpath", GROUP_MEMBERS_XPATH),
+    ],
+    "contact_info_button": [
+        ("css selector", "[data-testid='conversation-info-header']"),
+        ("xpath", "//div[@id='main']//header//*[@role='button'][@title='Profile details']"),
+        ("xpath", CONTACT_INFO_XPATH),
+    ],
+    "participants_view_all": [
+        ("css selector", "[data-testid='section-participants'] [data-testid='view-all']"),
+        ("xpath", "//section//*[@role='button'][starts-with(normalize-space(), 'View all')]"),
+    ],
+    "participant_dialog": [
+        ("css selector", "[data-testid='participants-dialog']"),
+        ("css selector", "div[role='dialog']"),
+    ],
+    "participant_list": [
+        ("css selector", "div[role='dialog'] [role='list']"),
+        ("css selector", "[data-testid='section-participants'] [role='list']"),
+        ("xpath", "//section//div[@role='list'][.//*[@role='listitem']]"),
+    ],
+    "participant_count": [
+        ("css selector", "[data-testid='section-participants'] [data-testid='participant-count']"),
+        ("xpath", "//section//span[contains(., ' members') or contains(., ' participants')]"),
+    ],
+    "contact_phone": [
+        ("css selector", "[data-testid='contact-info-phone']"),
+        ("xpath", "//section//span[contains(@class, 'copyable-text')][starts-with(normalize-space(), '+')]"),
+        ("xpath", CONTACT_PHONE_XPATH),
+        *(("xpath", xpath) for xpath in BUSINESS_PHONE_XPATHS),
+    ],
+    "chat_footer": [
+        ("css selector", "#main footer"),
+        ("tag name", "footer"),
+    ],
+    "compose_box": [
+        ("css selector", "[data-testid='conversation-compose-box-input']"),
+        ("css selector", "footer div[contenteditable='true'][role='textbox']"),
+        ("xpath", "//footer//div[@contenteditable='true']"),
+    ],
+    "attach_button": [
+        ("css selector", "[data-testid='attach-menu-plus']"),
+        ("css selector", "[data-testid='clip']"),
+        ("xpath", "//footer//*[@role='button' or self::button][@title='Attach' or @aria-label='Attach']"),
+    ],
+    "attach_media_input": [
+        ("css selector", "input[type='file'][accept*='image']"),
+    ],
+    "attach_document_input": [
+        ("css selector", "input[type='file'][accept='*']"),
+        ("css selector", "input[type='file']:not([accept*='image'])"),
+    ],
+    "media_caption": [
+        ("css selector", "[data-testid='media-caption-input-container'] [contenteditable='true']"),
+        ("xpath", "//div[@contenteditable='true'][@aria-label='Add a caption' or @aria-placeholder='Add a caption']"),
+    ],
+    "media_send_button": [
+        ("css selector", "[data-testid='media-editor-send']"),
+        ("css selector", "[data-testid='send']"),
+        ("xpath", "//*[@role='button'][@aria-label='Send']"),
+        ("css selector", "span[data-icon='send']"),
+    ],
+    "outgoing_message": [
+        ("css selector", "#main [data-testid='msg-container'] .message-out"),
+        ("css selector", "#main .message-out"),
+    ],
+    "message_pending": [
+        ("css selector", "#main .message-out [data-testid='msg-time']"),
+        ("css selector", "#main .message-out span[data-icon='msg-time']"),
+    ],
+    "message_menu": [
+        ("css selector", "[data-testid='icon-down-context']"),
+        ("css selector", "span[data-icon='down-context']"),
+        ("xpath", ".//*[@role='button'][@aria-label='Context menu' or @aria-label='Context Menu']"),
+    ],
+    "forward_option": [
+        ("css selector", "[data-testid='mi-msg-forward']"),
+        ("xpath", "//*[@role='application' or @role='menu']//*[@role='button' or @role='menuitem'][normalize-space()='Forward']"),
+    ],
+    "forward_dialog": [
+        ("css selector", "[data-testid='forward-dialog']"),
+        ("css selector", "div[role='dialog']"),
+    ],
+    "forward_search": [
+        ("xpath", "//div[@role='dialog']//div[@contenteditable='true'][@role='textbox']"),
+        ("css selector", "div[role='dialog'] input[type='text']"),
+    ],
+    "forward_send_button": [
+        ("css selector", "div[role='dialog'] [data-testid='send']"),
+        ("xpath", "//div[@role='dialog']//*[@role='button'][@aria-label='Send']"),
+        ("css selector", "div[role='dialog'] span[data-icon='send']"),
+    ],
+    "invalid_phone_dialog": [
+        ("xpath", "//*[@data-animate-modal-popup='true'][contains(., 'invalid') or contains(., 'inválido')]"),
+        ("xpath", "//div[@role='dialog'][contains(., 'invalid') or contains(., 'inválido')]"),
+    ],
+    "popup_ok_button": [
+        ("css selector", "[data-testid='popup-controls-ok']"),
+        ("xpath", "//*[@data-animate-modal-popup='true' or @role='dialog']//*[self::button or @role='button'][normalize-space()='OK']"),
+    ],
+    "send_button": [
+        ("css selector", "[data-testid='compose-btn-send']"),
+        ("xpath", "//footer//*[@role='button' or self::button][@aria-label='Send']"),
+        ("css selector", "footer span[data-icon='send']"),
+        ("xpath", SEND_BUTTON_XPATH),
+    ],
+}
+
+# =============================================================================
+# In-page Scripts
+# =============================================================================
+
+"""
+Script returning every participant of the open group in one round trip.
+
+It reads WhatsApp Web's own model collections and resolves to a list of
+{id, name, phone, is_saved, is_business, is_me} objects, or null when the
+collections are unavailable or the open chat is not a group. The name falls
+back to the member's own profile name when the account has not saved them.
+"""
+GROUP_PARTICIPANTS_SCRIPT: Final[str] = """
+var req = window.require;
+if (typeof req !== 'function') { return null; }
+var col;
+try { col = req('WAWebCollections'); } catch (e) { return null; }
+if (!col || !col.Chat || !col.GroupMetadata) { return null; }
+var chat = col.Chat.getModelsArray().find(function (c) { return c.active; });
+if (!chat || !chat.isGroup) { return null; }
+var meta = col.GroupMetadata.get(chat.id);
+if (!meta || !meta.participants) { return null; }
+return meta.participants.getModels().map(function (p) {
+    var wid = p.id;
+    var contact = col.Contact ? col.Contact.get(wid) : null;
+    var phoneWid = wid.server === 'c.us' ? wid : (p.phoneNumber || (contact && contact.phoneNumber));
+    return {
+        id: wid._serialized,
+        name: contact ? (contact.name || contact.pushname || contact.verifiedName || '') : '',
+        phone: phoneWid ? phoneWid.user : null,
+        is_saved: !!(contact && contact.name),
+        is_business: !!(contact && contact.isBusiness),
+        is_me: !!(contact && contact.isMe)
+    };
+});
+"""
+
+"""
+Script returning the phone digits of the open chat.
+
+Resolves to the user part of the active chat's ID, an empty string while no
+chat is active, or null when WhatsApp's collections are unavailable.
+"""
+ACTIVE_CHAT_SCRIPT: Final[str] = """
+var req = window.require;
+if (typeof req !== 'function') { return null; }
+var col;
+try { col = req('WAWebCollections'); } catch (e) { return null; }
+if (!col || !col.Chat) { return null; }
+var chat = col.Chat.getModelsArray().find(function (c) { return c.active; });
+return chat ? chat.id.user : '';
+"""
+
+"""
+Script opening the chat with arguments[0] (phone digits) without a reload.
+
+It clicks a wa.me link inside the app, which WhatsApp Web intercepts and
+handles as an in-app deep link, the same way as a link received in a chat.
+"""
+OPEN_CHAT_LINK_SCRIPT: Final[str] = """
+var link = document.createElement('a');
+link.href = 'https://wa.me/' + arguments[0];
+link.target = '_blank';
+link.rel = 'noopener noreferrer';
+(document.getElementById('main') || document.getElementById('app') || document.body).appendChild(link);
+link.click();
+link.remove();
+return true;
+"""
+
+"""
+Script reading the participant rows currently rendered in arguments[0].
+
+The list is virtualized, so only the rows near the visible part exist. Each
+row resolves to its title (a phone for unsaved members, the contact name
+otherwise) and its full text, which holds the "~ name" of unsaved members.
+"""
+PARTICIPANT_ROWS_SCRIPT: Final[str] = """
+var rows = arguments[0].querySelectorAll('[role="listitem"], [role="row"]');
+var result = [];
+for (var i = 0; i < rows.length; i++) {
+    var title = rows[i].querySelector('span[title]');
+    var text = rows[i].innerText || '';
+    result.push({title: title ? title.getAttribute('title') : text.split('\\n')[0], text: text});
+}
+return result;
+"""
+
+"""
+Script scrolling the participant list in arguments[0] by arguments[1] of its
+visible height.
+
+Scrolls the nearest scrollable ancestor and resolves to whether it moved.
+"""
+PARTICIPANT_SCROLL_SCRIPT: Final[str] = """
+var node = arguments[0];
+while (node && !(node.scrollHeight > node.clientHeight
+        && /(auto|scroll)/.test(getComputedStyle(node).overflowY))) {
+    node = node.parentElement;
+}
+if (!node) { return false; }
+var before = node.scrollTop;
+node.scrollTop = before + node.clientHeight * arguments[1];
+return node.scrollTop > before;
+"""
+
+"""
+Script reading the delivery status of the last message sent in the open chat.
+
+Resolves to {count, id, status}: the number of outgoing messages, the
+data-id of the last one and its tick icon as "pending" (clock), "sent"
+(single tick), "delivered" (double tick), "read" (double tick labelled as
+read), "error", or "" when the icon is missing or not recognized.
+"""
+LAST_OUTGOING_STATUS_SCRIPT: Final[str] = """
+var messages = document.querySelectorAll('#main .message-out');
+if (!messages.length) { return {count: 0, id: null, status: ''}; }
+var last = messages[messages.length - 1];
+var owner = last.closest('[data-id]');
+var icon = last.querySelector('span[data-icon^="msg-"], span[data-icon$="check"], span[data-icon="status-time"]');
+var name = icon ? icon.getAttribute('data-icon') : '';
+var label = icon ? (icon.getAttribute('aria-label') || '').trim().toLowerCase() : '';
+var status = '';
+if (/time|clock/.test(name)) { status = 'pending'; }
+else if (/dblcheck/.test(name)) { status = label === 'read' ? 'read' : 'delivered'; }
+else if (/check/.test(name)) { status = 'sent'; }
+else if (/error|alert/.test(name)) { status = 'error'; }
+return {count: messages.length, id: owner ? owner.getAttribute('data-id') : null, status: status};
+"""
+
 # =============================================================================
 # Timeout Configuration (in seconds)
 # =============================================================================
@@ -60,8 +370,33 @@ ELEMENT_WAIT_TIMEOUT: Final[int] = 30
 """Short timeout for quick element interactions."""
 SHORT_WAIT_TIMEOUT: Final[int] = 5
 
-"""Default sleep duration between actions."""
-DEFAULT_SLEEP: Final[float] = 0.5
+"""Timeout for a chat opened in the app before falling back to a reload."""
+IN_APP_OPEN_TIMEOUT: Final[int] = 5
+
+"""Timeout for a sent message to be acknowledged by WhatsApp's servers."""
+DELIVERY_TIMEOUT: Final[int] = 10
+
+"""Timeout for the chat list to show up when checking a session's health."""
+HEALTH_CHECK_TIMEOUT: Final[int] = 5
+
+"""Timeout for an attachment to finish uploading."""
+UPLOAD_TIMEOUT: Final[int] = 180
+
+"""Timeout for the participant list to render the rows of a new page."""
+PARTICIPANT_PAGE_TIMEOUT: Final[int] = 3
+
+# =============================================================================
+# Wait Engine Configuration (in seconds)
+# =============================================================================
+
+"""First polling interval used when waiting for a readiness condition."""
+POLL_INITIAL_INTERVAL: Final[float] = 0.05
+
+"""Upper bound for the polling interval after backoff."""
+POLL_MAX_INTERVAL: Final[float] = 0.5
+
+"""Multiplier applied to the polling interval after each unsuccessful poll."""
+POLL_BACKOFF_FACTOR: Final[float] = 1.5
 
 # =============================================================================
 # Browser and Window Configuration
@@ -70,6 +405,66 @@ DEFAULT_SLEEP: Final[float] = 0.5
 """Default browser window size."""
 DEFAULT_WINDOW_SIZE: Final[str] = "800,600"
 
+# =============================================================================
+# Lean Browser
+# =============================================================================
+
+"""Whether browsers start with LEAN_FIREFOX_PREFS by default."""
+LEAN_BROWSER: Final[bool] = False
+
+"""
+Firefox preferences trimming what WhatsApp Web loads and keeps in memory.
+
+Images, media autoplay and animations are blocked (the QR code is a canvas
+and keeps working), the caches and session history are shrunk and Firefox
+runs with a single content process.
+"""
+LEAN_FIREFOX_PREFS: Final[Dict[str, Any]] = {
+    "permissions.default.image": 2,
+    "media.autoplay.default": 5,
+    "media.autoplay.blocking_policy": 2,
+    "image.animation_mode": "none",
+    "ui.prefersReducedMotion": 1,
+    "toolkit.cosmeticAnimations.enabled": False,
+    "general.smoothScroll": False,
+    "browser.cache.disk.enable": False,
+    "browser.cache.memory.capacity": 16384,
+    "browser.sessionhistory.max_entries": 2,
+    "browser.sessionhistory.max_total_viewers": 0,
+    "dom.ipc.processCount": 1,
+    "dom.ipc.processCount.webIsolated": 1,
+    "fission.autostart": False,
+    "media.webspeech.synth.enabled": False,
+    "dom.webnotifications.enabled": False,
+}
+
+# =============================================================================
+# Browser Recycling
+# =============================================================================
+
+"""Whether long-lived browsers are reloaded or relaunched to keep memory flat."""
+RECYCLE_ENABLED: Final[bool] = True
+
+"""Seconds between two samples of the browser's resident memory."""
+MEMORY_SAMPLE_INTERVAL: Final[float] = 60.0
+
+"""
+Resident memory (MB) of the browser process tree that triggers a recycle.
+
+WhatsApp Web is reloaded first; if memory is still over the limit after the
+reload, the whole browser is relaunched. 0 disables the memory check.
+"""
+RECYCLE_RSS_MB: Final[int] = 1500
+
+"""Messages after which WhatsApp Web is reloaded, 0 to disable."""
+RECYCLE_PAGE_MESSAGES: Final[int] = 300
+
+"""Messages after which the browser is relaunched, 0 to disable."""
+RECYCLE_BROWSER_MESSAGES: Final[int] = 2000
+
+"""Seconds after which the browser is relaunched, 0 to disable (6 hours)."""
+RECYCLE_MAX_UPTIME: Final[int] = 6 * 60 * 60
+
 # =============================================================================
 # File Paths
 # =============================================================================
@@ -77,6 +472,225 @@ DEFAULT_WINDOW_SIZE: Final[str] = "800,600"
 """Path for temporary QR code image."""
 QR_CODE_IMAGE_PATH: Final[str] = "qrcode.png"
 
+# =============================================================================
+# Browser Profiles
+# =============================================================================
+
+"""Directory holding one persisted Firefox profile per WhatsApp account."""
+PROFILES_DIR: Final[str] = "profiles"
+
+"""Account used when none is specified."""
+DEFAULT_ACCOUNT: Final[str] = "default"
+
+"""Lock file created inside a profile while a process is using it."""
+PROFILE_LOCK_FILE: Final[str] = ".bot.lock"
+
+# =============================================================================
+# Contact Cache
+# =============================================================================
+
+"""SQLite database caching the phone number behind each saved contact."""
+CONTACT_CACHE_PATH: Final[str] = "contacts_cache.db"
+
+"""Seconds a cached contact phone stays valid (30 days)."""
+CONTACT_CACHE_TTL: Final[int] = 30 * 24 * 60 * 60
+
+"""Maximum number of cached contacts before the least recently used are evicted."""
+CONTACT_CACHE_MAX_ENTRIES: Final[int] = 50000
+
+"""Seconds a phone reported as not on WhatsApp is skipped without trying it (14 days)."""
+INVALID_PHONE_TTL: Final[int] = 14 * 24 * 60 * 60
+
+# =============================================================================
+# Campaign Journal
+# =============================================================================
+
+"""Directory holding one append-only journal per campaign."""
+CAMPAIGNS_DIR: Final[str] = "campaigns"
+
+"""Maximum seconds between two fsyncs of a campaign journal."""
+JOURNAL_FSYNC_INTERVAL: Final[float] = 5.0
+
+"""Maximum journal records written between two fsyncs."""
+JOURNAL_FSYNC_RECORDS: Final[int] = 100
+
+# =============================================================================
+# Phone Numbers
+# =============================================================================
+
+"""Country code given to numbers typed or displayed without one (Brazil)."""
+DEFAULT_COUNTRY_CODE: Final[str] = "55"
+
+"""Digit counts of a national number, area code included."""
+NATIONAL_NUMBER_LENGTHS: Final[Tuple[int, ...]] = (10, 11)
+
+"""Shortest and longest digit counts accepted as a phone number."""
+MIN_PHONE_DIGITS: Final[int] = 8
+E164_MAX_DIGITS: Final[int] = 15
+
+"""Longest exclusion treated as a suffix rather than a full number."""
+MAX_SUFFIX_DIGITS: Final[int] = 7
+
+# =============================================================================
+# In-app Navigation
+# =============================================================================
+
+"""Whether chats are opened inside the loaded app instead of reloading it."""
+IN_APP_NAVIGATION: Final[bool] = True
+
+"""Consecutive in-app failures after which a session only uses reloads."""
+IN_APP_MAX_FAILURES: Final[int] = 3
+
+# =============================================================================
+# Participant List
+# =============================================================================
+
+"""Fraction of the visible list scrolled per page; below 1 so pages overlap."""
+PARTICIPANT_SCROLL_FRACTION: Final[float] = 0.8
+
+"""Pages in a row that may fail to render before the walk gives up."""
+PARTICIPANT_MAX_STALLS: Final[int] = 3
+
+# =============================================================================
+# Message Templates
+# =============================================================================
+
+"""Placeholders every recipient has, on top of the CSV columns."""
+TEMPLATE_FIELDS: Final[Tuple[str, ...]] = ("name", "group", "phone")
+
+"""Longest text WhatsApp accepts in a single message."""
+MAX_MESSAGE_LENGTH: Final[int] = 65536
+
+# =============================================================================
+# Attachments
+# =============================================================================
+
+"""Chats an uploaded attachment is forwarded to at once (WhatsApp's limit)."""
+FORWARD_BATCH_SIZE: Final[int] = 5
+
+"""Extensions sent as photo/video rather than as a document."""
+MEDIA_EXTENSIONS: Final[Tuple[str, ...]] = (
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".mp4", ".3gp", ".mov"
+)
+
+# =============================================================================
+# Send Throttle
+# =============================================================================
+
+"""Whether sends are paced by the per-account rate governor."""
+THROTTLE_ENABLED: Final[bool] = True
+
+"""Starting, lowest and highest send rates, in messages per minute."""
+THROTTLE_INITIAL_RATE: Final[float] = 10.0
+THROTTLE_MIN_RATE: Final[float] = 1.0
+THROTTLE_MAX_RATE: Final[float] = 30.0
+
+"""Messages that may be sent back to back after an idle period."""
+THROTTLE_BURST: Final[int] = 3
+
+"""AIMD adaptation: rate added after a success, factor applied after a failure."""
+THROTTLE_INCREASE: Final[float] = 0.5
+THROTTLE_DECREASE: Final[float] = 0.5
+
+"""Random extra pause, as a fraction of the interval between two messages."""
+THROTTLE_JITTER: Final[float] = 0.3
+
+"""Most messages an account may send per rolling hour and rolling day."""
+THROTTLE_HOURLY_CAP: Final[int] = 200
+THROTTLE_DAILY_CAP: Final[int] = 1000
+
+"""Longest wait for a cap to free up before sending stops for now (seconds)."""
+THROTTLE_MAX_WAIT: Final[float] = 300.0
+
+"""File inside the account profile keeping recent sends across runs."""
+THROTTLE_STATE_FILE: Final[str] = "throttle.json"
+
+# =============================================================================
+# Streaming Pipeline
+# =============================================================================
+
+"""Phones buffered between the extraction and send stages in --stream mode."""
+PIPELINE_QUEUE_SIZE: Final[int] = 100
+
+# =============================================================================
+# Session Supervisor
+# =============================================================================
+
+"""Relaunch attempts in a row before a dead browser session is given up."""
+SUPERVISOR_MAX_RESTARTS: Final[int] = 3
+
+"""Seconds between two relaunch attempts, doubled after each failed one."""
+SUPERVISOR_RESTART_BACKOFF: Final[float] = 5.0
+
+"""Times a single operation is retried after the session it ran in died."""
+SUPERVISOR_MAX_RETRIES: Final[int] = 2
+
+# =============================================================================
+# Campaign Daemon
+# =============================================================================
+
+"""Directory the daemon reads campaign definitions (*.json) from."""
+QUEUE_DIR: Final[str] = "queue"
+
+"""Seconds between two scans of the queue while idle."""
+DAEMON_POLL_INTERVAL: Final[float] = 30.0
+
+"""Longest wait before retrying after the browser session failed, in seconds."""
+DAEMON_MAX_SESSION_BACKOFF: Final[float] = 15 * 60.0
+
+"""Local time window ("HH:MM", "HH:MM") messages may be sent in by default."""
+DAEMON_SEND_WINDOW: Final[Tuple[str, str]] = ("09:00", "20:00")
+
+"""Priority of campaigns that do not set one; higher runs first."""
+DAEMON_DEFAULT_PRIORITY: Final[int] = 0
+
+# =============================================================================
+# Logging
+# =============================================================================
+
+"""Lowest level printed on the console: "info", "success", "warn" or "error"."""
+LOG_CONSOLE_LEVEL: str = "info"
+
+"""Write every log record and timing event to a JSON Lines file."""
+LOG_FILE_ENABLED: bool = True
+
+"""Directory receiving the log file and its rotated backups."""
+LOG_DIR: Final[str] = "logs"
+
+"""Name of the JSON Lines log file."""
+LOG_FILE_NAME: Final[str] = "bot.jsonl"
+
+"""Size in bytes that rotates the log file (0 disables size rotation)."""
+LOG_MAX_BYTES: Final[int] = 10 * 1024 * 1024
+
+"""Age in seconds that rotates the log file (0 disables time rotation)."""
+LOG_ROTATE_INTERVAL: Final[float] = 24 * 60 * 60.0
+
+"""Rotated log files kept."""
+LOG_BACKUP_COUNT: Final[int] = 5
+
+"""Records buffered for the log writer before new ones are dropped."""
+LOG_QUEUE_SIZE: Final[int] = 10000
+
+"""Longest time in seconds a record waits in memory before being written."""
+LOG_FLUSH_INTERVAL: Final[float] = 1.0
+
+# =============================================================================
+# Metrics
+# =============================================================================
+
+"""Record timing spans around hot-path operations."""
+METRICS_ENABLED: bool = True
+
+"""Directory receiving metrics.json and metrics.prom."""
+METRICS_DIR: Final[str] = "metrics"
+
+"""Seconds between metric exports during long runs (0 exports only at the end)."""
+METRICS_EXPORT_INTERVAL: Final[float] = 60.0
+
+"""Recent durations kept per span to compute latency percentiles."""
+METRICS_MAX_SAMPLES: Final[int] = 10000
+
 # =============================================================================
 # Debug and Development Settings
 # =============================================================================
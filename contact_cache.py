@@ -0,0 +1,245 @@
+"""
+Persistent contact cache for WhatsApp Bot SMGM.
+
+This module stores the phone number behind each saved contact name in a small
+SQLite database, keyed by account and contact name. Resolving a saved contact
+through the WhatsApp Web interface takes several seconds, while the answer
+almost never changes between runs, so later extractions read it from disk.
+
+Entries expire after a configurable TTL and the least recently used entries
+are evicted once the cache grows past its size bound.
+
+The same database remembers phones WhatsApp reported as not on WhatsApp, so
+later campaigns skip them instead of waiting on the browser again. These
+entries expire after their own TTL, as numbers can join WhatsApp later on.
+
+Author: Diego Bloise
+Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from config import (
+    CONTACT_CACHE_PATH, CONTACT_CACHE_TTL, CONTACT_CACHE_MAX_ENTRIES, INVALID_PHONE_TTL
+)
+from phone_index import phone_digits
+
+
+class ContactCache:
+    """
+    SQLite backed contact-name to phone cache with TTL and LRU eviction.
+
+    Instances are safe to share between threads.
+
+    Attributes:
+        path (str): Location of the SQLite database
+        ttl (float): Seconds an entry stays valid after being stored
+        max_entries (int): Maximum number of entries kept on disk
+        invalid_ttl (float): Seconds a phone stays marked as not on WhatsApp
+        hits (int): Lookups answered from the cache
+        misses (int): Lookups that were missing or expired
+        invalid_hits (int): Phones skipped because they are marked invalid
+    """
+
+    def __init__(
+        self,
+        path: str = CONTACT_CACHE_PATH,
+        ttl: float = CONTACT_CACHE_TTL,
+        max_entries: int = CONTACT_CACHE_MAX_ENTRIES,
+        invalid_ttl: float = INVALID_PHONE_TTL
+    ) -> None:
+        """
+        Open (and create if needed) the cache database.
+
+        Args:
+            path (str): Location of the SQLite database
+            ttl (float): Seconds an entry stays valid after being stored
+            max_entries (int): Maximum number of entries kept on disk
+            invalid_ttl (float): Seconds a phone stays marked as not on WhatsApp
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.invalid_ttl = invalid_ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalid_hits = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS contacts ("
+            " account TEXT NOT NULL,"
+            " name TEXT NOT NULL,"
+            " phone TEXT NOT NULL,"
+            " stored_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL,"
+            " PRIMARY KEY (account, name))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS contacts_accessed_at ON contacts (accessed_at)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS invalid_phones ("
+            " digits TEXT PRIMARY KEY,"
+            " stored_at REAL NOT NULL)"
+        )
+
+    def get(self, account: str, name: str) -> Optional[str]:
+        """
+        Look up the phone of a saved contact.
+
+        Args:
+            account (str): Account the contact belongs to
+            name (str): Contact display name
+
+        Returns:
+            Optional[str]: The cached phone, or None if missing or expired
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT phone, stored_at FROM contacts WHERE account = ? AND name = ?",
+                (account, name)
+            ).fetchone()
+
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self._conn.execute(
+                        "DELETE FROM contacts WHERE account = ? AND name = ?",
+                        (account, name)
+                    )
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE contacts SET accessed_at = ? WHERE account = ? AND name = ?",
+                (now, account, name)
+            )
+            self.hits += 1
+            return row[0]
+
+    def put(self, account: str, name: str, phone: str) -> None:
+        """
+        Store the phone of a saved contact, evicting old entries if needed.
+
+        Args:
+            account (str): Account the contact belongs to
+            name (str): Contact display name
+            phone (str): Phone number behind the contact
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO contacts (account, name, phone, stored_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (account, name, phone, now, now)
+            )
+            self._evict()
+
+    def invalidate(self, account: str, name: str) -> bool:
+        """
+        Remove a single entry from the cache.
+
+        Args:
+            account (str): Account the contact belongs to
+            name (str): Contact display name
+
+        Returns:
+            bool: True if an entry was removed
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM contacts WHERE account = ? AND name = ?", (account, name)
+            )
+            return cursor.rowcount > 0
+
+    def is_invalid(self, phone: str) -> bool:
+        """
+        Check whether a phone was recently reported as not on WhatsApp.
+
+        Args:
+            phone (str): Phone number in any format
+
+        Returns:
+            bool: True if the phone is marked and the mark has not expired
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stored_at FROM invalid_phones WHERE digits = ?", (phone_digits(phone),)
+            ).fetchone()
+        if row is None or time.time() - row[0] > self.invalid_ttl:
+            return False
+        self.invalid_hits += 1
+        return True
+
+    def mark_invalid(self, phone: str) -> None:
+        """
+        Remember that a phone is not on WhatsApp, dropping expired marks.
+
+        Args:
+            phone (str): Phone number in any format
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO invalid_phones (digits, stored_at) VALUES (?, ?)",
+                (phone_digits(phone), now)
+            )
+            self._conn.execute(
+                "DELETE FROM invalid_phones WHERE stored_at < ?", (now - self.invalid_ttl,)
+            )
+
+    def forget_invalid(self, phone: str) -> bool:
+        """
+        Remove the invalid mark of a phone, so it is tried again.
+
+        Args:
+            phone (str): Phone number in any format
+
+        Returns:
+            bool: True if the phone was marked
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM invalid_phones WHERE digits = ?", (phone_digits(phone),)
+            )
+            return cursor.rowcount > 0
+
+    def _evict(self) -> None:
+        """Drop expired entries and trim the cache to its size bound."""
+        self._conn.execute(
+            "DELETE FROM contacts WHERE stored_at < ?", (time.time() - self.ttl,)
+        )
+        overflow = self._conn.execute("SELECT COUNT(*) FROM contacts").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM contacts WHERE rowid IN ("
+                " SELECT rowid FROM contacts ORDER BY accessed_at LIMIT ?)",
+                (overflow,)
+            )
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict[str, int]: Hits, misses and current number of entries, plus
+            the phones marked as not on WhatsApp and the sends they saved
+        """
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+            invalid = self._conn.execute("SELECT COUNT(*) FROM invalid_phones").fetchone()[0]
+        return {
+            "hits": self.hits, "misses": self.misses, "size": size,
+            "invalid": invalid, "invalid_hits": self.invalid_hits
+        }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,541 @@
+"""
+Unattended campaign daemon for WhatsApp Bot SMGM.
+
+This script runs campaigns without any prompt, so it can be started from cron
+or as a service. Campaign definitions are JSON files dropped into a queue
+directory; the daemon keeps one warm WhatsAppBot session, relaunched if the
+browser dies, and dispatches the due campaigns by priority, only sending
+inside each campaign's time window.
+
+A campaign file looks like:
+
+    {
+        "groups": ["Family Group", "Work Team"],
+        "message": "Hello {name|everyone}!\\\\nSee you tomorrow.",
+        "exclude": ["1234", "+5511999990001"],
+        "data": "contacts.csv",
+        "priority": 10,
+        "window": ["09:00", "18:00"],
+        "not_before": "2024-01-01T08:00:00"
+    }
+
+Only "groups" and "message" are required. The message may use the placeholders
+of main.py's --data, with "data" naming the CSV file, and an "attachment" is
+sent with the message as its caption; relative paths are resolved from the
+daemon's working directory. Files move from the queue directory to active/
+when their campaign starts (the campaign ID is written into them), and to
+done/ or failed/ when it ends. An active campaign interrupted by the end of
+its window, a shutdown or a crash resumes from its journal.
+
+Author: Diego Bloise
+Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
+
+Usage:
+    python daemon.py [--account NAME] [--queue DIR] [--poll SECONDS] [--lean] [--once] [--quiet]
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, time
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import (
+    DAEMON_DEFAULT_PRIORITY, DAEMON_MAX_SESSION_BACKOFF, DAEMON_POLL_INTERVAL,
+    DAEMON_SEND_WINDOW, DEFAULT_ACCOUNT, IS_DEBUG, LEAN_BROWSER, METRICS_DIR,
+    METRICS_ENABLED, METRICS_EXPORT_INTERVAL, METRICS_MAX_SAMPLES, QUEUE_DIR
+)
+from contact_cache import ContactCache
+from journal import CampaignJournal, SendStatus
+from logger import Logger
+from main import configure_logging, extract_groups, load_template, report_by_group
+from phone_index import filter_phones
+from send_pool import SendPool
+from templates import Personalizer
+from supervisor import BotSupervisor, SessionLostError
+
+
+def parse_clock(value: str) -> time:
+    """Parse a "HH:MM" local time of day."""
+    return datetime.strptime(value.strip(), "%H:%M").time()
+
+
+@dataclass
+class CampaignDefinition:
+    """
+    A campaign waiting in, or taken from, the queue directory.
+
+    Attributes:
+        path (str): Location of the definition file
+        groups (List[str]): Groups whose members are messaged
+        message (str): Message text
+        exclude (List[str]): Exclusion tokens, see PhoneFilter
+        attachment (Optional[str]): File sent with the message as its caption
+        data (Optional[str]): CSV file with the recipients' template values
+        priority (int): Higher priorities are dispatched first
+        window (Tuple[time, time]): Local hours messages may be sent in; a
+            window ending before it starts spans midnight
+        not_before (Optional[datetime]): Earliest start of the campaign
+        campaign_id (Optional[str]): Journal of the campaign once started
+    """
+
+    path: str
+    groups: List[str]
+    message: str
+    exclude: List[str] = field(default_factory=list)
+    attachment: Optional[str] = None
+    data: Optional[str] = None
+    priority: int = DAEMON_DEFAULT_PRIORITY
+    window: Tuple[time, time] = (parse_clock(DAEMON_SEND_WINDOW[0]), parse_clock(DAEMON_SEND_WINDOW[1]))
+    not_before: Optional[datetime] = None
+    campaign_id: Optional[str] = None
+
+    @classmethod
+    def from_file(cls, path: str) -> "CampaignDefinition":
+        """
+        Load a campaign definition.
+
+        Args:
+            path (str): Location of the JSON definition
+
+        Returns:
+            CampaignDefinition: The parsed definition
+
+        Raises:
+            ValueError: If the file is not a valid campaign definition
+        """
+        with open(path, encoding="utf-8") as definition_file:
+            data = json.load(definition_file)
+
+        if not isinstance(data, dict):
+            raise ValueError("definition must be a JSON object")
+        groups = data.get("groups")
+        if isinstance(groups, str):
+            groups = [groups]
+        if (not isinstance(groups, list) or not groups
+                or not all(isinstance(group, str) and group.strip() for group in groups)):
+            raise ValueError("'groups' must list at least one group name")
+        exclude = data.get("exclude") or []
+        if isinstance(exclude, str):
+            exclude = [exclude]
+        if not isinstance(exclude, list) or not all(isinstance(token, (str, int)) for token in exclude):
+            raise ValueError("'exclude' must be a token or a list of tokens")
+        if not isinstance(data.get("message"), str) or not data["message"].strip():
+            raise ValueError("'message' must be a non-empty string")
+        attachment = data.get("attachment")
+        if attachment is not None and not (isinstance(attachment, str) and os.path.isfile(attachment)):
+            raise ValueError(f"'attachment' must be an existing file: {attachment}")
+        data_path = data.get("data")
+        if data_path is not None and not (isinstance(data_path, str) and os.path.isfile(data_path)):
+            raise ValueError(f"'data' must be an existing CSV file: {data_path}")
+
+        window = data.get("window") or DAEMON_SEND_WINDOW
+        if (not isinstance(window, (list, tuple)) or len(window) != 2
+                or not all(isinstance(clock, str) for clock in window)):
+            raise ValueError("'window' must be [start, end] as two HH:MM times")
+        not_before = data.get("not_before")
+        if not_before and not isinstance(not_before, str):
+            raise ValueError("'not_before' must be an ISO 8601 date and time")
+        start = datetime.fromisoformat(not_before) if not_before else None
+        if start and start.tzinfo:
+            # Due times are compared with the naive local clock
+            start = start.astimezone().replace(tzinfo=None)
+        campaign_id = data.get("campaign_id")
+        if campaign_id is not None and not isinstance(campaign_id, str):
+            raise ValueError("'campaign_id' must be a string")
+
+        return cls(
+            path=path,
+            groups=list(dict.fromkeys(group.strip() for group in groups)),
+            message=data["message"],
+            exclude=[str(token) for token in exclude],
+            attachment=os.path.abspath(attachment) if attachment else None,
+            data=os.path.abspath(data_path) if data_path else None,
+            priority=int(data.get("priority", DAEMON_DEFAULT_PRIORITY)),
+            window=(parse_clock(window[0]), parse_clock(window[1])),
+            not_before=start,
+            campaign_id=campaign_id,
+        )
+
+    @property
+    def name(self) -> str:
+        """Name of the definition file without its extension."""
+        return os.path.splitext(os.path.basename(self.path))[0]
+
+    def in_window(self, now: datetime) -> bool:
+        """Check whether messages may be sent at the given local time."""
+        start, end = self.window
+        if start == end:
+            return True
+        if start < end:
+            return start <= now.time() < end
+        return now.time() >= start or now.time() < end
+
+    def is_due(self, now: datetime) -> bool:
+        """Check whether the campaign may run at the given local time."""
+        return (self.not_before is None or now >= self.not_before) and self.in_window(now)
+
+
+class CampaignQueue:
+    """
+    Campaign definitions stored as JSON files in a directory.
+
+    Attributes:
+        directory (str): Directory holding pending definitions
+        active_dir (str): Definitions of started campaigns
+        done_dir (str): Definitions of finished campaigns
+        failed_dir (str): Invalid definitions and campaigns that failed
+    """
+
+    def __init__(self, directory: str = QUEUE_DIR) -> None:
+        """
+        Initialize the queue, creating its directories if needed.
+
+        Args:
+            directory (str): Directory holding pending definitions
+        """
+        self.directory = directory
+        self.active_dir = os.path.join(directory, "active")
+        self.done_dir = os.path.join(directory, "done")
+        self.failed_dir = os.path.join(directory, "failed")
+        for path in (self.directory, self.active_dir, self.done_dir, self.failed_dir):
+            os.makedirs(path, exist_ok=True)
+
+    def _definitions(self, directory: str) -> List[CampaignDefinition]:
+        """Load every definition of a directory, setting invalid ones aside."""
+        definitions = []
+        for entry in sorted(os.scandir(directory), key=lambda e: e.stat().st_mtime):
+            if not entry.is_file() or not entry.name.endswith(".json"):
+                continue
+            try:
+                definitions.append(CampaignDefinition.from_file(entry.path))
+            except (OSError, ValueError, TypeError) as e:
+                Logger.error(f"Invalid campaign '{entry.name}': {e}")
+                self._move(entry.path, self.failed_dir, {"error": str(e)})
+        return definitions
+
+    def next_due(self, now: datetime) -> Optional[CampaignDefinition]:
+        """
+        Pick the campaign to run next.
+
+        Started campaigns come before new ones of the same priority, and older
+        files before newer ones.
+
+        Args:
+            now (datetime): Current local time
+
+        Returns:
+            Optional[CampaignDefinition]: The campaign to run, or None if no
+            campaign is due
+        """
+        candidates = self._definitions(self.active_dir) + self._definitions(self.directory)
+        due = [definition for definition in candidates if definition.is_due(now)]
+        # sorted() is stable, so file age breaks the ties
+        due.sort(key=lambda definition: -definition.priority)
+        return due[0] if due else None
+
+    def activate(self, definition: CampaignDefinition, campaign_id: str) -> None:
+        """Move a new campaign to active/, recording its campaign ID."""
+        definition.path = self._move(definition.path, self.active_dir, {"campaign_id": campaign_id})
+        definition.campaign_id = campaign_id
+
+    def finish(self, definition: CampaignDefinition, error: Optional[str] = None) -> None:
+        """Move a campaign to done/, or to failed/ with its error."""
+        if error:
+            self._move(definition.path, self.failed_dir, {"error": error})
+        else:
+            self._move(definition.path, self.done_dir)
+
+    @staticmethod
+    def _move(path: str, directory: str, updates: Optional[Dict[str, Any]] = None) -> str:
+        """Move a definition file to another directory, updating its fields."""
+        target = os.path.join(directory, os.path.basename(path))
+        if not updates:
+            os.replace(path, target)
+            return target
+
+        try:
+            with open(path, encoding="utf-8") as definition_file:
+                data = json.load(definition_file)
+            if not isinstance(data, dict):
+                data = {"definition": data}
+        except ValueError:
+            with open(path, encoding="utf-8", errors="replace") as definition_file:
+                data = {"definition": definition_file.read()}
+        data.update(updates)
+
+        temp_path = f"{target}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as definition_file:
+            json.dump(data, definition_file, ensure_ascii=False, indent=2)
+        os.replace(temp_path, target)
+        os.remove(path)
+        return target
+
+
+class CampaignDaemon:
+    """
+    Dispatcher running queued campaigns on one warm WhatsApp session.
+
+    Attributes:
+        account (str): WhatsApp account used to extract and send
+        queue (CampaignQueue): Queue the campaigns are taken from
+        headless (bool): Whether the browser runs headless
+        lean (bool): Whether the browser uses the lean profile
+        poll_interval (float): Seconds between two scans while idle
+    """
+
+    def __init__(
+        self,
+        account: str = DEFAULT_ACCOUNT,
+        queue: Optional[CampaignQueue] = None,
+        headless: bool = True,
+        poll_interval: float = DAEMON_POLL_INTERVAL,
+        lean: bool = LEAN_BROWSER
+    ) -> None:
+        """
+        Initialize the daemon.
+
+        Args:
+            account (str): WhatsApp account used to extract and send
+            queue (Optional[CampaignQueue]): Queue of campaigns, defaults to
+                QUEUE_DIR
+            headless (bool): Whether the browser runs headless
+            poll_interval (float): Seconds between two scans while idle
+            lean (bool): Whether the browser uses the lean profile
+        """
+        self.account = account
+        self.queue = queue or CampaignQueue()
+        self.headless = headless
+        self.lean = lean
+        self.poll_interval = poll_interval
+
+        self._bot: Optional[BotSupervisor] = None
+        self._contact_cache = ContactCache()
+        self._stop = threading.Event()
+        # Browser session failures in a row, backing off the next dispatch
+        self._session_failures = 0
+
+    def stop(self, *_: Any) -> None:
+        """Ask the daemon to stop after the message being sent."""
+        if not self._stop.is_set():
+            Logger.warn("Stopping after the current message...")
+        self._stop.set()
+
+    def run(self, once: bool = False) -> None:
+        """
+        Dispatch campaigns until stopped.
+
+        Args:
+            once (bool): Return as soon as no campaign is due, or the due
+                ones wait for the send caps, instead of waiting
+        """
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        Logger.info(f"Watching '{self.queue.directory}' for campaigns...")
+
+        try:
+            while not self._stop.is_set():
+                definition = self.queue.next_due(datetime.now())
+                if definition and not self._dispatch(definition):
+                    continue
+                if once:
+                    break
+                # Idle, waiting for the send caps to free up, or for a
+                # broken browser session to be worth another try
+                self._stop.wait(self._retry_delay())
+        finally:
+            self._close_bot()
+            self._contact_cache.close()
+
+    def _ensure_bot(self) -> BotSupervisor:
+        """Get the warm bot, starting a session if there is none or relaunching a dead one."""
+        if self._bot is None:
+            self._bot = BotSupervisor(
+                headless=self.headless, account=self.account,
+                contact_cache=self._contact_cache, interactive=False, lean=self.lean
+            )
+            self._bot.start_whatsapp()
+        else:
+            # The session may have died while the daemon was idle
+            self._bot.ensure_healthy()
+        return self._bot
+
+    def _close_bot(self) -> None:
+        """Close the browser session, if one is open."""
+        if self._bot:
+            self._bot.cleanup()
+            self._bot = None
+
+    def _retry_delay(self) -> float:
+        """Seconds to wait before the next scan, doubled after each session failure."""
+        if not self._session_failures:
+            return self.poll_interval
+        return min(
+            self.poll_interval * 2 ** (self._session_failures - 1), DAEMON_MAX_SESSION_BACKOFF
+        )
+
+    def _session_failed(self, error: BaseException) -> bool:
+        """Check whether an error came from the browser session rather than the campaign."""
+        if isinstance(error, (SessionLostError, SystemExit)):
+            return True
+        if self._bot is None:
+            # Raised before the campaign needed a session
+            return False
+        try:
+            return self._bot is None or self._bot.check_health() is not None
+        except Exception:
+            return True
+
+    def _dispatch(self, definition: CampaignDefinition) -> bool:
+        """
+        Run a campaign, setting it aside if the campaign itself is at fault.
+
+        A campaign interrupted by a browser session that failed stays queued,
+        and the next dispatch waits for a growing delay.
+
+        Args:
+            definition (CampaignDefinition): The campaign to run
+
+        Returns:
+            bool: True if nothing can be sent before waiting, because the
+            send caps stopped the campaign or the browser session failed
+        """
+        Logger.info(f"Dispatching campaign '{definition.name}' (priority {definition.priority})")
+        try:
+            capped = self._run_campaign(definition)
+        except (Exception, SystemExit) as e:
+            if self._session_failed(e):
+                # Drop the session, not the campaign; it resumes from its journal
+                self._session_failures += 1
+                Logger.error(
+                    f"Browser session failed during campaign '{definition.name}', "
+                    f"retrying in {self._retry_delay():.0f}s: {e}"
+                )
+                self._close_bot()
+                return True
+            Logger.error(f"Campaign '{definition.name}' failed: {e}")
+            self.queue.finish(definition, error=str(e) or type(e).__name__)
+            return False
+        self._session_failures = 0
+        return capped
+
+    def _run_campaign(self, definition: CampaignDefinition) -> bool:
+        """Extract, filter and send one campaign inside its window, see _dispatch."""
+        template, data = load_template(definition.message, definition.data, definition.attachment)
+
+        if definition.campaign_id:
+            journal = CampaignJournal(definition.campaign_id)
+        else:
+            journal = CampaignJournal()
+            journal.record_campaign(
+                ", ".join(definition.groups), definition.message, definition.groups,
+                definition.attachment, definition.data
+            )
+            self.queue.activate(definition, journal.campaign_id)
+
+        Logger.bind(campaign=journal.campaign_id)
+        try:
+            bot = self._ensure_bot()
+            if not journal.state.phones:
+                extract_groups(bot, journal)
+            if not journal.state.recipients:
+                journal.record_recipients(filter_phones(journal.state.phones, definition.exclude))
+
+            def keep_going() -> bool:
+                return not self._stop.is_set() and definition.in_window(datetime.now())
+
+            state = journal.state
+            personalize = Personalizer(template, data, state.names, state.sources(), state.group)
+            personalize.check_length(state.remaining())
+
+            SendPool([self.account], bots={self.account: bot}).send(
+                state.remaining(), definition.message, journal, keep_going,
+                attachment=definition.attachment, render=personalize
+            )
+
+            Logger.success(
+                f"Campaign '{definition.name}': "
+                f"{state.count(SendStatus.SENT)}/{len(state.recipients)} sent, "
+                f"{state.count(SendStatus.UNCONFIRMED)} unconfirmed, "
+                f"{state.count(SendStatus.INVALID)} not on WhatsApp"
+            )
+            report_by_group(journal)
+
+            if bot.throttle.cap_wait() > bot.throttle.max_wait:
+                Logger.info(f"Campaign '{definition.name}' paused until the send caps free up")
+                return True
+            if keep_going():
+                self.queue.finish(definition)
+            else:
+                Logger.info(f"Campaign '{definition.name}' paused until its window reopens")
+            return False
+        finally:
+            journal.close()
+            Logger.unbind("campaign")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Args:
+        argv (Optional[List[str]]): Arguments to parse (defaults to sys.argv)
+
+    Returns:
+        argparse.Namespace: The parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Run queued WhatsApp campaigns without any prompt."
+    )
+    parser.add_argument(
+        "--account", default=DEFAULT_ACCOUNT,
+        help="WhatsApp account whose persisted browser profile is used"
+    )
+    parser.add_argument(
+        "--queue", default=QUEUE_DIR, metavar="DIR",
+        help="Directory campaign definitions are read from"
+    )
+    parser.add_argument(
+        "--poll", type=float, default=DAEMON_POLL_INTERVAL, metavar="SECONDS",
+        help="Seconds between two scans of the queue while idle"
+    )
+    parser.add_argument(
+        "--lean", action="store_true", default=LEAN_BROWSER,
+        help="Block images, media and animations and trim Firefox's memory use"
+    )
+    parser.add_argument(
+        "--once", action="store_true",
+        help="Exit once no campaign can send right now instead of waiting for more"
+    )
+    parser.add_argument(
+        "--quiet", action="store_true",
+        help="Only print warnings and errors; the log file still gets everything"
+    )
+    return parser.parse_args(argv)
+
+
+def main() -> int:
+    """Run the campaign daemon."""
+    args = parse_args()
+    configure_logging(args.quiet)
+    Logger.configure_metrics(
+        METRICS_ENABLED, METRICS_DIR, METRICS_EXPORT_INTERVAL, METRICS_MAX_SAMPLES
+    )
+
+    try:
+        CampaignDaemon(
+            args.account, CampaignQueue(args.queue), headless=not IS_DEBUG,
+            poll_interval=args.poll, lean=args.lean
+        ).run(once=args.once)
+    finally:
+        Logger.stop_metrics()
+        Logger.stop_logging()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,389 @@
+"""
+Resumable campaign journal for WhatsApp Bot SMGM.
+
+This module keeps a durable, append-only JSON Lines record of a campaign: its
+message, the phones extracted from each of its groups, the final recipient
+list and the send state of every recipient. Replaying the journal rebuilds the
+campaign, so a run that crashed halfway can resume without extracting or
+sending again.
+
+Each record is flushed to the operating system as soon as it is written, which
+survives a crash of the bot process. The more expensive fsync is batched and
+only issued every JOURNAL_FSYNC_INTERVAL seconds or JOURNAL_FSYNC_RECORDS
+records, and when the journal is closed.
+
+Author: Diego Bloise
+Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from config import CAMPAIGNS_DIR, JOURNAL_FSYNC_INTERVAL, JOURNAL_FSYNC_RECORDS
+from phone_index import phone_key
+
+
+class SendStatus(Enum):
+    """
+    Send state of a single recipient.
+
+    UNCONFIRMED messages reached the outbox but were not acknowledged in
+    time; they are not resent on resume, as they usually go out eventually.
+    INVALID recipients are not on WhatsApp and are not retried either.
+    """
+    PENDING = "pending"
+    SENT = "sent"
+    UNCONFIRMED = "unconfirmed"
+    INVALID = "invalid"
+    FAILED = "failed"
+
+
+class SendOutcome(Enum):
+    """
+    Result of sending to one recipient, as observed in the browser.
+
+    Truthy only when WhatsApp acknowledged the message, so it can be used
+    wherever a plain success flag is expected.
+    """
+    SENT = "sent"
+    DELIVERED = "delivered"
+    UNCONFIRMED = "unconfirmed"
+    INVALID = "invalid"
+    FAILED = "failed"
+
+    def __bool__(self) -> bool:
+        return self in (SendOutcome.SENT, SendOutcome.DELIVERED)
+
+    @property
+    def status(self) -> SendStatus:
+        """Journal state corresponding to the outcome."""
+        if self:
+            return SendStatus.SENT
+        if self == SendOutcome.UNCONFIRMED:
+            return SendStatus.UNCONFIRMED
+        if self == SendOutcome.INVALID:
+            return SendStatus.INVALID
+        return SendStatus.FAILED
+
+
+# Send states a resumed campaign does not retry
+_SETTLED = (SendStatus.SENT, SendStatus.UNCONFIRMED, SendStatus.INVALID)
+
+
+class CampaignState:
+    """
+    Campaign data rebuilt from a journal.
+
+    Attributes:
+        campaign_id (str): Identifier of the campaign
+        group (str): Display name of the campaign's groups
+        groups (List[str]): Groups the recipients come from, in order
+        message (str): Message text of the campaign
+        attachment (Optional[str]): File sent with the message as its caption
+        data (Optional[str]): CSV file with the recipients' template values
+        group_phones (Dict[str, List[str]]): Phones extracted per group
+        names (Dict[str, str]): Contact name of the extracted phones that have one
+        phones (List[str]): Deduplicated phones extracted from all groups
+        recipients (List[str]): Phones the message is meant for
+        statuses (Dict[str, Tuple[SendStatus, Optional[str]]]): Latest send
+            state and failure reason per recipient
+    """
+
+    def __init__(self, campaign_id: str) -> None:
+        """Initialize an empty campaign state."""
+        self.campaign_id = campaign_id
+        self.group = ""
+        self.groups: List[str] = []
+        self.message = ""
+        self.attachment: Optional[str] = None
+        self.data: Optional[str] = None
+        self.group_phones: Dict[str, List[str]] = {}
+        self.names: Dict[str, str] = {}
+        self.phones: List[str] = []
+        self.recipients: List[str] = []
+        # Membership of recipients, so appending one stays O(1) on replay
+        self._recipient_set: Set[str] = set()
+        self.statuses: Dict[str, Tuple[SendStatus, Optional[str]]] = {}
+
+    def apply(self, record: Dict[str, Any]) -> None:
+        """Apply a single journal record to the state."""
+        kind = record.get("type")
+        if kind == "campaign":
+            self.group = record.get("group", "")
+            self.groups = list(record.get("groups") or [self.group])
+            self.message = record.get("message", "")
+            self.attachment = record.get("attachment")
+            self.data = record.get("data")
+        elif kind == "group_extraction":
+            self.group_phones[record["group"]] = list(record.get("phones", []))
+            self.names.update(record.get("names", {}))
+        elif kind == "extraction":
+            self.phones = list(record.get("phones", []))
+        elif kind == "recipients":
+            self.recipients = list(record.get("phones", []))
+            self._recipient_set = set(self.recipients)
+        elif kind == "recipient":
+            if record["phone"] not in self._recipient_set:
+                self._recipient_set.add(record["phone"])
+                self.recipients.append(record["phone"])
+        elif kind == "send":
+            self.statuses[record["phone"]] = (
+                SendStatus(record["status"]), record.get("reason")
+            )
+
+    def pending_groups(self) -> List[str]:
+        """Get the groups whose phones have not been extracted yet."""
+        return [group for group in self.groups if group not in self.group_phones]
+
+    def sources(self) -> Dict[str, List[str]]:
+        """
+        Get the provenance of every extracted phone.
+
+        Returns:
+            Dict[str, List[str]]: Groups each phone was found in, in campaign
+                order of the groups
+        """
+        groups_by_key: Dict[str, List[str]] = {}
+        for group in self.groups:
+            for phone in self.group_phones.get(group, []):
+                found_in = groups_by_key.setdefault(phone_key(phone), [])
+                if group not in found_in:
+                    found_in.append(group)
+
+        return {phone: groups_by_key.get(phone_key(phone), []) for phone in self.phones}
+
+    def status_of(self, phone: str) -> SendStatus:
+        """Get the latest send state of a recipient."""
+        return self.statuses.get(phone, (SendStatus.PENDING, None))[0]
+
+    def is_settled(self, phone: str) -> bool:
+        """Check whether a recipient must not be sent again (sent, unconfirmed or invalid)."""
+        return self.status_of(phone) in _SETTLED
+
+    def remaining(self) -> List[str]:
+        """
+        Get the recipients that still have to be sent.
+
+        Recipients that failed, or whose send was interrupted before an
+        outcome was recorded, are included again. Unconfirmed ones are not,
+        to avoid messaging them twice, and neither are invalid ones.
+
+        Returns:
+            List[str]: Recipients not yet sent, in campaign order
+        """
+        return [
+            phone for phone in self.recipients
+            if not self.is_settled(phone)
+        ]
+
+    def count(self, status: SendStatus) -> int:
+        """Count recipients currently in the given send state."""
+        return sum(1 for phone in self.recipients if self.status_of(phone) == status)
+
+
+class CampaignJournal:
+    """
+    Append-only JSON Lines journal of a single campaign.
+
+    Instances are safe to share between sender threads.
+
+    Attributes:
+        campaign_id (str): Identifier of the campaign
+        path (str): Location of the journal file
+        state (CampaignState): State replayed from the journal so far
+    """
+
+    def __init__(self, campaign_id: Optional[str] = None, directory: str = CAMPAIGNS_DIR) -> None:
+        """
+        Open the journal of a campaign, creating a new campaign if no ID is given.
+
+        Args:
+            campaign_id (Optional[str]): Campaign to reopen
+            directory (str): Directory holding the journals
+
+        Raises:
+            FileNotFoundError: If the given campaign has no journal
+        """
+        if campaign_id is None:
+            campaign_id = self.new_campaign_id()
+            must_exist = False
+        else:
+            must_exist = True
+
+        self.campaign_id = campaign_id
+        self.path = os.path.join(directory, f"{campaign_id}.jsonl")
+        self.state = CampaignState(campaign_id)
+
+        if must_exist and not os.path.exists(self.path):
+            raise FileNotFoundError(f"No journal found for campaign '{campaign_id}'")
+
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.path):
+            self._replay()
+
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a", encoding="utf-8")
+        if self._file.tell() and not self._ends_with_newline():
+            # Terminate a truncated last line so new records start cleanly
+            self._file.write("\n")
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    @staticmethod
+    def new_campaign_id() -> str:
+        """Generate a sortable, unique campaign identifier."""
+        return f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+
+    def _ends_with_newline(self) -> bool:
+        """Check whether the journal file ends with a complete line."""
+        with open(self.path, "rb") as journal_file:
+            journal_file.seek(-1, os.SEEK_END)
+            return journal_file.read(1) == b"\n"
+
+    def _replay(self) -> None:
+        """Rebuild the campaign state from the journal file."""
+        with open(self.path, encoding="utf-8") as journal_file:
+            for line in journal_file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    self.state.apply(json.loads(line))
+                except (ValueError, KeyError):
+                    # A crash can leave a truncated last line behind
+                    continue
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        """Append a record and apply it to the in-memory state."""
+        record["ts"] = time.time()
+        line = json.dumps(record, ensure_ascii=False)
+
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.state.apply(record)
+
+            self._unsynced += 1
+            if (self._unsynced >= JOURNAL_FSYNC_RECORDS
+                    or time.monotonic() - self._last_sync >= JOURNAL_FSYNC_INTERVAL):
+                self._sync()
+
+    def _sync(self) -> None:
+        """Force buffered records to disk. Must be called with the lock held."""
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def record_campaign(
+        self,
+        group: str,
+        message: str,
+        groups: Optional[List[str]] = None,
+        attachment: Optional[str] = None,
+        data: Optional[str] = None
+    ) -> None:
+        """
+        Record the groups and message of the campaign.
+
+        Args:
+            group (str): Display name of the campaign's groups
+            message (str): Message text of the campaign
+            groups (Optional[List[str]]): Every group of a batch campaign,
+                defaults to the single ``group``
+            attachment (Optional[str]): File sent with the message as its caption
+            data (Optional[str]): CSV file with the recipients' template values
+        """
+        record: Dict[str, Any] = {"type": "campaign", "group": group, "message": message}
+        if groups:
+            record["groups"] = list(groups)
+        if attachment:
+            record["attachment"] = attachment
+        if data:
+            record["data"] = data
+        self._write(record)
+
+    def record_group_extraction(
+        self,
+        group: str,
+        phones: List[str],
+        names: Optional[Dict[str, str]] = None
+    ) -> None:
+        """
+        Record the phones extracted from one group of the campaign.
+
+        Args:
+            group (str): Group the phones were extracted from
+            phones (List[str]): Extracted phones
+            names (Optional[Dict[str, str]]): Contact name of the phones that have one
+        """
+        record: Dict[str, Any] = {"type": "group_extraction", "group": group, "phones": list(phones)}
+        if names:
+            record["names"] = dict(names)
+        self._write(record)
+
+    def record_extraction(self, phones: List[str]) -> None:
+        """Record the deduplicated phones extracted from every group."""
+        self._write({"type": "extraction", "phones": list(phones)})
+
+    def record_recipients(self, phones: List[str]) -> None:
+        """Record the final list of recipients after filtering."""
+        self._write({"type": "recipients", "phones": list(phones)})
+        self.checkpoint()
+
+    def record_recipient(self, phone: str) -> None:
+        """Add a single recipient, as it becomes known while streaming."""
+        self._write({"type": "recipient", "phone": phone})
+
+    def record_send(self, phone: str, status: SendStatus, reason: Optional[str] = None) -> None:
+        """
+        Record the send state of a recipient.
+
+        Args:
+            phone (str): Recipient phone number
+            status (SendStatus): New send state
+            reason (Optional[str]): Why the send failed, if it did
+        """
+        record: Dict[str, Any] = {"type": "send", "phone": phone, "status": status.value}
+        if reason:
+            record["reason"] = reason
+        self._write(record)
+
+    def record_outcome(self, phone: str, outcome: Any, reason: Optional[str] = None) -> None:
+        """
+        Record how sending to a recipient ended.
+
+        Args:
+            phone (str): Recipient phone number
+            outcome (SendOutcome): Observed result; a plain bool is taken as
+                SENT or FAILED
+            reason (Optional[str]): Why the send did not succeed, if it did not
+        """
+        if not isinstance(outcome, SendOutcome):
+            outcome = SendOutcome.SENT if outcome else SendOutcome.FAILED
+        record: Dict[str, Any] = {
+            "type": "send", "phone": phone,
+            "status": outcome.status.value, "outcome": outcome.value
+        }
+        if reason and outcome.status == SendStatus.FAILED:
+            record["reason"] = reason
+        self._write(record)
+
+    def checkpoint(self) -> None:
+        """Force every record written so far to disk."""
+        with self._lock:
+            if self._unsynced:
+                self._sync()
+
+    def close(self) -> None:
+        """Sync and close the journal file."""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._sync()
+            self._file.close()
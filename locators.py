@@ -0,0 +1,170 @@
+"""
+Resilient element locators for WhatsApp Bot SMGM.
+
+This module resolves logical element names (such as "send_button") through an
+ordered chain of candidate selectors: stable data-testid attributes first,
+then ARIA roles and labels, and the absolute XPaths as a last resort. The
+candidate that resolved last time is tried first on the next lookup, so a
+layout change only costs one extra lookup instead of a broken bot.
+
+Lookups never wait: every candidate is tried once with find_elements, and the
+caller decides how long to keep polling through the wait engine.
+
+Author: Diego Bloise
+Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from selenium.common.exceptions import NoSuchElementException
+
+from config import LOCATORS
+
+Candidate = Tuple[str, str]
+
+
+class LocatorStats:
+    """
+    Resolution counters for a single logical locator.
+
+    Attributes:
+        lookups (int): Number of lookups performed
+        misses (int): Lookups where no candidate matched
+        candidate_hits (List[int]): Number of hits per candidate, in order
+        preferred (int): Index of the candidate tried first
+    """
+
+    __slots__ = ("lookups", "misses", "candidate_hits", "preferred")
+
+    def __init__(self, candidates: int) -> None:
+        self.lookups = 0
+        self.misses = 0
+        self.candidate_hits = [0] * candidates
+        self.preferred = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counters as a plain dictionary."""
+        hits = self.lookups - self.misses
+        return {
+            "lookups": self.lookups,
+            "hits": hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / self.lookups, 4) if self.lookups else 0.0,
+            "candidate_hits": list(self.candidate_hits),
+            "preferred": self.preferred,
+        }
+
+
+class LocatorRegistry:
+    """
+    Registry of logical locators with cached resolution and fallback chains.
+
+    Attributes:
+        locators (Dict[str, List[Candidate]]): Candidates per logical name
+    """
+
+    def __init__(self, locators: Optional[Dict[str, List[Candidate]]] = None) -> None:
+        """
+        Initialize the registry.
+
+        Args:
+            locators (Optional[Dict[str, List[Candidate]]]): Ordered
+                (strategy, value) candidates per logical name. Defaults to
+                LOCATORS from config.
+        """
+        self.locators = dict(locators or LOCATORS)
+        self._stats = {
+            name: LocatorStats(len(candidates))
+            for name, candidates in self.locators.items()
+        }
+
+    def _ordered(self, name: str) -> List[Tuple[int, Candidate]]:
+        """Get the candidates of a locator, last successful one first."""
+        candidates = list(enumerate(self.locators[name]))
+        preferred = self._stats[name].preferred
+        if preferred:
+            candidates.insert(0, candidates.pop(preferred))
+        return candidates
+
+    def find_all(self, driver: Any, name: str) -> List[Any]:
+        """
+        Find every element matched by the first resolving candidate.
+
+        Args:
+            driver: WebDriver (or element) to search from
+            name (str): Logical locator name
+
+        Returns:
+            List[WebElement]: The matching elements, empty if none resolved
+
+        Raises:
+            KeyError: If the locator is not registered
+        """
+        stats = self._stats[name]
+        stats.lookups += 1
+
+        for index, (strategy, value) in self._ordered(name):
+            elements = driver.find_elements(strategy, value)
+            if elements:
+                stats.candidate_hits[index] += 1
+                stats.preferred = index
+                return elements
+
+        stats.misses += 1
+        return []
+
+    def find_optional(self, driver: Any, name: str) -> Optional[Any]:
+        """Find the first element of a locator, or None if it did not resolve."""
+        elements = self.find_all(driver, name)
+        return elements[0] if elements else None
+
+    def find(self, driver: Any, name: str) -> Any:
+        """
+        Find the first element of a locator.
+
+        Raises:
+            NoSuchElementException: If no candidate resolved
+        """
+        element = self.find_optional(driver, name)
+        if element is None:
+            raise NoSuchElementException(f"No candidate matched locator '{name}'")
+        return element
+
+    def present(self, name: str) -> Callable[[Any], Optional[Any]]:
+        """Condition returning the element once it is in the DOM."""
+        return lambda driver: self.find_optional(driver, name)
+
+    def visible(self, name: str) -> Callable[[Any], Optional[Any]]:
+        """Condition returning the element once it is displayed."""
+        def condition(driver: Any) -> Optional[Any]:
+            element = self.find_optional(driver, name)
+            return element if element is not None and element.is_displayed() else None
+        return condition
+
+    def clickable(self, name: str) -> Callable[[Any], Optional[Any]]:
+        """Condition returning the element once it is displayed and enabled."""
+        def condition(driver: Any) -> Optional[Any]:
+            element = self.find_optional(driver, name)
+            if element is not None and element.is_displayed() and element.is_enabled():
+                return element
+            return None
+        return condition
+
+    def text_contains(self, name: str, text: str) -> Callable[[Any], bool]:
+        """Condition holding once the element text contains ``text``."""
+        def condition(driver: Any) -> bool:
+            element = self.find_optional(driver, name)
+            return element is not None and text in element.text
+        return condition
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get resolution counters for every locator that was looked up.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Counters keyed by locator name
+        """
+        return {
+            name: stats.as_dict()
+            for name, stats in self._stats.items() if stats.lookups
+        }
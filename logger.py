@@ -5,14 +5,36 @@ This module provides a comprehensive logging system with colored console output
 for different log levels. It includes both a class-based approach for new code
 and legacy function compatibility.
 
+Log records go to pluggable sinks: the colored console, which can be turned
+down to warnings only, and a JSON Lines file written by a background thread.
+The file sink only ever enqueues, dropping records when its buffer is full,
+so a slow disk never stalls the bot. Records carry structured fields (the
+bound campaign, phone, phase, duration, outcome...) next to the message.
+
+It also provides lightweight timing spans: hot-path operations are wrapped
+with Logger.span() or Logger.timed(), and their counts, latency percentiles
+and error counts can be exported as JSON and Prometheus text files. When
+metrics are disabled a span is a shared no-op object, so the instrumentation
+costs next to nothing.
+
 Author: Diego Bloise
 Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
 """
 
+import functools
+import json
+import os
+import queue
 import sys
-from typing import Optional
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, TypeVar
 from enum import Enum
 
+F = TypeVar("F", bound=Callable[..., Any])
+
 
 class LogLevel(Enum):
     """
@@ -29,19 +51,77 @@ class LogLevel(Enum):
     WARN = "warn"
     ERROR = "error"
 
+    @property
+    def rank(self) -> int:
+        """Severity of the level, for filtering sinks by a minimum level."""
+        return _LEVEL_RANKS[self]
 
-class Logger:
+
+_LEVEL_RANKS = {LogLevel.INFO: 0, LogLevel.SUCCESS: 1, LogLevel.WARN: 2, LogLevel.ERROR: 3}
+
+
+@dataclass
+class LogRecord:
     """
-    Custom logger with colored console output.
-    
-    This class provides static methods for logging messages at different levels
-    with appropriate colors and formatting. It uses ANSI escape sequences for
-    terminal colors and supports different log levels with distinct visual styles.
-    
+    A single log entry.
+
     Attributes:
-        COLORS (dict): Mapping of log levels to ANSI color codes
-        RESET (str): ANSI escape code to reset formatting
-        BOLD (str): ANSI escape code for bold text
+        level (LogLevel): Severity of the entry
+        message (str): Human-readable text
+        fields (Dict[str, Any]): Structured data, e.g. campaign, phone,
+            phase, duration and outcome
+        timestamp (float): Wall-clock time the entry was created
+        structured (bool): Whether the entry is a machine-only event that
+            console sinks skip
+    """
+
+    level: LogLevel
+    message: str
+    fields: Dict[str, Any] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+    structured: bool = False
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the entry as a flat dictionary for JSON output."""
+        entry = {"ts": round(self.timestamp, 6), "level": self.level.value, "message": self.message}
+        entry.update(self.fields)
+        return entry
+
+
+class LogSink:
+    """
+    Destination of log records.
+
+    Attributes:
+        min_level (LogLevel): Records below this level are ignored
+        structured (bool): Whether the sink also receives machine-only events
+    """
+
+    structured = False
+
+    def __init__(self, min_level: LogLevel = LogLevel.INFO) -> None:
+        self.min_level = min_level
+
+    def accepts(self, record: LogRecord) -> bool:
+        """Check whether the sink wants a record."""
+        if record.structured and not self.structured:
+            return False
+        return record.level.rank >= self.min_level.rank
+
+    def emit(self, record: LogRecord) -> None:
+        """Handle one record. Must not block for long."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Flush and release the sink's resources."""
+
+
+class ConsoleSink(LogSink):
+    """
+    Colored console output, the bot's historical log format.
+
+    Writes synchronously, so messages stay in order with the prompts of the
+    interactive UI. Raise min_level to WARN to keep long runs quiet.
     """
 
     # ANSI color codes for different log levels
@@ -56,46 +136,588 @@ class Logger:
     RESET = "\x1b[m"
     BOLD = "\x1b[1m"
 
+    def emit(self, record: LogRecord) -> None:
+        """Print a record with its level's color and prefix."""
+        level = record.level
+        prefix = ""
+        color = self.COLORS.get(level, "")
+
+        if level == LogLevel.INFO:
+            prefix = f"{self.BOLD}[*]{self.RESET} "
+        elif level in (LogLevel.SUCCESS, LogLevel.WARN):
+            prefix = f"{self.BOLD}[+]{self.RESET} "
+        elif level == LogLevel.ERROR:
+            prefix = f"{self.BOLD}[!]{self.RESET} "
+
+        print(f"{prefix}{color}{record.message}{self.RESET}")
+
+
+class JsonlFileSink(LogSink):
+    """
+    Buffered JSON Lines file written by a background thread.
+
+    emit() only puts the record on a bounded queue; when the writer falls
+    behind, new records are dropped and counted instead of blocking the
+    caller. The file is rotated once it exceeds max_bytes or is older than
+    rotate_interval, keeping backup_count old files as path.1, path.2...
+
+    Attributes:
+        path (str): Location of the current log file
+        max_bytes (int): Size that triggers a rotation, 0 to disable
+        rotate_interval (float): Age in seconds that triggers a rotation,
+            0 to disable
+        backup_count (int): Rotated files kept
+        flush_interval (float): Longest time a record stays in memory
+        dropped (int): Records lost because the queue was full
+        errors (int): Records or flushes that failed to reach the file
+    """
+
+    structured = True
+    _STOP = object()
+    # Seconds before a failed rotation is attempted again
+    _ROTATION_RETRY = 60.0
+
+    def __init__(
+        self,
+        path: str,
+        min_level: LogLevel = LogLevel.INFO,
+        max_bytes: int = 10 * 1024 * 1024,
+        rotate_interval: float = 24 * 60 * 60,
+        backup_count: int = 5,
+        queue_size: int = 10000,
+        flush_interval: float = 1.0
+    ) -> None:
+        """
+        Open the log file and start the writer thread.
+
+        Args:
+            path (str): Location of the log file
+            min_level (LogLevel): Records below this level are ignored
+            max_bytes (int): Size that triggers a rotation, 0 to disable
+            rotate_interval (float): Age in seconds that triggers a rotation
+            backup_count (int): Rotated files kept
+            queue_size (int): Records buffered before new ones are dropped
+            flush_interval (float): Longest time a record stays in memory
+        """
+        super().__init__(min_level)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.errors = 0
+        self._rotation_retry_at = 0.0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._open()
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def emit(self, record: LogRecord) -> None:
+        """Queue a record for the writer thread, dropping it if the queue is full."""
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _open(self) -> None:
+        """Open the log file for appending."""
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+        self._opened_at = time.time()
+
+    def _rotate(self) -> None:
+        """
+        Shift the backups by one and start a new log file.
+
+        If the backups cannot be shifted, writing goes on in the current file
+        and the rotation is retried after _ROTATION_RETRY seconds.
+        """
+        self._file.close()
+        try:
+            if self.backup_count > 0:
+                for index in range(self.backup_count - 1, 0, -1):
+                    older = f"{self.path}.{index}"
+                    if os.path.exists(older):
+                        os.replace(older, f"{self.path}.{index + 1}")
+                os.replace(self.path, f"{self.path}.1")
+            else:
+                os.remove(self.path)
+        except OSError:
+            self._rotation_retry_at = time.time() + self._ROTATION_RETRY
+            raise
+        finally:
+            self._open()
+
+    def _due_for_rotation(self) -> bool:
+        """Check whether the current file is too large or too old."""
+        if time.time() < self._rotation_retry_at:
+            return False
+        if self.max_bytes and self._size >= self.max_bytes:
+            return True
+        return bool(self.rotate_interval) and time.time() - self._opened_at >= self.rotate_interval
+
+    def _run(self) -> None:
+        """Write queued records in batches until close() is called."""
+        last_flush = time.monotonic()
+        running = True
+
+        while running:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                batch = []
+            # Take whatever else is already waiting
+            while len(batch) < 1000:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            # A failing record must not kill the thread, or close() would hang
+            failure: Optional[Exception] = None
+            for record in batch:
+                if record is self._STOP:
+                    running = False
+                    continue
+                try:
+                    if self._file.closed:
+                        self._open()
+                    line = json.dumps(record.as_dict(), ensure_ascii=False, default=str) + "\n"
+                    self._file.write(line)
+                    self._size += len(line)
+                    if self._due_for_rotation():
+                        self._rotate()
+                except Exception as e:
+                    self.errors += 1
+                    failure = e
+
+            now = time.monotonic()
+            if not running or now - last_flush >= self.flush_interval:
+                try:
+                    self._file.flush()
+                except Exception as e:
+                    self.errors += 1
+                    failure = e
+                last_flush = now
+
+            if failure is not None:
+                # Logging through Logger here could recurse into this sink
+                sys.stderr.write(
+                    f"Log file {self.path} unavailable ({self.errors} errors so far): {failure}\n"
+                )
+
+        self._file.close()
+
+    def close(self) -> None:
+        """Write every queued record, then stop the writer thread."""
+        if not self._thread.is_alive():
+            return
+        self._queue.put(self._STOP)
+        self._thread.join()
+
+
+class SpanStats:
+    """
+    Aggregated measurements for a single span name.
+
+    Attributes:
+        count (int): Number of completed spans
+        errors (int): Number of spans that ended in an error
+        total (float): Total seconds spent in the span
+        samples (Deque[float]): Most recent durations, used for percentiles
+    """
+
+    __slots__ = ("count", "errors", "total", "samples")
+
+    def __init__(self, max_samples: int) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.samples: Deque[float] = deque(maxlen=max_samples)
+
+    def percentile(self, fraction: float) -> float:
+        """Get a latency percentile (nearest rank) over the recent samples."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+        return ordered[index]
+
+    def as_dict(self) -> Dict[str, float]:
+        """Return the aggregate as a plain dictionary."""
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "sum": round(self.total, 6),
+            "p50": round(self.percentile(0.50), 6),
+            "p95": round(self.percentile(0.95), 6),
+            "p99": round(self.percentile(0.99), 6),
+        }
+
+
+class Metrics:
+    """
+    Thread-safe registry of span timings with JSON and Prometheus export.
+
+    Attributes:
+        enabled (bool): Whether spans are recorded at all
+        directory (str): Where exported files are written
+        max_samples (int): Recent durations kept per span for percentiles
+    """
+
+    JSON_FILE = "metrics.json"
+    PROMETHEUS_FILE = "metrics.prom"
+
+    def __init__(self, enabled: bool = False, directory: str = "metrics", max_samples: int = 10000) -> None:
+        self.enabled = enabled
+        self.directory = directory
+        self.max_samples = max_samples
+        self._spans: Dict[str, SpanStats] = {}
+        self._lock = threading.Lock()
+        self._exporter: Optional[threading.Thread] = None
+        self._stop_exporter = threading.Event()
+
+    def record(self, name: str, duration: float, error: bool = False) -> None:
+        """Record one completed span."""
+        with self._lock:
+            stats = self._spans.get(name)
+            if stats is None:
+                stats = self._spans[name] = SpanStats(self.max_samples)
+            stats.count += 1
+            stats.total += duration
+            stats.samples.append(duration)
+            if error:
+                stats.errors += 1
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Get the aggregates of every span, keyed by span name."""
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in self._spans.items()}
+
+    def to_prometheus(self) -> str:
+        """Render the aggregates in the Prometheus text exposition format."""
+        summary = self.summary()
+        lines = [
+            "# HELP whatsapp_bot_span_seconds Latency of bot operations.",
+            "# TYPE whatsapp_bot_span_seconds summary",
+        ]
+        for name, stats in summary.items():
+            for quantile, key in (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99")):
+                lines.append(f'whatsapp_bot_span_seconds{{span="{name}",quantile="{quantile}"}} {stats[key]}')
+            lines.append(f'whatsapp_bot_span_seconds_sum{{span="{name}"}} {stats["sum"]}')
+            lines.append(f'whatsapp_bot_span_seconds_count{{span="{name}"}} {stats["count"]}')
+
+        lines.append("# HELP whatsapp_bot_span_errors_total Bot operations that failed.")
+        lines.append("# TYPE whatsapp_bot_span_errors_total counter")
+        for name, stats in summary.items():
+            lines.append(f'whatsapp_bot_span_errors_total{{span="{name}"}} {stats["errors"]}')
+        return "\n".join(lines) + "\n"
+
+    def export(self) -> None:
+        """Write the JSON and Prometheus files, replacing them atomically."""
+        if not self.enabled:
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        payload = {"timestamp": time.time(), "spans": self.summary()}
+        self._write_atomic(self.JSON_FILE, json.dumps(payload, indent=2))
+        self._write_atomic(self.PROMETHEUS_FILE, self.to_prometheus())
+
+    def _write_atomic(self, filename: str, content: str) -> None:
+        """Write a file through a temporary file so readers never see it half-written."""
+        path = os.path.join(self.directory, filename)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as output:
+            output.write(content)
+        os.replace(temp_path, path)
+
+    def start_exporter(self, interval: float) -> None:
+        """Export periodically from a background thread until stopped."""
+        if not self.enabled or self._exporter or interval <= 0:
+            return
+
+        def run() -> None:
+            while not self._stop_exporter.wait(interval):
+                try:
+                    self.export()
+                except OSError as e:
+                    Logger.warn(f"Could not export metrics: {e}")
+
+        self._stop_exporter.clear()
+        self._exporter = threading.Thread(target=run, name="metrics-exporter", daemon=True)
+        self._exporter.start()
+
+    def stop_exporter(self) -> None:
+        """Stop the periodic exporter and write a final export."""
+        if self._exporter:
+            self._stop_exporter.set()
+            self._exporter.join()
+            self._exporter = None
+        self.export()
+
+
+class _Span:
+    """
+    Context manager timing one occurrence of a named operation.
+
+    The timing is recorded in the metrics registry when it is enabled, and
+    sent to structured sinks as a phase event.
+    """
+
+    __slots__ = ("metrics", "name", "start", "failed", "fields")
+
+    def __init__(self, metrics: Metrics, name: str, fields: Optional[Dict[str, Any]] = None) -> None:
+        self.metrics = metrics
+        self.name = name
+        self.start = 0.0
+        self.failed = False
+        self.fields = fields
+
+    def fail(self) -> None:
+        """Mark the span as failed without raising."""
+        self.failed = True
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        duration = time.perf_counter() - self.start
+        failed = self.failed or exc_type is not None
+        if self.metrics.enabled:
+            self.metrics.record(self.name, duration, failed)
+        if Logger.structured:
+            Logger.event(
+                self.name, duration=round(duration, 4),
+                outcome="error" if failed else "ok", **(self.fields or {})
+            )
+
+
+class _NoopSpan:
+    """Span used while metrics are disabled."""
+
+    __slots__ = ()
+
+    def fail(self) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Logger:
+    """
+    Custom logger with colored console output and pluggable sinks.
+    
+    This class provides static methods for logging messages at different levels.
+    Every message becomes a LogRecord handed to each sink; by default the only
+    sink is the colored console.
+    
+    Attributes:
+        sinks (List[LogSink]): Destinations of every record
+        context (Dict[str, Any]): Fields added to every record, see bind()
+        structured (bool): Whether a sink takes structured events, in which
+            case spans are timed even with metrics disabled
+        metrics (Metrics): Registry receiving span timings
+    """
+
+    sinks: List[LogSink] = [ConsoleSink()]
+    context: Dict[str, Any] = {}
+    structured = False
+    metrics = Metrics()
+
     @classmethod
-    def log(cls, message: str, level: LogLevel = LogLevel.INFO) -> None:
+    def log(cls, message: str, level: LogLevel = LogLevel.INFO, **fields: Any) -> None:
         """
-        Log a message with the specified level and formatting.
+        Log a message with the specified level.
         
         Args:
             message (str): The message to log
             level (LogLevel): The log level (defaults to INFO)
+            **fields: Structured data attached to the record
         """
-        prefix = ""
-        color = cls.COLORS.get(level, "")
-
-        if level == LogLevel.INFO:
-            prefix = f"{cls.BOLD}[*]{cls.RESET} "
-        elif level in (LogLevel.SUCCESS, LogLevel.WARN):
-            prefix = f"{cls.BOLD}[+]{cls.RESET} "
-        elif level == LogLevel.ERROR:
-            prefix = f"{cls.BOLD}[!]{cls.RESET} "
+        cls._dispatch(LogRecord(level, message, {**cls.context, **fields}))
 
-        print(f"{prefix}{color}{message}{cls.RESET}")
+    @classmethod
+    def _dispatch(cls, record: LogRecord) -> None:
+        """Hand a record to every sink that accepts it."""
+        for sink in cls.sinks:
+            if sink.accepts(record):
+                sink.emit(record)
 
     @classmethod
-    def info(cls, message: str) -> None:
+    def info(cls, message: str, **fields: Any) -> None:
         """Log an info message."""
-        cls.log(message, LogLevel.INFO)
+        cls.log(message, LogLevel.INFO, **fields)
 
     @classmethod
-    def success(cls, message: str) -> None:
+    def success(cls, message: str, **fields: Any) -> None:
         """Log a success message."""
-        cls.log(message, LogLevel.SUCCESS)
+        cls.log(message, LogLevel.SUCCESS, **fields)
 
     @classmethod
-    def warn(cls, message: str) -> None:
+    def warn(cls, message: str, **fields: Any) -> None:
         """Log a warning message."""
-        cls.log(message, LogLevel.WARN)
+        cls.log(message, LogLevel.WARN, **fields)
 
     @classmethod
-    def error(cls, message: str) -> None:
+    def error(cls, message: str, **fields: Any) -> None:
         """Log an error message."""
-        cls.log(message, LogLevel.ERROR)
+        cls.log(message, LogLevel.ERROR, **fields)
+
+    @classmethod
+    def event(cls, phase: str, level: LogLevel = LogLevel.INFO, **fields: Any) -> None:
+        """
+        Record a machine-readable event, skipped by the console.
+
+        Args:
+            phase (str): What happened, e.g. a span name or "send"
+            level (LogLevel): Severity of the event
+            **fields: Structured data, e.g. phone, duration and outcome
+        """
+        if not cls.structured:
+            return
+        cls._dispatch(LogRecord(level, phase, {**cls.context, "phase": phase, **fields}, structured=True))
+
+    @classmethod
+    def bind(cls, **fields: Any) -> None:
+        """Add fields, such as the campaign ID, to every following record."""
+        cls.context = {**cls.context, **fields}
+
+    @classmethod
+    def unbind(cls, *names: str) -> None:
+        """Stop adding the given fields to records."""
+        cls.context = {key: value for key, value in cls.context.items() if key not in names}
+
+    @classmethod
+    def configure_logging(
+        cls,
+        console_level: LogLevel = LogLevel.INFO,
+        log_file: Optional[str] = None,
+        **file_options: Any
+    ) -> None:
+        """
+        Replace the sinks with a console sink and, optionally, a JSONL file.
+
+        Args:
+            console_level (LogLevel): Lowest level printed on the console
+            log_file (Optional[str]): JSON Lines file receiving every record
+                and structured event, None for console only
+            **file_options: Rotation and buffering options, see JsonlFileSink
+        """
+        sinks: List[LogSink] = [ConsoleSink(console_level)]
+        if log_file:
+            try:
+                sinks.append(JsonlFileSink(log_file, **file_options))
+            except OSError as e:
+                cls.warn(f"Could not open log file: {e}")
+        cls.set_sinks(sinks)
+
+    @classmethod
+    def set_sinks(cls, sinks: List[LogSink]) -> None:
+        """Replace the sinks, closing the previous ones."""
+        previous = cls.sinks
+        cls.sinks = list(sinks)
+        cls.structured = any(sink.structured for sink in cls.sinks)
+        for sink in previous:
+            if sink not in cls.sinks:
+                sink.close()
+
+    @classmethod
+    def stop_logging(cls) -> None:
+        """Flush and close every sink, going back to console output only."""
+        dropped = sum(getattr(sink, "dropped", 0) for sink in cls.sinks)
+        cls.set_sinks([ConsoleSink(cls.sinks[0].min_level if cls.sinks else LogLevel.INFO)])
+        if dropped:
+            cls.warn(f"{dropped} log records were dropped while the log file fell behind")
+
+    @classmethod
+    def configure_metrics(
+        cls,
+        enabled: bool,
+        directory: str = "metrics",
+        export_interval: float = 0,
+        max_samples: int = 10000
+    ) -> None:
+        """
+        Enable or disable span metrics.
+
+        Args:
+            enabled (bool): Whether spans are recorded
+            directory (str): Where metrics.json and metrics.prom are written
+            export_interval (float): Seconds between periodic exports, 0 to
+                only export when stop_metrics() is called
+            max_samples (int): Recent durations kept per span for percentiles
+        """
+        cls.metrics = Metrics(enabled, directory, max_samples)
+        cls.metrics.start_exporter(export_interval)
+
+    @classmethod
+    def stop_metrics(cls) -> None:
+        """Stop periodic exports and write the final metrics files."""
+        try:
+            cls.metrics.stop_exporter()
+        except OSError as e:
+            cls.warn(f"Could not export metrics: {e}")
+
+    @classmethod
+    def span(cls, name: str, **fields: Any) -> Any:
+        """
+        Time a block of code.
+
+        Usage:
+            with Logger.span("send_message", phone=phone) as span:
+                if not sent:
+                    span.fail()
+
+        Args:
+            name (str): Name the timing is aggregated under
+            **fields: Structured data added to the span's event
+
+        Returns:
+            A context manager; a shared no-op one while neither metrics nor
+            a structured sink is enabled
+        """
+        if not cls.metrics.enabled and not cls.structured:
+            return _NOOP_SPAN
+        return _Span(cls.metrics, name, fields)
+
+    @classmethod
+    def timed(cls, name: str, falsy_is_error: bool = False) -> Callable[[F], F]:
+        """
+        Decorator timing every call of a function.
+
+        Args:
+            name (str): Name the timing is aggregated under
+            falsy_is_error (bool): Count a falsy return value as an error, for
+                functions that report failure instead of raising
+
+        Returns:
+            Callable: The decorator
+        """
+        def decorator(func: F) -> F:
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not cls.metrics.enabled and not cls.structured:
+                    return func(*args, **kwargs)
+                with _Span(cls.metrics, name) as span:
+                    result = func(*args, **kwargs)
+                    if falsy_is_error and not result:
+                        span.fail()
+                    return result
+            return wrapper  # type: ignore[return-value]
+        return decorator
 
 
 # =============================================================================
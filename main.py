@@ -9,42 +9,321 @@ Author: Diego Bloise
 Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
 
 Usage:
-    python main.py
+    python main.py [--account NAME] [--accounts NAME,NAME,...]
+                   [--groups NAME,NAME,... | --groups-file FILE]
+                   [--forget-contact NAME] [--resume CAMPAIGN_ID]
+                   [--stream --sender-account NAME] [--attach FILE]
+                   [--data FILE] [--lean] [--quiet]
 """
 
-from typing import List
+import argparse
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from config import IS_DEBUG
-from logger import Logger
+from config import (
+    DEFAULT_ACCOUNT, IS_DEBUG, LEAN_BROWSER, METRICS_ENABLED, METRICS_DIR,
+    METRICS_EXPORT_INTERVAL, METRICS_MAX_SAMPLES, TEMPLATE_FIELDS,
+    LOG_CONSOLE_LEVEL, LOG_FILE_ENABLED, LOG_DIR, LOG_FILE_NAME, LOG_MAX_BYTES,
+    LOG_ROTATE_INTERVAL, LOG_BACKUP_COUNT, LOG_QUEUE_SIZE, LOG_FLUSH_INTERVAL
+)
+from contact_cache import ContactCache
+from journal import CampaignJournal, SendStatus
+from logger import Logger, LogLevel
+from phone_index import PhoneFilter, PhoneIndex, filter_phones
+from pipeline import StreamingCampaign
+from send_pool import SendPool
+from templates import MessageTemplate, Personalizer, RecipientData, TemplateError
 from ui import UIManager
-from whatsapp_bot import WhatsAppBot
+from supervisor import BotSupervisor
+from whatsapp_bot import BotError
 
 
-def filter_phones(phones: List[str], exclude_suffixes: List[str]) -> List[str]:
+def merge_group_phones(group_phones: List[List[str]]) -> List[str]:
     """
-    Filter out phones based on their suffixes.
-    
-    Removes phone numbers whose last 4 digits match any of the provided
-    exclusion suffixes, allowing users to exclude specific numbers from messaging.
-    
+    Merge the phones of several groups into one recipient list.
+
+    A phone found in more than one group is kept once, at the position of its
+    first occurrence, whatever format each group displayed it in.
+
     Args:
-        phones (List[str]): List of phone numbers to filter
-        exclude_suffixes (List[str]): List of 4-digit suffixes to exclude
-        
+        group_phones (List[List[str]]): Phones of each group, in group order
+
     Returns:
-        List[str]: Filtered list of phone numbers
+        List[str]: Deduplicated phones in E.164
     """
-    if not exclude_suffixes:
-        return phones
-    
-    filtered = []
-    for phone in phones:
-        # Get last 4 digits for comparison
-        phone_suffix = phone[-4:] if len(phone) >= 4 else phone
-        if phone_suffix not in exclude_suffixes:
-            filtered.append(phone)
+    return list(PhoneIndex(phone for phones in group_phones for phone in phones))
+
+
+def load_groups(path: str) -> List[str]:
+    """
+    Read group names from a file, one per line.
+
+    Blank lines and lines starting with "#" are ignored.
+
+    Args:
+        path (str): Location of the groups file
+
+    Returns:
+        List[str]: Group names, in file order
+    """
+    with open(path, encoding="utf-8") as groups_file:
+        lines = (line.strip() for line in groups_file)
+        return [line for line in lines if line and not line.startswith("#")]
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Args:
+        argv (Optional[List[str]]): Arguments to parse (defaults to sys.argv)
+
+    Returns:
+        argparse.Namespace: The parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Send a message to every member of a WhatsApp group."
+    )
+    parser.add_argument(
+        "--account", default=DEFAULT_ACCOUNT,
+        help="WhatsApp account whose persisted browser profile is used"
+    )
+    parser.add_argument(
+        "--accounts", type=lambda value: [a for a in value.split(",") if a],
+        default=[],
+        help="Comma-separated accounts to shard sending across, one browser each"
+    )
+    parser.add_argument(
+        "--groups", type=lambda value: [g.strip() for g in value.split(",") if g.strip()],
+        default=[],
+        help="Comma-separated groups to message in one session, members shared "
+             "between groups are messaged once"
+    )
+    parser.add_argument(
+        "--groups-file", metavar="FILE",
+        help="File with one group name per line, added to --groups"
+    )
+    parser.add_argument(
+        "--forget-contact", action="append", default=[], metavar="NAME",
+        help="Drop a saved contact from the phone cache before running (repeatable)"
+    )
+    parser.add_argument(
+        "--resume", metavar="CAMPAIGN_ID",
+        help="Resume a campaign from its journal, skipping recipients already sent"
+    )
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="Start sending while the group is still being extracted"
+    )
+    parser.add_argument(
+        "--sender-account", metavar="NAME",
+        help="Account whose browser sends messages in --stream mode"
+    )
+    parser.add_argument(
+        "--attach", metavar="FILE",
+        help="Send a file with the message as its caption, uploaded once and "
+             "forwarded to the other recipients"
+    )
+    parser.add_argument(
+        "--data", metavar="FILE",
+        help="CSV file with a phone column; every column becomes a {placeholder} "
+             "of the message"
+    )
+    parser.add_argument(
+        "--lean", action="store_true", default=LEAN_BROWSER,
+        help="Block images, media and animations and trim Firefox's memory use"
+    )
+    parser.add_argument(
+        "--quiet", action="store_true",
+        help="Only print warnings and errors; the log file still gets everything"
+    )
+    args = parser.parse_args(argv)
+
+    if args.stream and (not args.sender_account or args.sender_account == args.account):
+        parser.error("--stream needs a --sender-account different from --account")
+    if args.attach and args.stream:
+        parser.error("--attach cannot be combined with --stream")
+    if args.attach and not os.path.isfile(args.attach):
+        parser.error(f"--attach file not found: {args.attach}")
+    if args.data and not os.path.isfile(args.data):
+        parser.error(f"--data file not found: {args.data}")
+
+    if args.groups_file:
+        try:
+            args.groups += load_groups(args.groups_file)
+        except OSError as e:
+            parser.error(f"cannot read --groups-file: {e}")
+    # Keep the first occurrence of each group
+    args.groups = list(dict.fromkeys(args.groups))
+    return args
+
+
+def configure_logging(quiet: bool = False) -> None:
+    """
+    Set up the console and JSON Lines log sinks from the configuration.
+
+    Args:
+        quiet (bool): Only print warnings and errors on the console
+    """
+    Logger.configure_logging(
+        LogLevel.WARN if quiet else LogLevel(LOG_CONSOLE_LEVEL),
+        os.path.join(LOG_DIR, LOG_FILE_NAME) if LOG_FILE_ENABLED else None,
+        max_bytes=LOG_MAX_BYTES,
+        rotate_interval=LOG_ROTATE_INTERVAL,
+        backup_count=LOG_BACKUP_COUNT,
+        queue_size=LOG_QUEUE_SIZE,
+        flush_interval=LOG_FLUSH_INTERVAL
+    )
+
+
+def extract_groups(bot: BotSupervisor, journal: CampaignJournal) -> None:
+    """
+    Extract every group of the campaign not extracted yet, then merge them.
+
+    Each group is recorded as soon as it is extracted, so a resumed batch
+    only walks the groups that are left.
+
+    Args:
+        bot (BotSupervisor): Started bot used for extraction
+        journal (CampaignJournal): Journal of the campaign
+    """
+    for group in journal.state.pending_groups():
+        bot.find_group(group)
+        phones = bot.get_group_phones()
+        journal.record_group_extraction(group, phones, contact_names(bot, phones))
 
-    return filtered
+    state = journal.state
+    journal.record_extraction(
+        merge_group_phones([state.group_phones[group] for group in state.groups])
+    )
+
+
+def contact_names(bot: BotSupervisor, phones: List[str]) -> Dict[str, str]:
+    """Get the names the bot saw for the given phones, for the journal."""
+    return {phone: bot.contact_names[phone] for phone in phones if phone in bot.contact_names}
+
+
+def iter_campaign_phones(
+    bot: BotSupervisor,
+    journal: CampaignJournal,
+    sources: Optional[Dict[str, List[str]]] = None
+) -> Iterator[str]:
+    """
+    Walk every group of the campaign, yielding phones as they are extracted.
+
+    Args:
+        bot (BotSupervisor): Started bot used for extraction
+        journal (CampaignJournal): Journal receiving each group's phones
+        sources (Optional[Dict[str, List[str]]]): Filled with the groups each
+            phone is found in, before the phone is yielded
+
+    Yields:
+        str: Phones in group order, possibly repeated across groups
+    """
+    for group in journal.state.groups:
+        bot.find_group(group)
+        phones = []
+        for phone in bot.iter_group_phones():
+            phones.append(phone)
+            if sources is not None:
+                sources.setdefault(phone, []).append(group)
+            yield phone
+        journal.record_group_extraction(group, phones, contact_names(bot, phones))
+
+
+def load_template(
+    message_text: str,
+    data_path: Optional[str] = None,
+    attachment: Optional[str] = None
+) -> Tuple[MessageTemplate, Optional[RecipientData]]:
+    """
+    Compile the campaign message once, against the fields its recipients have.
+
+    Args:
+        message_text (str): Message with optional {placeholders}
+        data_path (Optional[str]): CSV file with the recipients' values
+        attachment (Optional[str]): File sent with the message as its caption
+
+    Returns:
+        Tuple[MessageTemplate, Optional[RecipientData]]: The compiled message
+        and the loaded CSV data
+
+    Raises:
+        TemplateError: If the message or the CSV file cannot be used
+        OSError: If the CSV file cannot be read
+    """
+    data = RecipientData.from_csv(data_path) if data_path else None
+    template = MessageTemplate.compile(message_text, data.fields if data else TEMPLATE_FIELDS)
+    if attachment and template.fields:
+        # A forwarded attachment carries the caption of the first upload
+        raise TemplateError("Placeholders cannot be used in the caption of an attachment")
+    return template, data
+
+
+def report_by_group(journal: CampaignJournal) -> None:
+    """
+    Log how many recipients of each group of a batch campaign were messaged.
+
+    A recipient found in several groups counts for each of them.
+
+    Args:
+        journal (CampaignJournal): Journal of the campaign
+    """
+    state = journal.state
+    if len(state.groups) < 2:
+        return
+
+    sources = state.sources()
+    for group in state.groups:
+        recipients = [phone for phone in state.recipients if group in sources.get(phone, [])]
+        sent = sum(1 for phone in recipients if state.status_of(phone) == SendStatus.SENT)
+        Logger.info(f"{group}: {sent}/{len(recipients)} sent")
+
+
+def stream_campaign(
+    bot: BotSupervisor,
+    sender_account: str,
+    journal: CampaignJournal,
+    message_text: str,
+    phones_to_exclude: List[str],
+    lean: bool = LEAN_BROWSER,
+    template: Optional[MessageTemplate] = None,
+    data: Optional[RecipientData] = None
+) -> None:
+    """
+    Extract and send at the same time, on two browser sessions.
+
+    The extracting bot walks the campaign's groups while a second bot, bound
+    to the sender account, messages every phone as soon as it is known.
+
+    Args:
+        bot (BotSupervisor): Started bot used for extraction
+        sender_account (str): Account of the bot used for sending
+        journal (CampaignJournal): Journal of the campaign
+        message_text (str): Message to send
+        phones_to_exclude (List[str]): Exclusion tokens, see PhoneFilter
+        lean (bool): Whether the sender uses the lean browser profile
+        template (Optional[MessageTemplate]): Compiled message, personalized
+            for each recipient
+        data (Optional[RecipientData]): Values of the CSV columns
+    """
+    exclusions = PhoneFilter.parse(phones_to_exclude)
+    sources: Dict[str, List[str]] = {}
+    personalize = Personalizer(
+        template or MessageTemplate.compile(message_text), data, bot.contact_names, sources
+    )
+    sender = BotSupervisor(headless=not IS_DEBUG, account=sender_account, lean=lean)
+    try:
+        sender.start_whatsapp()
+
+        StreamingCampaign(
+            iter_campaign_phones(bot, journal, sources),
+            lambda phone: sender.send_message(phone, personalize(phone)),
+            keep=lambda phone: not exclusions.matches(phone),
+            journal=journal
+        ).run()
+    finally:
+        sender.cleanup()
 
 
 def main() -> None:
@@ -55,62 +334,174 @@ def main() -> None:
     1. Display user interface and collect inputs
     2. Initialize WhatsApp bot with appropriate settings
     3. Authenticate with WhatsApp Web
-    4. Navigate to specified group and extract phone numbers
+    4. Navigate to each specified group and extract phone numbers
     5. Display results and confirm with user
     6. Send messages to filtered list of recipients
     7. Handle errors and cleanup resources
     
+    With --groups or --groups-file, several groups are extracted in the same
+    session and merged into one recipient list without duplicates.
+
+    Every step is recorded in a campaign journal. With --resume, the steps
+    already recorded are skipped and only recipients not yet sent are messaged.
+
     The function includes comprehensive error handling for various failure scenarios
     and ensures proper cleanup of browser resources.
     """
+    args = parse_args()
+    configure_logging(args.quiet)
+    Logger.configure_metrics(
+        METRICS_ENABLED, METRICS_DIR, METRICS_EXPORT_INTERVAL, METRICS_MAX_SAMPLES
+    )
+
+    contact_cache = ContactCache()
+    for contact_name in args.forget_contact:
+        if contact_cache.invalidate(args.account, contact_name):
+            Logger.info(f"Removed '{contact_name}' from the contact cache")
+
     # Display banner
     UIManager.display_banner()
 
-    # Get user inputs
-    group_name = UIManager.get_group_input()
-    phones_to_exclude = UIManager.get_exclusion_input()
-    message_text = UIManager.get_message_input()
+    if args.resume:
+        try:
+            journal = CampaignJournal(args.resume)
+        except FileNotFoundError as e:
+            Logger.error(str(e))
+            Logger.stop_logging()
+            return
+
+        state = journal.state
+        message_text = state.message
+        attachment = state.attachment
+        phones_to_exclude: Optional[List[str]] = None
+        try:
+            template, data = load_template(message_text, state.data, attachment)
+        except (TemplateError, OSError) as e:
+            Logger.error(f"Cannot use the message: {e}")
+            journal.close()
+            Logger.stop_logging()
+            return
+        Logger.info(
+            f"Resuming campaign {state.campaign_id}: "
+            f"{state.count(SendStatus.SENT)}/{len(state.recipients)} already sent"
+        )
+    else:
+        # Get user inputs
+        groups = args.groups or [UIManager.get_group_input()]
+        phones_to_exclude = UIManager.get_exclusion_input()
+        message_text = UIManager.get_message_input()
+        attachment = os.path.abspath(args.attach) if args.attach else None
+        data_path = os.path.abspath(args.data) if args.data else None
+
+        try:
+            template, data = load_template(message_text, data_path, attachment)
+        except (TemplateError, OSError) as e:
+            Logger.error(f"Cannot use the message: {e}")
+            Logger.stop_logging()
+            return
+
+        journal = CampaignJournal()
+        journal.record_campaign(
+            ", ".join(groups), message_text, groups if len(groups) > 1 else None,
+            attachment, data_path
+        )
+        Logger.info(
+            f"Campaign ID: {journal.campaign_id} (resume with --resume {journal.campaign_id})"
+        )
 
+    Logger.bind(campaign=journal.campaign_id)
     UIManager.display_separator()
 
     # Initialize bot
-    bot = WhatsAppBot(headless=not IS_DEBUG)
+    bot = BotSupervisor(
+        headless=not IS_DEBUG, account=args.account, contact_cache=contact_cache,
+        lean=args.lean
+    )
 
     try:
         # Start WhatsApp and handle authentication
         bot.start_whatsapp()
 
-        # Find the group
-        bot.find_group(group_name)
+        streamed = False
+        if args.stream and not journal.state.phones:
+            # Confirm up front, recipients are messaged as they are found
+            if not UIManager.confirm_message(message_text):
+                Logger.error("Operation aborted by user.")
+                return
+            if phones_to_exclude is None:
+                phones_to_exclude = UIManager.get_exclusion_input()
 
-        # Extract phone numbers
-        phones = bot.get_group_phones()
+            print("\n\n")
+            stream_campaign(
+                bot, args.sender_account, journal, message_text, phones_to_exclude, args.lean,
+                template, data
+            )
+            streamed = bool(journal.state.phones)
+
+        extracted_now = False
+        if not journal.state.phones:
+            # Find each group and extract its phone numbers
+            extract_groups(bot, journal)
+            extracted_now = True
 
-        # Display results
-        UIManager.display_phones(phones)
+        if not journal.state.recipients or extracted_now:
+            # A streamed campaign was already confirmed before it stopped
+            if not journal.state.recipients:
+                # Display results
+                UIManager.display_phones(journal.state.phones)
+                UIManager.display_group_summary(journal.state.groups, journal.state.sources())
+
+                # Confirm message sending
+                if not UIManager.confirm_message(message_text):
+                    Logger.error("Operation aborted by user.")
+                    return
 
-        # Confirm message sending
-        if UIManager.confirm_message(message_text):
             # Filter phones if exclusions specified
-            filtered_phones = filter_phones(phones, phones_to_exclude)
+            if phones_to_exclude is None:
+                phones_to_exclude = UIManager.get_exclusion_input()
+            journal.record_recipients(filter_phones(journal.state.phones, phones_to_exclude))
 
+        if not streamed:
             print("\n\n")
             # Send messages
-            for i, phone in enumerate(filtered_phones):
-                Logger.warn(f"Sending message {i+1} to: {phone}")
-                bot.send_message(phone, message_text)
-        else:
-            Logger.error("Operation aborted by user.")
+            pool = SendPool(
+                args.accounts or [args.account], headless=not IS_DEBUG,
+                bots={args.account: bot}, lean=args.lean
+            )
+            state = journal.state
+            personalize = Personalizer(template, data, state.names, state.sources(), state.group)
+            personalize.check_length(state.remaining())
+            pool.send(
+                state.remaining(), message_text, journal,
+                attachment=attachment, render=personalize
+            )
+
+        sent_count = journal.state.count(SendStatus.SENT)
+        Logger.success(f"Messages sent: {sent_count}/{len(journal.state.recipients)}")
+        unconfirmed = journal.state.count(SendStatus.UNCONFIRMED)
+        if unconfirmed:
+            Logger.warn(f"{unconfirmed} message(s) were not acknowledged by WhatsApp in time")
+        invalid = journal.state.count(SendStatus.INVALID)
+        if invalid:
+            Logger.warn(f"{invalid} phone(s) are not on WhatsApp and will be skipped by later campaigns")
+        report_by_group(journal)
 
     except KeyboardInterrupt:
         Logger.error("Operation interrupted by user.")
+    except TemplateError as e:
+        Logger.error(f"Cannot use the message: {e}")
+    except BotError as e:
+        Logger.error(f"Campaign stopped: {e} (resume with --resume {journal.campaign_id})")
     except Exception as e:
         Logger.error(f"Unexpected error: {e}")
     finally:
         # Clean up
         bot.cleanup()
+        journal.close()
+        Logger.stop_metrics()
         UIManager.wait_for_exit()
         Logger.success("All done!")
+        Logger.stop_logging()
 
 
 if __name__ == "__main__":
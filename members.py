@@ -0,0 +1,60 @@
+"""
+Group member records for WhatsApp Bot SMGM.
+
+This module defines the structured record returned by the in-page bulk
+extraction backend, one per group participant.
+
+Author: Diego Bloise
+Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+
+@dataclass(frozen=True)
+class GroupMember:
+    """
+    A single participant of a WhatsApp group.
+
+    Attributes:
+        id (str): Serialized WhatsApp ID (JID) of the participant
+        name (str): Display name as known to the account, may be empty
+        phone (Optional[str]): Phone number digits, None if WhatsApp hides it
+        is_saved (bool): Whether the name is the account's saved contact name,
+            rather than the participant's own profile name
+        is_business (bool): Whether the participant is a business account
+        is_me (bool): Whether the participant is the logged-in account
+    """
+
+    id: str
+    name: str
+    phone: Optional[str]
+    is_saved: bool = False
+    is_business: bool = False
+    is_me: bool = False
+
+    @classmethod
+    def from_script(cls, data: Dict[str, Any]) -> "GroupMember":
+        """
+        Build a member from one entry returned by the in-page script.
+
+        Args:
+            data (Dict[str, Any]): Participant data returned by the browser
+
+        Returns:
+            GroupMember: The parsed member
+        """
+        return cls(
+            id=str(data.get("id") or ""),
+            name=str(data.get("name") or ""),
+            phone=str(data["phone"]) if data.get("phone") else None,
+            is_saved=bool(data.get("is_saved")),
+            is_business=bool(data.get("is_business")),
+            is_me=bool(data.get("is_me")),
+        )
+
+    @property
+    def formatted_phone(self) -> Optional[str]:
+        """The phone in international format with a leading '+'."""
+        return f"+{self.phone}" if self.phone else None
@@ -0,0 +1,262 @@
+"""
+Phone number normalization and indexing for WhatsApp Bot SMGM.
+
+This module turns the many ways WhatsApp Web displays a number ("+55 11
+99999-0001", "5511999990001", a saved contact's drawer text...) into a single
+E.164 form, so the same person is recognised whatever screen the number came
+from. PhoneIndex keeps phones deduplicated on insertion, and PhoneFilter
+answers exact, suffix and country/area prefix exclusions with a constant
+number of set lookups per phone, however many exclusions are given.
+
+Author: Diego Bloise
+Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from config import (
+    DEFAULT_COUNTRY_CODE, E164_MAX_DIGITS, MAX_SUFFIX_DIGITS,
+    MIN_PHONE_DIGITS, NATIONAL_NUMBER_LENGTHS
+)
+from logger import Logger
+
+
+def phone_digits(phone: str) -> str:
+    """Keep only the digits of a phone."""
+    return "".join(c for c in phone if c.isdigit())
+
+
+def normalize_phone(phone: str, default_country: str = DEFAULT_COUNTRY_CODE) -> Optional[str]:
+    """
+    Normalize a phone number to E.164.
+
+    Numbers starting with "+" or "00" are taken as international. Other
+    numbers with the length of a national number (area code included, an
+    optional trunk "0" aside) get the default country code, and those made
+    of the default country code and a national number are kept as they
+    are. Any other number without a prefix is rejected, since it cannot be
+    told which country it belongs to.
+
+    Args:
+        phone (str): Phone number in any display format
+        default_country (str): Country code of national numbers
+
+    Returns:
+        Optional[str]: The number as "+<digits>", or None if it is not a
+        plausible phone number
+    """
+    text = phone.strip()
+    digits = phone_digits(text)
+
+    if text.startswith("+"):
+        pass
+    elif digits.startswith("00"):
+        digits = digits[2:]
+    elif len(digits.lstrip("0")) in NATIONAL_NUMBER_LENGTHS:
+        digits = default_country + digits.lstrip("0")
+    elif not (digits.startswith(default_country)
+              and len(digits) - len(default_country) in NATIONAL_NUMBER_LENGTHS):
+        return None
+
+    if not MIN_PHONE_DIGITS <= len(digits) <= E164_MAX_DIGITS:
+        return None
+    return f"+{digits}"
+
+
+def phone_key(phone: str) -> str:
+    """Key matching one number across formats, even when it cannot be normalized."""
+    return normalize_phone(phone) or phone_digits(phone)
+
+
+class PhoneFilter:
+    """
+    Set of phone exclusion rules.
+
+    Rules are parsed from user tokens:
+
+    - "1234": suffix, the last digits of the number (up to MAX_SUFFIX_DIGITS)
+    - "+55 11 99999-0001" or "11999990001": one exact number
+    - "+55*" or "+5511*": international prefix (country, or country and area)
+    - "11*": national prefix, the area code in the default country
+
+    Attributes:
+        exact (Set[str]): Excluded numbers in E.164
+        suffixes (Dict[int, Set[str]]): Excluded suffixes keyed by length
+        prefixes (Dict[int, Set[str]]): Excluded E.164 prefixes keyed by length
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty filter that excludes nothing."""
+        self.exact: Set[str] = set()
+        self.suffixes: Dict[int, Set[str]] = {}
+        self.prefixes: Dict[int, Set[str]] = {}
+
+    @classmethod
+    def parse(cls, tokens: Iterable[str], default_country: str = DEFAULT_COUNTRY_CODE) -> "PhoneFilter":
+        """
+        Build a filter from exclusion tokens.
+
+        Args:
+            tokens (Iterable[str]): Exclusions as typed by the user
+            default_country (str): Country code of national numbers and prefixes
+
+        Returns:
+            PhoneFilter: The parsed filter; unusable tokens are logged and ignored
+        """
+        exclusions = cls()
+        for token in tokens:
+            token = token.strip()
+            digits = phone_digits(token)
+            if not digits:
+                continue
+
+            if token.endswith("*"):
+                prefix = digits if token.startswith("+") else default_country + digits.lstrip("0")
+                exclusions.prefixes.setdefault(len(prefix), set()).add(prefix)
+            elif len(digits) <= MAX_SUFFIX_DIGITS and not token.startswith("+"):
+                exclusions.suffixes.setdefault(len(digits), set()).add(digits)
+            else:
+                phone = normalize_phone(token, default_country)
+                if phone:
+                    exclusions.exact.add(phone)
+                else:
+                    Logger.warn(f"Ignoring exclusion that is not a phone number: {token}")
+        return exclusions
+
+    def __bool__(self) -> bool:
+        return bool(self.exact or self.suffixes or self.prefixes)
+
+    def match(self, phone: str) -> Optional[str]:
+        """
+        Find the rule excluding a phone.
+
+        Args:
+            phone (str): Phone number in E.164
+
+        Returns:
+            Optional[str]: The matching rule ("+E164", "*suffix" or "prefix*"),
+            or None if the phone is not excluded
+        """
+        if phone in self.exact:
+            return phone
+
+        digits = phone[1:]
+        for length, suffixes in self.suffixes.items():
+            if digits[-length:] in suffixes:
+                return f"*{digits[-length:]}"
+        for length, prefixes in self.prefixes.items():
+            if digits[:length] in prefixes:
+                return f"+{digits[:length]}*"
+        return None
+
+    def matches(self, phone: str) -> bool:
+        """Check whether a phone in E.164 is excluded."""
+        return self.match(phone) is not None
+
+
+class PhoneIndex:
+    """
+    Insertion-ordered set of phone numbers keyed by their E.164 form.
+
+    Attributes:
+        default_country (str): Country code of national numbers
+        rejected (List[str]): Inputs that could not be normalized
+    """
+
+    def __init__(self, phones: Iterable[str] = (), default_country: str = DEFAULT_COUNTRY_CODE) -> None:
+        """
+        Initialize the index.
+
+        Args:
+            phones (Iterable[str]): Phones to add, in any display format
+            default_country (str): Country code of national numbers
+        """
+        self.default_country = default_country
+        self.rejected: List[str] = []
+        self._phones: Dict[str, str] = {}
+
+        for phone in phones:
+            self.add(phone)
+
+    def add(self, phone: str) -> Optional[str]:
+        """
+        Add a phone unless the same number is already indexed.
+
+        Args:
+            phone (str): Phone in any display format
+
+        Returns:
+            Optional[str]: The E.164 number if it was new, None if it was a
+            duplicate or not a phone number
+        """
+        normalized = normalize_phone(phone, self.default_country)
+        if normalized is None:
+            self.rejected.append(phone)
+            return None
+        if normalized in self._phones:
+            return None
+
+        self._phones[normalized] = phone
+        return normalized
+
+    def __contains__(self, phone: object) -> bool:
+        if not isinstance(phone, str):
+            return False
+        return normalize_phone(phone, self.default_country) in self._phones
+
+    def __len__(self) -> int:
+        return len(self._phones)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._phones)
+
+    def original(self, phone: str) -> str:
+        """Get the first display form an indexed E.164 number was added with."""
+        return self._phones[phone]
+
+    def exclude(self, exclusions: PhoneFilter) -> List[str]:
+        """
+        Get the indexed phones not matched by any exclusion, in insertion order.
+
+        A suffix that matches more than one phone is reported, as it may be
+        excluding people other than the one intended.
+
+        Args:
+            exclusions (PhoneFilter): Exclusion rules
+
+        Returns:
+            List[str]: Remaining phones in E.164
+        """
+        if not exclusions:
+            return list(self._phones)
+
+        kept = []
+        matched_by: Dict[str, List[str]] = {}
+        for phone in self._phones:
+            rule = exclusions.match(phone)
+            if rule is None:
+                kept.append(phone)
+            else:
+                matched_by.setdefault(rule, []).append(phone)
+
+        for rule, phones in matched_by.items():
+            if rule.startswith("*") and len(phones) > 1:
+                Logger.warn(
+                    f"Suffix {rule[1:]} excludes {len(phones)} phones ({', '.join(phones)}); "
+                    f"type more digits or the full number to exclude only one"
+                )
+        return kept
+
+
+def filter_phones(phones: Iterable[str], exclusions: Iterable[str]) -> List[str]:
+    """
+    Normalize, deduplicate and filter phones in a single pass.
+
+    Args:
+        phones (Iterable[str]): Phones in any display format
+        exclusions (Iterable[str]): Exclusion tokens, see PhoneFilter
+
+    Returns:
+        List[str]: Remaining phones in E.164, in their original order
+    """
+    return PhoneIndex(phones).exclude(PhoneFilter.parse(exclusions))
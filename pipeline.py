@@ -0,0 +1,151 @@
+"""
+Streaming extraction-to-send pipeline for WhatsApp Bot SMGM.
+
+This module overlaps the two phases of a campaign: a producer thread walks the
+group with WhatsAppBot.iter_group_phones() while the sender stage messages each
+phone as soon as it comes out, through a bounded queue that applies
+backpressure. Exclusions, duplicates and phones already sent by an earlier
+run of the campaign are filtered on the fly, so the total
+campaign time approaches the longer of the two phases instead of their sum.
+
+Extraction and sending drive different pages, so they must run on two
+different browser sessions (for instance two accounts, or the same WhatsApp
+number linked as two devices).
+
+Author: Diego Bloise
+Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
+"""
+
+import queue
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+from config import PIPELINE_QUEUE_SIZE
+from journal import CampaignJournal, SendStatus
+from logger import Logger
+from phone_index import PhoneIndex
+
+
+class StreamingCampaign:
+    """
+    Producer/consumer pipeline from a phone stream to a sender.
+
+    Attributes:
+        maxsize (int): Capacity of the queue between the two stages
+        extracted (List[str]): Every distinct phone produced by the extractor
+        results (Dict[str, bool]): Send result per recipient
+    """
+
+    # Marks the end of the phone stream
+    _DONE = object()
+
+    def __init__(
+        self,
+        phones: Iterable[str],
+        send: Callable[[str], bool],
+        keep: Optional[Callable[[str], bool]] = None,
+        journal: Optional[CampaignJournal] = None,
+        maxsize: int = PIPELINE_QUEUE_SIZE
+    ) -> None:
+        """
+        Initialize the pipeline.
+
+        Args:
+            phones (Iterable[str]): Phone stream, typically iter_group_phones()
+            send (Callable[[str], bool]): Sends the campaign message to a phone
+            keep (Optional[Callable[[str], bool]]): Returns False for phones
+                that must be excluded
+            journal (Optional[CampaignJournal]): Journal receiving recipients
+                and send states as they happen
+            maxsize (int): Capacity of the queue between the two stages
+        """
+        self.maxsize = maxsize
+        self.extracted: List[str] = []
+        self.results: Dict[str, bool] = {}
+
+        self._phones = phones
+        self._send = send
+        self._keep = keep or (lambda phone: True)
+        self._journal = journal
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize)
+        self._producer_error: Optional[BaseException] = None
+        self._exhausted = False
+        self._stop = threading.Event()
+
+    def _produce(self) -> None:
+        """Push extracted, filtered and deduplicated phones into the queue."""
+        seen = PhoneIndex()
+        try:
+            for phone in self._phones:
+                if self._stop.is_set():
+                    break
+
+                if seen.add(phone) is None:
+                    # Duplicate, or not a phone number at all
+                    continue
+
+                self.extracted.append(phone)
+                if not self._keep(phone):
+                    continue
+                if self._journal and self._journal.state.is_settled(phone):
+                    continue
+
+                if self._journal:
+                    self._journal.record_recipient(phone)
+                self._queue.put(phone)
+            else:
+                self._exhausted = True
+        except BaseException as e:
+            # WhatsAppBot exits on fatal errors; hand the error to the sender
+            self._producer_error = e
+        finally:
+            self._queue.put(self._DONE)
+
+    def run(self) -> Dict[str, bool]:
+        """
+        Run both stages until the phone stream is exhausted.
+
+        Returns:
+            Dict[str, bool]: Send result per recipient, in extraction order
+        """
+        producer = threading.Thread(target=self._produce, name="extractor", daemon=True)
+        producer.start()
+
+        try:
+            while True:
+                phone = self._queue.get()
+                if phone is self._DONE:
+                    break
+                self._deliver(phone)
+        finally:
+            self._stop.set()
+            # Unblock the producer if it is waiting on a full queue
+            while producer.is_alive():
+                try:
+                    self._queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            producer.join()
+
+        if self._producer_error:
+            Logger.error(f"Extraction stopped early: {self._producer_error}")
+        elif self._journal and self._exhausted:
+            # Only a complete extraction may be skipped on resume
+            self._journal.record_extraction(self.extracted)
+
+        return self.results
+
+    def _deliver(self, phone: str) -> None:
+        """Send to one recipient and record the outcome."""
+        Logger.warn(
+            f"Sending message {len(self.results) + 1} to: {phone} "
+            f"({self._queue.qsize()} queued)"
+        )
+        if self._journal:
+            self._journal.record_send(phone, SendStatus.PENDING)
+
+        outcome = self._send(phone)
+        self.results[phone] = bool(outcome)
+
+        if self._journal:
+            self._journal.record_outcome(phone, outcome, "send_message failed")
@@ -0,0 +1,128 @@
+"""
+Persistent browser profiles for WhatsApp Bot SMGM.
+
+This module manages one Firefox profile directory per WhatsApp account so an
+authenticated session survives between runs and the QR code only has to be
+scanned once. Each profile is guarded by an exclusive lock file, which keeps
+two processes from ever opening the same profile at the same time.
+
+Author: Diego Bloise
+Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
+"""
+
+import os
+import re
+from typing import IO, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from config import PROFILES_DIR, PROFILE_LOCK_FILE
+
+
+class ProfileLockError(Exception):
+    """Raised when a profile is already in use by another process."""
+
+
+class BrowserProfile:
+    """
+    A persisted Firefox profile bound to a single WhatsApp account.
+
+    The lock is held through an OS-level file lock, so it is released
+    automatically if the owning process dies without cleaning up.
+
+    Attributes:
+        account (str): Name of the WhatsApp account using the profile
+        path (str): Absolute path of the profile directory
+        lock_path (str): Absolute path of the profile lock file
+    """
+
+    _ACCOUNT_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+    # Files Firefox writes once a profile has been used by a browser session
+    _SESSION_MARKERS = ("cookies.sqlite", "storage")
+
+    def __init__(self, account: str, base_dir: str = PROFILES_DIR) -> None:
+        """
+        Initialize the profile for an account.
+
+        Args:
+            account (str): Account name, used as the profile directory name
+            base_dir (str): Directory holding all account profiles
+
+        Raises:
+            ValueError: If the account name is not a safe directory name
+        """
+        if not self._ACCOUNT_PATTERN.match(account):
+            raise ValueError(f"Invalid account name: {account!r}")
+
+        self.account = account
+        self.path = os.path.abspath(os.path.join(base_dir, account))
+        self.lock_path = os.path.join(self.path, PROFILE_LOCK_FILE)
+        self._lock_file: Optional[IO[str]] = None
+
+    @property
+    def is_locked(self) -> bool:
+        """Whether this instance currently holds the profile lock."""
+        return self._lock_file is not None
+
+    def has_session(self) -> bool:
+        """
+        Check whether the profile was used by a previous browser session.
+
+        Returns:
+            bool: True if Firefox already stored data in the profile
+        """
+        return any(
+            os.path.exists(os.path.join(self.path, marker))
+            for marker in self._SESSION_MARKERS
+        )
+
+    def acquire(self) -> None:
+        """
+        Create the profile directory if needed and lock it.
+
+        Raises:
+            ProfileLockError: If another process holds the profile lock
+        """
+        if self._lock_file:
+            return
+
+        os.makedirs(self.path, exist_ok=True)
+        lock_file = open(self.lock_path, "a+")
+
+        try:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            lock_file.close()
+            raise ProfileLockError(
+                f"Profile '{self.account}' is already in use by another process"
+            )
+
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+        self._lock_file = lock_file
+
+    def release(self) -> None:
+        """Release the profile lock if it is held."""
+        if not self._lock_file:
+            return
+
+        try:
+            if fcntl:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._lock_file.seek(0)
+                msvcrt.locking(self._lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._lock_file.close()
+            self._lock_file = None
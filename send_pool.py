@@ -0,0 +1,270 @@
+"""
+Multi-account sharded sending for WhatsApp Bot SMGM.
+
+This module runs one supervised WhatsAppBot worker per WhatsApp account, each
+bound to its own persisted browser profile and relaunched if its browser dies.
+The recipient list is sharded across the accounts by a stable hash of the
+phone digits, so the same person always hears from the same sender, and the
+per-recipient results of every worker are merged back into a single mapping.
+
+Author: Diego Bloise
+Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
+"""
+
+import hashlib
+import threading
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from config import LEAN_BROWSER
+from journal import CampaignJournal, SendOutcome, SendStatus
+from logger import Logger
+from phone_index import PhoneIndex, phone_digits, phone_key
+from supervisor import BotSupervisor
+
+
+class SendPool:
+    """
+    Pool of browser workers, one per WhatsApp account.
+
+    Attributes:
+        accounts (List[str]): Accounts used as senders, in shard order
+        headless (bool): Whether workers started by the pool run headless
+        lean (bool): Whether workers started by the pool use the lean profile
+    """
+
+    def __init__(
+        self,
+        accounts: List[str],
+        headless: bool = False,
+        bots: Optional[Dict[str, BotSupervisor]] = None,
+        lean: bool = LEAN_BROWSER
+    ) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            accounts (List[str]): Accounts to send from
+            headless (bool): Whether workers started by the pool run headless
+            bots (Optional[Dict[str, BotSupervisor]]): Already started bots keyed
+                by account. They are reused as-is and never cleaned up by the
+                pool, which lets the extraction session double as a sender.
+            lean (bool): Whether workers started by the pool use the lean
+                browser profile
+
+        Raises:
+            ValueError: If no account is given
+        """
+        if not accounts:
+            raise ValueError("At least one account is required")
+
+        self.accounts = list(dict.fromkeys(accounts))
+        self.headless = headless
+        self.lean = lean
+        self._bots = dict(bots or {})
+
+    @staticmethod
+    def assign_account(phone: str, accounts: List[str]) -> str:
+        """
+        Pick the sender of a phone number by stable hashing.
+
+        Only the digits of the normalized phone are hashed, so formatting
+        differences do not move a recipient to another account.
+
+        Args:
+            phone (str): Recipient phone number
+            accounts (List[str]): Candidate sender accounts
+
+        Returns:
+            str: The account assigned to the phone
+        """
+        digits = phone_digits(phone_key(phone))
+        digest = hashlib.sha1(digits.encode()).hexdigest()
+        return accounts[int(digest, 16) % len(accounts)]
+
+    def shard(self, phones: List[str]) -> Dict[str, List[str]]:
+        """
+        Split recipients into one queue per account.
+
+        A number listed more than once, in any format, is only queued once.
+
+        Args:
+            phones (List[str]): Recipient phone numbers
+
+        Returns:
+            Dict[str, List[str]]: Recipients keyed by their sender account
+        """
+        shards: Dict[str, List[str]] = {account: [] for account in self.accounts}
+        index = PhoneIndex()
+        for phone in phones:
+            if index.add(phone) is not None:
+                shards[self.assign_account(phone, self.accounts)].append(phone)
+            elif phone in index:
+                Logger.warn(f"Skipping duplicate recipient: {phone}")
+            else:
+                Logger.warn(f"Skipping invalid phone number: {phone}")
+        return shards
+
+    def send(
+        self,
+        phones: List[str],
+        message: str,
+        journal: Optional[CampaignJournal] = None,
+        keep_going: Optional[Callable[[], bool]] = None,
+        attachment: Optional[str] = None,
+        render: Optional[Callable[[str], str]] = None
+    ) -> Dict[str, bool]:
+        """
+        Send a message to every recipient using all accounts in parallel.
+
+        When only one account has recipients the work runs in the calling
+        thread, so a single-account campaign behaves like a plain loop.
+
+        Args:
+            phones (List[str]): Recipient phone numbers
+            message (str): Message text to send
+            journal (Optional[CampaignJournal]): Journal receiving the send
+                state of every recipient
+            keep_going (Optional[Callable[[], bool]]): Checked before each
+                message; workers stop early once it returns False, leaving
+                the rest of their recipients unattempted
+            attachment (Optional[str]): File to send with the message as its
+                caption. Each worker uploads it once and forwards it to the
+                rest of its recipients.
+            render (Optional[Callable[[str], str]]): Personalizes the message
+                for each recipient, see templates.Personalizer
+
+        Returns:
+            Dict[str, bool]: Send result per recipient, in the input order
+
+        Raises:
+            SessionLostError: Or any other error that stopped a worker, such
+                as a browser session that could not be relaunched. The first
+                one is raised once every other worker is done; the unsent
+                recipients of the stopped worker stay pending in the journal.
+        """
+        results: Dict[str, bool] = {}
+        errors: List[BaseException] = []
+        lock = threading.Lock()
+        shards = [(account, queue) for account, queue in self.shard(phones).items() if queue]
+
+        if len(shards) == 1:
+            account, queue = shards[0]
+            self._run_worker(
+                account, queue, message, results, errors, lock, journal, keep_going,
+                attachment, render
+            )
+        else:
+            workers = [
+                threading.Thread(
+                    target=self._run_worker,
+                    args=(
+                        account, queue, message, results, errors, lock, journal, keep_going,
+                        attachment, render
+                    ),
+                    name=f"sender-{account}",
+                    daemon=True
+                )
+                for account, queue in shards
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+
+        if errors:
+            raise errors[0]
+
+        # Keyed by phone_key, so every format of a number gets its one send's result
+        return {phone: results.get(phone_key(phone), False) for phone in dict.fromkeys(phones)}
+
+    def _run_worker(
+        self,
+        account: str,
+        phones: List[str],
+        message: str,
+        results: Dict[str, bool],
+        errors: List[BaseException],
+        lock: threading.Lock,
+        journal: Optional[CampaignJournal] = None,
+        keep_going: Optional[Callable[[], bool]] = None,
+        attachment: Optional[str] = None,
+        render: Optional[Callable[[str], str]] = None
+    ) -> None:
+        """Send to the recipients assigned to a single account, collecting its fatal error."""
+        bot = self._bots.get(account)
+        owned = bot is None
+
+        try:
+            if owned:
+                bot = BotSupervisor(headless=self.headless, account=account, lean=self.lean)
+                bot.start_whatsapp()
+
+            if attachment:
+                deliveries = bot.send_attachment_to_many(phones, attachment, message)
+                failure = "send_attachment failed"
+            else:
+                deliveries = self._send_messages(bot, account, phones, message, journal, render)
+                failure = "send_message failed"
+
+            done = 0
+            try:
+                while True:
+                    if keep_going and not keep_going():
+                        Logger.info(f"[{account}] Stopping with {len(phones) - done} recipients left")
+                        break
+                    if bot.throttle.cap_wait() > bot.throttle.max_wait:
+                        Logger.warn(
+                            f"[{account}] Send cap reached, stopping with "
+                            f"{len(phones) - done} recipients left"
+                        )
+                        break
+
+                    delivery = next(deliveries, None)
+                    if delivery is None:
+                        break
+                    phone, outcome = delivery
+                    done += 1
+                    with lock:
+                        results[phone_key(phone)] = bool(outcome)
+                    Logger.event(
+                        "delivery", phone=phone, account=account, outcome=outcome.value
+                    )
+
+                    if journal:
+                        journal.record_outcome(phone, outcome, failure)
+            finally:
+                deliveries.close()
+
+            Logger.info(f"[{account}] Send rate: {bot.throttle.rate:.1f} messages/min")
+            browser = bot.get_browser_stats()
+            if browser.get("peak_rss_mb") is not None:
+                Logger.info(
+                    f"[{account}] Browser memory: {browser['rss_mb']} MB now, "
+                    f"{browser['peak_rss_mb']} MB peak, {browser['recycles']} recycles"
+                )
+
+        except (Exception, SystemExit) as e:
+            # A session that could not be relaunched ends only its own worker;
+            # its unsent recipients stay pending for a resumed campaign
+            Logger.error(f"[{account}] Worker stopped: {e}")
+            with lock:
+                errors.append(e)
+        finally:
+            if owned and bot:
+                bot.cleanup()
+
+    @staticmethod
+    def _send_messages(
+        bot: BotSupervisor,
+        account: str,
+        phones: List[str],
+        message: str,
+        journal: Optional[CampaignJournal] = None,
+        render: Optional[Callable[[str], str]] = None
+    ) -> Iterator[Tuple[str, SendOutcome]]:
+        """Send a text message to each phone in turn, yielding every outcome."""
+        for index, phone in enumerate(phones):
+            Logger.warn(f"[{account}] Sending message {index + 1}/{len(phones)} to: {phone}")
+            if journal:
+                journal.record_send(phone, SendStatus.PENDING)
+            yield phone, bot.send_message(phone, render(phone) if render else message)
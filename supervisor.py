@@ -0,0 +1,351 @@
+"""
+Self-healing browser sessions for WhatsApp Bot SMGM.
+
+This module wraps a WhatsAppBot in a supervisor that checks the session
+between operations: the browser must still answer, WhatsApp Web must show its
+chat list and the account must still be logged in. When Firefox or
+geckodriver has died, or the page stopped responding, the supervisor tears the
+session down, relaunches it on the same profile (the saved login makes a new
+QR code scan unnecessary), reopens the group being worked on and retries the
+interrupted operation. Relaunches and retries are bounded, so a campaign of
+several hours survives browser crashes without anyone watching it, while a
+session that cannot come back still ends the campaign.
+
+A logged-out account cannot be restored without scanning a QR code, so
+unattended sessions report it as SessionLostError instead of relaunching.
+
+The same relaunch recycles healthy browsers between two recipients when the
+bot reports that its memory, message count or uptime crossed the recycling
+thresholds, so memory stays flat however long a campaign runs.
+
+Author: Diego Bloise
+Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
+"""
+
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, TypeVar
+
+from config import SUPERVISOR_MAX_RESTARTS, SUPERVISOR_MAX_RETRIES, SUPERVISOR_RESTART_BACKOFF
+from journal import SendOutcome
+from logger import Logger
+from whatsapp_bot import BotError, WhatsAppBot
+
+T = TypeVar("T")
+
+
+class SessionLostError(BotError):
+    """Raised when a browser session is gone and cannot be brought back."""
+
+
+class BotSupervisor:
+    """
+    Keeps a WhatsAppBot session alive across browser crashes.
+
+    The supervisor is used in place of the bot: it wraps the operations that
+    drive the browser and forwards everything else (throttle, statistics,
+    contact names...) to the current bot.
+
+    Attributes:
+        max_restarts (int): Relaunch attempts in a row before giving up
+        restart_backoff (float): Seconds between two relaunch attempts,
+            doubled after each failed one
+        max_retries (int): Times an operation is retried after its session died
+        restarts (int): Sessions relaunched after dying so far
+        recycles (int): Healthy browsers relaunched to release memory so far
+    """
+
+    def __init__(
+        self,
+        max_restarts: int = SUPERVISOR_MAX_RESTARTS,
+        restart_backoff: float = SUPERVISOR_RESTART_BACKOFF,
+        max_retries: int = SUPERVISOR_MAX_RETRIES,
+        **bot_options: Any
+    ) -> None:
+        """
+        Initialize the supervisor. The browser is launched by start_whatsapp().
+
+        Args:
+            max_restarts (int): Relaunch attempts in a row before giving up
+            restart_backoff (float): Seconds between two relaunch attempts
+            max_retries (int): Times an operation is retried after its
+                session died
+            **bot_options: Arguments of every WhatsAppBot launched, see
+                WhatsAppBot.__init__
+        """
+        self.max_restarts = max_restarts
+        self.restart_backoff = restart_backoff
+        self.max_retries = max_retries
+        self.restarts = 0
+        self.recycles = 0
+
+        self._options: Dict[str, Any] = dict(bot_options, exit_on_error=False)
+        self._bot: Optional[WhatsAppBot] = None
+        self._group: Optional[str] = None
+        # Shared by every session, so names survive a relaunch
+        self._contact_names: Dict[str, str] = {}
+
+    @property
+    def bot(self) -> WhatsAppBot:
+        """The bot driving the current session."""
+        if self._bot is None:
+            raise BotError("The browser session is not running")
+        return self._bot
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes the supervisor does not define itself
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.bot, name)
+
+    def start_whatsapp(self) -> None:
+        """
+        Launch the browser and open WhatsApp Web.
+
+        Raises:
+            SessionLostError: If no launch attempt succeeded
+        """
+        self._relaunch("starting")
+
+    def check_health(self) -> Optional[str]:
+        """Check the current session, see WhatsAppBot.check_health."""
+        return self._bot.check_health() if self._bot else "no_browser"
+
+    def ensure_healthy(self) -> None:
+        """
+        Make sure the session can be driven, relaunching it if needed.
+
+        Raises:
+            SessionLostError: If the unattended account was logged out, or the
+                session could not be relaunched
+        """
+        problem = self.check_health()
+        if problem is None:
+            return
+        if problem == "logged_out" and not self._options.get("interactive", True):
+            raise SessionLostError(
+                f"Account '{self._options.get('account')}' was logged out, scan its QR code again"
+            )
+        self._relaunch(problem)
+
+    def _relaunch(self, reason: str, lost: bool = True) -> None:
+        """
+        Tear the session down and launch a new one on the same profile.
+
+        Args:
+            reason (str): Why the session is relaunched, for the logs
+            lost (bool): Whether the session died, rather than being recycled
+
+        Raises:
+            SessionLostError: If every attempt failed
+        """
+        restarting = self._bot is not None and lost
+        if restarting:
+            Logger.warn(f"Browser session lost ({reason}), relaunching...")
+            Logger.event("session_restart", reason=reason)
+
+        delay = self.restart_backoff
+        for attempt in range(1, self.max_restarts + 1):
+            self._teardown()
+            try:
+                self._launch()
+            except Exception as e:
+                Logger.warn(f"Launch attempt {attempt}/{self.max_restarts} failed: {e}")
+                if attempt < self.max_restarts:
+                    time.sleep(delay)
+                    delay *= 2
+                continue
+
+            if restarting:
+                self.restarts += 1
+                Logger.success(f"Browser session relaunched ({self.restarts} so far)")
+            return
+
+        self._teardown()
+        raise SessionLostError(
+            f"Could not launch the browser session after {self.max_restarts} attempts ({reason})"
+        )
+
+    def _launch(self) -> None:
+        """Start a bot, open WhatsApp Web and restore the group being worked on."""
+        bot = WhatsAppBot(**self._options)
+        # Later sessions keep the pacing and the cache of the first one
+        self._options.setdefault("throttle", bot.throttle)
+        self._options.setdefault("contact_cache", bot.contact_cache)
+        bot.contact_names = self._contact_names
+        self._bot = bot
+
+        bot.start_whatsapp()
+        if self._group:
+            bot.find_group(self._group)
+
+    def _teardown(self) -> None:
+        """Close the current browser session, whatever state it is in."""
+        if self._bot is not None:
+            self._bot.cleanup()
+            self._bot = None
+
+    def _call(self, operation: Callable[[WhatsAppBot], T], failed: Callable[[T], bool]) -> T:
+        """
+        Run an operation, relaunching the session and retrying if it died.
+
+        A failure is only retried when the session turns out to be unhealthy
+        afterwards; failures of a healthy session are the operation's own.
+
+        Args:
+            operation (Callable[[WhatsAppBot], T]): Operation on the current bot
+            failed (Callable[[T], bool]): Tells whether a result is a failure
+
+        Returns:
+            T: Result of the last attempt
+        """
+        retries = 0
+        while True:
+            self.ensure_healthy()
+            try:
+                result = operation(self.bot)
+                if not failed(result):
+                    return result
+            except Exception:
+                if retries >= self.max_retries or self.check_health() is None:
+                    raise
+            else:
+                if retries >= self.max_retries or self.check_health() is None:
+                    return result
+            retries += 1
+            Logger.warn(f"Retrying after the session died ({retries}/{self.max_retries})")
+
+    def _recycle_if_due(self) -> None:
+        """Reload the page or relaunch the browser if the bot asks for it."""
+        due = self._bot.recycle_due() if self._bot else None
+        if due is None:
+            return
+
+        stats = {
+            "rss_mb": self._bot.memory.rss_mb if self._bot.memory else None,
+            "messages": self._bot.messages,
+        }
+        Logger.event("browser_recycle", scope=due, **stats)
+        if due == "page":
+            Logger.info(f"Reloading WhatsApp Web to release memory ({stats['rss_mb']} MB)...")
+            try:
+                self._bot.reload_page()
+            except Exception as e:
+                # The health check before the next operation takes over
+                Logger.warn(f"Could not reload WhatsApp Web: {e}")
+            return
+
+        Logger.info(f"Relaunching the browser to release memory ({stats['rss_mb']} MB)...")
+        self._relaunch("recycling", lost=False)
+        self.recycles += 1
+
+    def get_browser_stats(self) -> Dict[str, Any]:
+        """Get the current browser's figures, see WhatsAppBot.get_browser_stats, with relaunch counts."""
+        stats = self._bot.get_browser_stats() if self._bot else {}
+        stats.update({"restarts": self.restarts, "recycles": self.recycles})
+        return stats
+
+    def find_group(self, group_name: str) -> None:
+        """Open a group, reopening it after any relaunch until another step starts."""
+        self._group = group_name
+        self._call(lambda bot: bot.find_group(group_name), lambda _: False)
+
+    def get_group_phones(self) -> List[str]:
+        """Extract the phones of the open group, see iter_group_phones."""
+        return list(self.iter_group_phones())
+
+    def iter_group_phones(self) -> Iterator[str]:
+        """
+        Yield the phones of the open group, extracting it again after a crash.
+
+        Phones already yielded before a relaunch are not yielded twice.
+
+        Yields:
+            str: Phone number of a group member, in E.164
+        """
+        seen: Set[str] = set()
+        retries = 0
+        while True:
+            self.ensure_healthy()
+            try:
+                for phone in self.bot.iter_group_phones():
+                    if phone not in seen:
+                        seen.add(phone)
+                        yield phone
+                return
+            except Exception:
+                if retries >= self.max_retries or self.check_health() is None:
+                    raise
+            retries += 1
+            Logger.warn(
+                f"Session died after {len(seen)} phones, extracting the group again "
+                f"({retries}/{self.max_retries})"
+            )
+
+    def send_message(self, phone: str, message: str) -> SendOutcome:
+        """
+        Send a message, retrying it in a new session if the browser died.
+
+        A send that got as far as its send button comes back UNCONFIRMED
+        instead of FAILED and is never retried, so nobody gets it twice.
+        """
+        self._group = None
+        self._recycle_if_due()
+        return self._call(
+            lambda bot: bot.send_message(phone, message),
+            lambda outcome: outcome == SendOutcome.FAILED
+        )
+
+    def send_attachment(self, phone: str, path: str, caption: str = "") -> SendOutcome:
+        """Send a file, retrying it in a new session if the browser died before sending it."""
+        self._group = None
+        self._recycle_if_due()
+        return self._call(
+            lambda bot: bot.send_attachment(phone, path, caption),
+            lambda outcome: outcome == SendOutcome.FAILED
+        )
+
+    def send_attachment_to_many(
+        self,
+        phones: List[str],
+        path: str,
+        caption: str = ""
+    ) -> Iterator[Tuple[str, SendOutcome]]:
+        """
+        Send a file to many phones, resuming in a new session after a crash.
+
+        The phones not reached when the browser died start over in the new
+        session, uploading the file once again. The browser is only recycled
+        before the first upload, as forwarding needs the uploaded message.
+
+        Yields:
+            Tuple[str, SendOutcome]: Each phone with the outcome of its send
+        """
+        self._group = None
+        self._recycle_if_due()
+        pending = list(phones)
+        retries = 0
+        while pending:
+            self.ensure_healthy()
+            deliveries = self.bot.send_attachment_to_many(list(pending), path, caption)
+            crashed = False
+            try:
+                for phone, outcome in deliveries:
+                    if (outcome == SendOutcome.FAILED and retries < self.max_retries
+                            and self.check_health() is not None):
+                        crashed = True
+                        break
+                    pending.remove(phone)
+                    yield phone, outcome
+            finally:
+                deliveries.close()
+            if not crashed:
+                return
+            retries += 1
+            Logger.warn(
+                f"Session died with {len(pending)} recipients left, "
+                f"resuming the attachment ({retries}/{self.max_retries})"
+            )
+
+    def cleanup(self) -> None:
+        """Close the browser session."""
+        self._teardown()
@@ -0,0 +1,317 @@
+"""
+Personalized message templates for WhatsApp Bot SMGM.
+
+This module lets a campaign message carry placeholders such as "{name}",
+"{group}", "{phone}" or any column of a recipient CSV file. A template is
+parsed and validated once per campaign into literal and placeholder segments,
+so rendering it for each of thousands of recipients is a plain join.
+
+Placeholders are written "{field}" or "{field|default}", the default being
+used when a recipient has no value for the field. "{{" and "}}" stand for
+literal braces; any other brace is kept as typed.
+
+Author: Diego Bloise
+Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
+"""
+
+import csv
+import re
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+from urllib.parse import quote
+
+from config import MAX_MESSAGE_LENGTH, TEMPLATE_FIELDS
+from phone_index import normalize_phone
+
+_TOKEN = re.compile(r"\{\{|\}\}|\{([A-Za-z_]\w*)(?:\|([^{}]*))?\}")
+
+
+class TemplateError(ValueError):
+    """Raised when a template or its recipient data cannot be used."""
+
+
+def field_name(column: str) -> str:
+    """Turn a CSV column header into a placeholder name ("First Name" -> "first_name")."""
+    return re.sub(r"\W+", "_", column.strip().lower()).strip("_")
+
+
+def url_encode(message: str) -> str:
+    """
+    Encode a message for the text= parameter of a WhatsApp Web URL.
+
+    Args:
+        message (str): Message text with "\\n" line markers
+
+    Returns:
+        str: The message percent-encoded as UTF-8, line markers as newlines
+    """
+    return quote(message.replace("\\n", "\n"), safe="")
+
+
+class MessageTemplate:
+    """
+    A message parsed into literal text and placeholders.
+
+    Attributes:
+        text (str): The template as written
+        segments (Tuple[Tuple[str, Optional[str], str], ...]): Literal text,
+            then the placeholder that follows it (None for the last segment)
+            and the placeholder's default
+    """
+
+    def __init__(self, text: str, segments: Tuple[Tuple[str, Optional[str], str], ...]) -> None:
+        """Initialize a template from already parsed segments, see compile()."""
+        self.text = text
+        self.segments = segments
+
+    @classmethod
+    def compile(cls, text: str, fields: Iterable[str] = TEMPLATE_FIELDS) -> "MessageTemplate":
+        """
+        Parse and validate a template.
+
+        Args:
+            text (str): Template text
+            fields (Iterable[str]): Placeholders the recipient data provides
+
+        Returns:
+            MessageTemplate: The compiled template
+
+        Raises:
+            TemplateError: If a placeholder is not one of ``fields`` or the
+                text alone is longer than MAX_MESSAGE_LENGTH
+        """
+        known = set(fields)
+        segments: List[Tuple[str, Optional[str], str]] = []
+        literal: List[str] = []
+        position = 0
+
+        for match in _TOKEN.finditer(text):
+            literal.append(text[position:match.start()])
+            position = match.end()
+
+            token = match.group(0)
+            if token in ("{{", "}}"):
+                literal.append(token[0])
+                continue
+
+            name = match.group(1)
+            if name not in known:
+                raise TemplateError(
+                    f"Unknown placeholder {{{name}}}, available: "
+                    f"{', '.join('{' + field + '}' for field in sorted(known))}"
+                )
+            segments.append(("".join(literal), name, match.group(2) or ""))
+            literal = []
+
+        literal.append(text[position:])
+        segments.append(("".join(literal), None, ""))
+
+        template = cls(text, tuple(segments))
+        if template.max_length({}) > MAX_MESSAGE_LENGTH:
+            raise TemplateError(
+                f"Message is longer than WhatsApp's limit of {MAX_MESSAGE_LENGTH} characters"
+            )
+        return template
+
+    @property
+    def fields(self) -> Set[str]:
+        """Placeholders used by the template."""
+        return {name for _, name, _ in self.segments if name is not None}
+
+    def render(self, values: Mapping[str, str]) -> str:
+        """
+        Fill the placeholders in for one recipient.
+
+        Args:
+            values (Mapping[str, str]): Value of each field for the recipient
+
+        Returns:
+            str: The personalized message
+        """
+        parts = []
+        for literal, name, default in self.segments:
+            parts.append(literal)
+            if name is not None:
+                parts.append(values.get(name) or default)
+        return "".join(parts)
+
+    def max_length(self, longest: Mapping[str, int]) -> int:
+        """
+        Get the length of the longest message the template can render.
+
+        Args:
+            longest (Mapping[str, int]): Length of the longest value of each
+                field over all recipients
+
+        Returns:
+            int: Worst-case message length in characters
+        """
+        return sum(
+            len(literal) + (max(longest.get(name, 0), len(default)) if name is not None else 0)
+            for literal, name, default in self.segments
+        )
+
+
+class RecipientData:
+    """
+    Per-recipient placeholder values loaded from a CSV file.
+
+    The file needs a "phone" column; every other column becomes a placeholder
+    named after its header (see field_name).
+
+    Attributes:
+        columns (List[str]): Placeholder names of the CSV columns
+    """
+
+    def __init__(self, columns: Iterable[str] = (), rows: Optional[Dict[str, Dict[str, str]]] = None) -> None:
+        """
+        Initialize the data.
+
+        Args:
+            columns (Iterable[str]): Placeholder names of the columns
+            rows (Optional[Dict[str, Dict[str, str]]]): Values keyed by E.164 phone
+        """
+        self.columns = list(columns)
+        self._rows = rows or {}
+
+    @classmethod
+    def from_csv(cls, path: str) -> "RecipientData":
+        """
+        Load recipient data from a CSV file.
+
+        Args:
+            path (str): Location of the CSV file
+
+        Returns:
+            RecipientData: The loaded data
+
+        Raises:
+            TemplateError: If the file has no phone column
+            OSError: If the file cannot be read
+        """
+        with open(path, newline="", encoding="utf-8-sig") as data_file:
+            reader = csv.reader(data_file)
+            header = [field_name(column) for column in next(reader, [])]
+            if "phone" not in header:
+                raise TemplateError(f"{path} has no 'phone' column")
+
+            phone_column = header.index("phone")
+            rows = {}
+            for line in reader:
+                if len(line) <= phone_column:
+                    continue
+                phone = normalize_phone(line[phone_column])
+                if phone:
+                    rows[phone] = {
+                        column: value.strip()
+                        for column, value in zip(header, line) if column and column != "phone"
+                    }
+
+        return cls([column for column in header if column and column != "phone"], rows)
+
+    @property
+    def fields(self) -> Set[str]:
+        """Placeholders available to templates: the built-in ones and every column."""
+        return set(TEMPLATE_FIELDS) | set(self.columns)
+
+    def row(self, phone: str) -> Dict[str, str]:
+        """Get the CSV values of a phone in E.164, empty if it has no row."""
+        return self._rows.get(phone, {})
+
+
+class Personalizer:
+    """
+    Renders a compiled template for each recipient of a campaign.
+
+    Names and groups are looked up when a message is rendered, so mappings
+    that keep filling up during a streamed extraction can be passed in.
+
+    Attributes:
+        template (MessageTemplate): Compiled campaign message
+        data (RecipientData): Values of the CSV columns
+        names (Mapping[str, str]): Contact name per E.164 phone
+        groups (Mapping[str, List[str]]): Groups each phone was found in
+        default_group (str): Group used for phones missing from ``groups``
+    """
+
+    def __init__(
+        self,
+        template: MessageTemplate,
+        data: Optional[RecipientData] = None,
+        names: Optional[Mapping[str, str]] = None,
+        groups: Optional[Mapping[str, List[str]]] = None,
+        default_group: str = ""
+    ) -> None:
+        """
+        Initialize the personalizer.
+
+        Args:
+            template (MessageTemplate): Compiled campaign message
+            data (Optional[RecipientData]): Values of the CSV columns
+            names (Optional[Mapping[str, str]]): Contact name per phone
+            groups (Optional[Mapping[str, List[str]]]): Groups per phone
+            default_group (str): Group used for phones missing from ``groups``
+        """
+        self.template = template
+        self.data = data or RecipientData()
+        self.names = names if names is not None else {}
+        self.groups = groups if groups is not None else {}
+        self.default_group = default_group
+
+    def values(self, phone: str) -> Dict[str, str]:
+        """
+        Get the value of every field for one recipient.
+
+        A non-empty CSV value takes precedence over the built-in fields.
+
+        Args:
+            phone (str): Recipient phone in E.164
+
+        Returns:
+            Dict[str, str]: Field values of the recipient
+        """
+        groups = self.groups.get(phone)
+        values = {
+            "phone": phone,
+            "name": self.names.get(phone, ""),
+            "group": groups[0] if groups else self.default_group,
+        }
+        for column, value in self.data.row(phone).items():
+            if value:
+                values[column] = value
+        return values
+
+    def __call__(self, phone: str) -> str:
+        """Render the message for one recipient."""
+        if len(self.template.segments) == 1:
+            return self.template.segments[0][0]
+        return self.template.render(self.values(phone))
+
+    def check_length(self, phones: Iterable[str]) -> None:
+        """
+        Make sure no recipient's message exceeds MAX_MESSAGE_LENGTH.
+
+        Only the longest value of each field is considered, so nothing is
+        rendered.
+
+        Args:
+            phones (Iterable[str]): Recipients in E.164
+
+        Raises:
+            TemplateError: If the longest possible message is too long
+        """
+        fields = self.template.fields
+        if not fields:
+            return
+
+        longest: Dict[str, int] = {}
+        for phone in phones:
+            for name, value in self.values(phone).items():
+                if name in fields and len(value) > longest.get(name, 0):
+                    longest[name] = len(value)
+
+        length = self.template.max_length(longest)
+        if length > MAX_MESSAGE_LENGTH:
+            raise TemplateError(
+                f"Personalized messages can reach {length} characters, "
+                f"over WhatsApp's limit of {MAX_MESSAGE_LENGTH}"
+            )
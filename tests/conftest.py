@@ -0,0 +1,13 @@
+"""
+Shared pytest setup for WhatsApp Bot SMGM tests.
+
+The modules live at the repository root, which is put on the import path.
+
+Author: Diego Bloise
+Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,82 @@
+"""
+Tests for the campaign daemon's handling of failed dispatches.
+
+Author: Diego Bloise
+Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
+"""
+
+import json
+import os
+
+import pytest
+
+import daemon
+from daemon import CampaignDaemon, CampaignDefinition, CampaignQueue
+from supervisor import SessionLostError
+
+
+class BrokenSupervisor:
+    """Stand-in for BotSupervisor whose browser never comes up."""
+
+    launches = 0
+
+    def __init__(self, **options):
+        self.options = options
+
+    def start_whatsapp(self):
+        BrokenSupervisor.launches += 1
+        raise SessionLostError("Could not launch the browser session after 3 attempts")
+
+    def check_health(self):
+        return "no_browser"
+
+    def cleanup(self):
+        pass
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    """A queue holding three campaigns, in a scratch working directory."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(daemon, "BotSupervisor", BrokenSupervisor)
+    BrokenSupervisor.launches = 0
+
+    queue = CampaignQueue(str(tmp_path / "queue"))
+    for name in ("c1", "c2", "c3"):
+        with open(os.path.join(queue.directory, f"{name}.json"), "w", encoding="utf-8") as f:
+            json.dump({"groups": ["Family"], "message": "Hello", "window": ["00:00", "00:00"]}, f)
+    return queue
+
+
+def queued(directory):
+    return sorted(entry for entry in os.listdir(directory) if entry.endswith(".json"))
+
+
+def test_session_failure_keeps_campaigns_queued(queue):
+    CampaignDaemon(queue=queue, poll_interval=0).run(once=True)
+
+    assert BrokenSupervisor.launches == 1
+    assert queued(queue.failed_dir) == []
+    assert queued(queue.active_dir) == ["c1.json"]
+    assert queued(queue.directory) == ["c2.json", "c3.json"]
+
+
+def test_session_failures_back_off(queue):
+    campaign_daemon = CampaignDaemon(queue=queue, poll_interval=10)
+    for _ in range(3):
+        campaign_daemon._dispatch(queue.next_due(daemon.datetime.now()))
+
+    assert campaign_daemon._retry_delay() == 40
+    assert queued(queue.failed_dir) == []
+
+
+def test_campaign_error_fails_only_that_campaign(queue):
+    path = os.path.join(queue.directory, "c1.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"groups": ["Family"], "message": "Hi {name}", "attachment": __file__}, f)
+
+    campaign_daemon = CampaignDaemon(queue=queue, poll_interval=0)
+    campaign_daemon._dispatch(CampaignDefinition.from_file(path))
+
+    assert queued(queue.failed_dir) == ["c1.json"]
+    assert BrokenSupervisor.launches == 0
@@ -0,0 +1,48 @@
+"""
+Tests for the confirmation of sent messages from their ticks.
+
+Author: Diego Bloise
+Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
+"""
+
+import pytest
+
+import whatsapp_bot
+from journal import SendOutcome
+from waiter import Waiter
+from whatsapp_bot import WhatsAppBot
+
+
+class TickBrowser:
+    """Browser whose last outgoing message goes through a list of statuses."""
+
+    def __init__(self, *statuses):
+        self.statuses = list(statuses)
+
+    def execute_script(self, script, *args):
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        return {"count": 1, "id": "new", "status": status}
+
+
+def confirm(monkeypatch, *statuses):
+    monkeypatch.setattr(whatsapp_bot, "DELIVERY_TIMEOUT", 0.2)
+    bot = object.__new__(WhatsAppBot)
+    bot.browser = TickBrowser(*statuses)
+    bot.waiter = Waiter(bot.browser, initial_interval=0.01, max_interval=0.01)
+    return bot._confirm_delivery({"count": 0, "id": None})
+
+
+@pytest.mark.parametrize("statuses, outcome", [
+    (["pending", "sent"], SendOutcome.SENT),
+    (["pending", "delivered"], SendOutcome.DELIVERED),
+    (["read"], SendOutcome.DELIVERED),
+    (["error"], SendOutcome.FAILED),
+    (["", "sent"], SendOutcome.SENT),
+])
+def test_recognized_ticks_settle_the_send(monkeypatch, statuses, outcome):
+    assert confirm(monkeypatch, *statuses) == outcome
+
+
+@pytest.mark.parametrize("status", ["", "pending"])
+def test_missing_tick_is_unconfirmed(monkeypatch, status):
+    assert confirm(monkeypatch, status) == SendOutcome.UNCONFIRMED
@@ -0,0 +1,47 @@
+"""
+Tests for phone number normalization, exclusion rules and phone labels.
+
+Author: Diego Bloise
+Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
+"""
+
+import pytest
+
+from phone_index import PhoneFilter, normalize_phone
+from whatsapp_bot import WhatsAppBot
+
+
+@pytest.mark.parametrize("phone, normalized", [
+    ("+55 11 99999-0001", "+5511999990001"),
+    ("+1 (555) 123-4567", "+15551234567"),
+    ("0044 20 7946 0958", "+442079460958"),
+    ("11 99999-0001", "+5511999990001"),
+    ("(011) 99999-0001", "+5511999990001"),
+    ("5511999990001", "+5511999990001"),
+])
+def test_normalize_phone(phone, normalized):
+    assert normalize_phone(phone) == normalized
+
+
+@pytest.mark.parametrize("phone", ["99999-0001", "119999900", "551199999", "123456789012", ""])
+def test_unprefixed_number_of_the_wrong_length_is_rejected(phone):
+    assert normalize_phone(phone) is None
+
+
+def test_mistyped_exclusion_is_not_a_rule():
+    exclusions = PhoneFilter.parse(["99999-0001", "11 99999-0001"])
+
+    assert exclusions.exact == {"+5511999990001"}
+
+
+@pytest.mark.parametrize("label, is_phone", [
+    ("+55 11 99999-0001", True),
+    ("+1 (555) 123-4567", True),
+    ("+44 20 7946 0958", True),
+    ("Maria Silva", False),
+    ("Room 1199999000", False),
+    ("99999-0001", False),
+    ("", False),
+])
+def test_participant_label_is_phone(label, is_phone):
+    assert WhatsAppBot._is_phone_text(label) is is_phone
@@ -0,0 +1,53 @@
+"""
+Tests for the multi-account send pool.
+
+Author: Diego Bloise
+Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
+"""
+
+import pytest
+
+from journal import CampaignJournal, SendOutcome, SendStatus
+from send_pool import SendPool
+from supervisor import SessionLostError
+
+
+class Throttle:
+    rate = 1.0
+    max_wait = 10
+
+    def cap_wait(self):
+        return 0
+
+
+class DyingBot:
+    """Bot whose session is lost on its second message."""
+
+    def __init__(self):
+        self.throttle = Throttle()
+        self.sent = 0
+
+    def send_message(self, phone, message):
+        self.sent += 1
+        if self.sent == 2:
+            raise SessionLostError("Could not launch the browser session after 3 attempts")
+        return SendOutcome.SENT
+
+    def get_browser_stats(self):
+        return {}
+
+    def cleanup(self):
+        pass
+
+
+def test_lost_session_propagates_and_leaves_recipients_pending(tmp_path):
+    journal = CampaignJournal(directory=str(tmp_path))
+    journal.record_recipients(["+5511999990001", "+5511999990002", "+5511999990003"])
+
+    with pytest.raises(SessionLostError):
+        SendPool(["main"], bots={"main": DyingBot()}).send(journal.state.remaining(), "Hi", journal)
+
+    statuses = [journal.state.status_of(phone) for phone in journal.state.recipients]
+    assert statuses == [SendStatus.SENT, SendStatus.PENDING, SendStatus.PENDING]
+    assert journal.state.remaining() == ["+5511999990002", "+5511999990003"]
+    journal.close()
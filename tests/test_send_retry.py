@@ -0,0 +1,82 @@
+"""
+Tests for sends interrupted by a browser that died.
+
+Author: Diego Bloise
+Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
+"""
+
+from selenium.common.exceptions import WebDriverException
+
+from journal import SendOutcome
+from supervisor import BotSupervisor
+from whatsapp_bot import WhatsAppBot
+
+
+class Throttle:
+    def record(self, success):
+        pass
+
+
+class DeadButton:
+    def click(self):
+        raise WebDriverException("Failed to decode response from marionette")
+
+
+class CrashingBot(WhatsAppBot):
+    """Bot whose browser dies at a chosen step of send_message."""
+
+    def __init__(self, crash_on_click):
+        self.browser = object()
+        self.throttle = Throttle()
+        self.crash_on_click = crash_on_click
+        self.sends = 0
+        self.waiter = self
+        self.locators = self
+        self._send_clicked = False
+
+    def until(self, step, condition, timeout, message=None):
+        return DeadButton()
+
+    def clickable(self, name):
+        return None
+
+    def _known_invalid(self, phone):
+        return False
+
+    def _acquire_send_slot(self):
+        self.sends += 1
+        return True
+
+    def _open_chat(self, phone, message=None):
+        if not self.crash_on_click:
+            raise WebDriverException("Browsing context has been discarded")
+
+    def _last_outgoing(self):
+        return {}
+
+    def check_health(self):
+        return "browser_dead"
+
+    def recycle_due(self):
+        return None
+
+
+def supervised(bot):
+    supervisor = BotSupervisor(max_retries=2)
+    supervisor._bot = bot
+    supervisor._relaunch = lambda reason, lost=True: None
+    return supervisor
+
+
+def test_send_after_click_is_unconfirmed_and_not_retried():
+    bot = CrashingBot(crash_on_click=True)
+
+    assert supervised(bot).send_message("+5511999990001", "Hi") == SendOutcome.UNCONFIRMED
+    assert bot.sends == 1
+
+
+def test_send_before_click_is_retried():
+    bot = CrashingBot(crash_on_click=False)
+
+    assert supervised(bot).send_message("+5511999990001", "Hi") == SendOutcome.FAILED
+    assert bot.sends == 3
@@ -0,0 +1,247 @@
+"""
+Adaptive send throttle for WhatsApp Bot SMGM.
+
+This module paces the messages of one WhatsApp account with a token bucket:
+a few messages may go out back to back, after which they are spaced by the
+current rate plus a random jitter. The rate adapts AIMD-style to the observed
+outcomes, creeping up by a fixed step after each successful send and being
+cut by a factor after each failure or timeout, so the bot runs as fast as the
+account tolerates and backs off as soon as WhatsApp starts pushing back.
+
+Hourly and daily caps are enforced over rolling windows. Recent sends and the
+learned rate are kept in the account profile, so the caps hold across runs.
+
+Author: Diego Bloise
+Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from config import (
+    THROTTLE_BURST, THROTTLE_DAILY_CAP, THROTTLE_DECREASE, THROTTLE_ENABLED,
+    THROTTLE_HOURLY_CAP, THROTTLE_INCREASE, THROTTLE_INITIAL_RATE,
+    THROTTLE_JITTER, THROTTLE_MAX_RATE, THROTTLE_MAX_WAIT, THROTTLE_MIN_RATE
+)
+from logger import Logger
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+
+class RateGovernor:
+    """
+    Token bucket with AIMD rate adaptation and rolling send caps.
+
+    Instances are safe to share between threads.
+
+    Attributes:
+        enabled (bool): Whether sends are paced at all
+        min_rate (float): Lowest rate the governor backs off to (messages/min)
+        max_rate (float): Highest rate the governor ramps up to (messages/min)
+        burst (int): Messages that may be sent back to back
+        increase (float): Rate added after each success
+        decrease (float): Factor applied to the rate after each failure
+        jitter (float): Random extra pause, as a fraction of the interval
+        hourly_cap (int): Most sends per rolling hour
+        daily_cap (int): Most sends per rolling day
+        max_wait (float): Longest wait for a cap before acquire() gives up
+        state_path (Optional[str]): File keeping recent sends across runs
+        successes (int): Sends reported as successful
+        failures (int): Sends reported as failed
+    """
+
+    def __init__(
+        self,
+        rate: float = THROTTLE_INITIAL_RATE,
+        min_rate: float = THROTTLE_MIN_RATE,
+        max_rate: float = THROTTLE_MAX_RATE,
+        burst: int = THROTTLE_BURST,
+        increase: float = THROTTLE_INCREASE,
+        decrease: float = THROTTLE_DECREASE,
+        jitter: float = THROTTLE_JITTER,
+        hourly_cap: int = THROTTLE_HOURLY_CAP,
+        daily_cap: int = THROTTLE_DAILY_CAP,
+        max_wait: float = THROTTLE_MAX_WAIT,
+        state_path: Optional[str] = None,
+        enabled: bool = THROTTLE_ENABLED
+    ) -> None:
+        """
+        Initialize the governor, restoring its state if a state file exists.
+
+        Args:
+            rate (float): Starting rate in messages per minute
+            min_rate (float): Lowest rate in messages per minute
+            max_rate (float): Highest rate in messages per minute
+            burst (int): Messages that may be sent back to back
+            increase (float): Rate added after each success
+            decrease (float): Factor applied to the rate after each failure
+            jitter (float): Random extra pause, as a fraction of the interval
+            hourly_cap (int): Most sends per rolling hour
+            daily_cap (int): Most sends per rolling day
+            max_wait (float): Longest wait for a cap before acquire() gives up
+            state_path (Optional[str]): File keeping recent sends across runs
+            enabled (bool): Whether sends are paced at all
+        """
+        self.enabled = enabled
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.decrease = decrease
+        self.jitter = jitter
+        self.hourly_cap = hourly_cap
+        self.daily_cap = daily_cap
+        self.max_wait = max_wait
+        self.state_path = state_path
+        self.successes = 0
+        self.failures = 0
+
+        self._lock = threading.Lock()
+        self._rate = min(max(rate, min_rate), max_rate)
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        # Wall-clock times of the sends of the last day, oldest first
+        self._sends: Deque[float] = deque()
+
+        self._load()
+
+    @property
+    def rate(self) -> float:
+        """Current send rate in messages per minute."""
+        return self._rate
+
+    def _load(self) -> None:
+        """Restore the learned rate and recent sends from the state file."""
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, encoding="utf-8") as state_file:
+                state = json.load(state_file)
+            self._rate = min(max(float(state["rate"]), self.min_rate), self.max_rate)
+            self._sends.extend(sorted(float(sent_at) for sent_at in state["sends"]))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            Logger.warn(f"Ignoring unreadable throttle state: {e}")
+        self._prune(time.time())
+
+    def _save(self) -> None:
+        """Write the learned rate and recent sends to the state file."""
+        if not self.state_path:
+            return
+        temp_path = f"{self.state_path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as state_file:
+                json.dump({"rate": self._rate, "sends": list(self._sends)}, state_file)
+            os.replace(temp_path, self.state_path)
+        except OSError as e:
+            Logger.warn(f"Could not save throttle state: {e}")
+
+    def _prune(self, now: float) -> None:
+        """Forget sends older than a day. Must be called with the lock held."""
+        while self._sends and self._sends[0] <= now - DAY:
+            self._sends.popleft()
+
+    def cap_wait(self) -> float:
+        """
+        Get how long the hourly and daily caps hold the next send back.
+
+        Returns:
+            float: Seconds until one more send is allowed, 0 if it is now
+        """
+        if not self.enabled:
+            return 0.0
+
+        with self._lock:
+            now = time.time()
+            self._prune(now)
+            wait = 0.0
+
+            if self.daily_cap and len(self._sends) >= self.daily_cap:
+                wait = max(wait, self._sends[-self.daily_cap] + DAY - now)
+
+            in_last_hour = [sent_at for sent_at in self._sends if sent_at > now - HOUR]
+            if self.hourly_cap and len(in_last_hour) >= self.hourly_cap:
+                wait = max(wait, in_last_hour[-self.hourly_cap] + HOUR - now)
+
+            return max(wait, 0.0)
+
+    def acquire(self) -> bool:
+        """
+        Wait until the next message may be sent.
+
+        Returns:
+            bool: False without waiting if a cap holds sends back for longer
+            than max_wait, True once the message may be sent
+        """
+        if not self.enabled:
+            return True
+
+        cap_wait = self.cap_wait()
+        if cap_wait > self.max_wait:
+            return False
+
+        with self._lock:
+            now = time.monotonic()
+            interval = 60.0 / self._rate
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) / interval)
+            self._refilled_at = now
+
+            # Take the token now; a negative balance is the wait owed for it
+            self._tokens -= 1
+            wait = max(cap_wait, -self._tokens * interval)
+            wait += random.uniform(0, self.jitter * interval)
+
+        if wait > 0:
+            with Logger.span("throttle_wait"):
+                time.sleep(wait)
+
+        with self._lock:
+            self._sends.append(time.time())
+        return True
+
+    def record(self, success: bool) -> None:
+        """
+        Adapt the rate to the outcome of a send.
+
+        Args:
+            success (bool): Whether the message went out. Failures and
+                timeouts both cut the rate.
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if success:
+                self.successes += 1
+                self._rate = min(self.max_rate, self._rate + self.increase)
+            else:
+                self.failures += 1
+                self._rate = max(self.min_rate, self._rate * self.decrease)
+            self._save()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the current rate, cap usage and outcome counters.
+
+        Returns:
+            Dict[str, Any]: Throttle state as a plain dictionary
+        """
+        cap_wait = self.cap_wait()
+        with self._lock:
+            now = time.time()
+            return {
+                "enabled": self.enabled,
+                "rate_per_min": round(self._rate, 2),
+                "sent_last_hour": sum(1 for sent_at in self._sends if sent_at > now - HOUR),
+                "sent_last_day": len(self._sends),
+                "hourly_cap": self.hourly_cap,
+                "daily_cap": self.daily_cap,
+                "cap_wait_s": round(cap_wait, 1),
+                "successes": self.successes,
+                "failures": self.failures,
+            }
@@ -11,7 +11,7 @@ Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
 
 import os
 import sys
-from typing import List
+from typing import Dict, List
 
 from logger import Logger
 
@@ -69,18 +69,20 @@ class UIManager:
     @staticmethod
     def get_exclusion_input() -> List[str]:
         """
-        Get phone number suffixes to exclude from messaging.
+        Get phone numbers to exclude from messaging.
         
-        Prompts user for the last 4 digits of phone numbers to exclude,
-        allowing multiple exclusions separated by spaces.
+        Prompts user for the last digits of phone numbers to exclude, full
+        numbers, or area/country prefixes ending with "*", allowing multiple
+        exclusions separated by spaces.
         
         Returns:
-            List[str]: List of phone number suffixes to exclude
+            List[str]: List of exclusion tokens
         """
         exclusion_text = input(
-            "\nEnter the 4 final numbers of all phones\n"
-            "you want to exclude separated by spaces\n"
-            "Ex: XXXX XXXX XXXX\n\x1b[1;32m~>>\x1b[m "
+            "\nEnter the final numbers (or full numbers) of all phones\n"
+            "you want to exclude separated by spaces, end with * to\n"
+            "exclude an area or country prefix\n"
+            "Ex: XXXX +5511XXXXXXXXX 21*\n\x1b[1;32m~>>\x1b[m "
         )
         return exclusion_text.split(" ") if exclusion_text.strip() else []
 
@@ -141,6 +143,26 @@ class UIManager:
         for phone in phones:
             print(phone)
 
+    @staticmethod
+    def display_group_summary(groups: List[str], sources: Dict[str, List[str]]) -> None:
+        """
+        Display how many phones each group of a batch campaign contributed.
+
+        Args:
+            groups (List[str]): Groups of the campaign, in order
+            sources (Dict[str, List[str]]): Groups each phone was found in
+        """
+        if len(groups) < 2:
+            return
+
+        for group in groups:
+            found = [phone for phone, found_in in sources.items() if group in found_in]
+            only_here = [phone for phone in found if len(sources[phone]) == 1]
+            Logger.info(f"{group}: {len(found)} members, {len(only_here)} only in this group")
+
+        shared = sum(1 for found_in in sources.values() if len(found_in) > 1)
+        Logger.info(f"Members in more than one group: {shared} (messaged once)")
+
     @staticmethod
     def display_separator() -> None:
         """
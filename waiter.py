@@ -0,0 +1,210 @@
+"""
+Condition-driven wait engine for WhatsApp Bot SMGM.
+
+This module replaces fixed sleeps with polling waits that return as soon as
+the real readiness condition of a step holds. Every wait has its own ceiling,
+backs off exponentially between polls and records how long it actually took,
+so slow steps can be spotted without guessing.
+
+Author: Diego Bloise
+Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
+"""
+
+import time
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from selenium.common.exceptions import (
+    ElementNotInteractableException, NoSuchElementException,
+    StaleElementReferenceException, TimeoutException
+)
+
+from config import (
+    ELEMENT_WAIT_TIMEOUT, POLL_INITIAL_INTERVAL, POLL_MAX_INTERVAL,
+    POLL_BACKOFF_FACTOR
+)
+
+T = TypeVar("T")
+
+
+class WaitRecord:
+    """
+    Aggregated timings for a single named wait step.
+
+    Attributes:
+        count (int): Number of waits performed for the step
+        total (float): Total seconds spent waiting
+        last (float): Duration of the most recent wait in seconds
+        max (float): Longest wait observed in seconds
+        timeouts (int): Number of waits that hit their ceiling
+    """
+
+    __slots__ = ("count", "total", "last", "max", "timeouts")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.last = 0.0
+        self.max = 0.0
+        self.timeouts = 0
+
+    def add(self, elapsed: float, timed_out: bool = False) -> None:
+        """Record one wait of ``elapsed`` seconds."""
+        self.count += 1
+        self.total += elapsed
+        self.last = elapsed
+        self.max = max(self.max, elapsed)
+        if timed_out:
+            self.timeouts += 1
+
+    def as_dict(self) -> Dict[str, float]:
+        """Return the record as a plain dictionary."""
+        return {
+            "count": self.count,
+            "total": round(self.total, 4),
+            "mean": round(self.total / self.count, 4) if self.count else 0.0,
+            "last": round(self.last, 4),
+            "max": round(self.max, 4),
+            "timeouts": self.timeouts,
+        }
+
+
+class Waiter:
+    """
+    Polls readiness conditions with a per-step ceiling and adaptive backoff.
+
+    A condition is any callable that receives the WebDriver and returns a
+    truthy value once the step is ready, which makes Selenium's
+    ``expected_conditions`` usable as-is. Lookup exceptions raised while the
+    DOM is still settling are treated as "not ready yet".
+
+    Attributes:
+        driver: The WebDriver instance passed to every condition
+        initial_interval (float): First polling interval in seconds
+        max_interval (float): Upper bound for the polling interval
+        backoff_factor (float): Multiplier applied after each failed poll
+        records (Dict[str, WaitRecord]): Timings aggregated per step name
+    """
+
+    IGNORED_EXCEPTIONS = (
+        NoSuchElementException,
+        StaleElementReferenceException,
+        ElementNotInteractableException,
+    )
+
+    def __init__(
+        self,
+        driver: Any,
+        initial_interval: float = POLL_INITIAL_INTERVAL,
+        max_interval: float = POLL_MAX_INTERVAL,
+        backoff_factor: float = POLL_BACKOFF_FACTOR
+    ) -> None:
+        """
+        Initialize the waiter.
+
+        Args:
+            driver: The WebDriver instance conditions are evaluated against
+            initial_interval (float): First polling interval in seconds
+            max_interval (float): Upper bound for the polling interval
+            backoff_factor (float): Multiplier applied after each failed poll
+        """
+        self.driver = driver
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.records: Dict[str, WaitRecord] = {}
+
+    def until(
+        self,
+        step: str,
+        condition: Callable[[Any], T],
+        timeout: float = ELEMENT_WAIT_TIMEOUT,
+        message: Optional[str] = None
+    ) -> T:
+        """
+        Wait until ``condition`` returns a truthy value.
+
+        Args:
+            step (str): Name used to aggregate the timing of this wait
+            condition (Callable): Callable receiving the driver
+            timeout (float): Ceiling for this wait in seconds
+            message (Optional[str]): Message for the timeout exception
+
+        Returns:
+            The truthy value returned by the condition
+
+        Raises:
+            TimeoutException: If the condition does not hold within ``timeout``
+        """
+        start = time.monotonic()
+        deadline = start + timeout
+        interval = self.initial_interval
+        last_error: Optional[Exception] = None
+
+        while True:
+            try:
+                value = condition(self.driver)
+                if value:
+                    self._record(step, time.monotonic() - start)
+                    return value
+            except self.IGNORED_EXCEPTIONS as e:
+                last_error = e
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._record(step, time.monotonic() - start, timed_out=True)
+                raise TimeoutException(
+                    message or f"Timed out after {timeout}s waiting for '{step}'"
+                ) from last_error
+
+            time.sleep(min(interval, remaining))
+            interval = min(interval * self.backoff_factor, self.max_interval)
+
+    def until_not(
+        self,
+        step: str,
+        condition: Callable[[Any], Any],
+        timeout: float = ELEMENT_WAIT_TIMEOUT,
+        message: Optional[str] = None
+    ) -> bool:
+        """
+        Wait until ``condition`` returns a falsy value.
+
+        A lookup exception raised by the condition counts as falsy, so waiting
+        for an element to go away works with a plain ``find_element`` call.
+
+        Args:
+            step (str): Name used to aggregate the timing of this wait
+            condition (Callable): Callable receiving the driver
+            timeout (float): Ceiling for this wait in seconds
+            message (Optional[str]): Message for the timeout exception
+
+        Returns:
+            bool: Always True once the condition stopped holding
+        """
+        def negated(driver: Any) -> bool:
+            try:
+                return not condition(driver)
+            except self.IGNORED_EXCEPTIONS:
+                return True
+
+        return self.until(step, negated, timeout, message)
+
+    def _record(self, step: str, elapsed: float, timed_out: bool = False) -> None:
+        """Add a wait duration to the aggregate of its step."""
+        record = self.records.get(step)
+        if record is None:
+            record = self.records[step] = WaitRecord()
+        record.add(elapsed, timed_out)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the aggregated wait timings.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Timings keyed by step name
+        """
+        return {step: record.as_dict() for step, record in self.records.items()}
+
+    def total_wait(self) -> float:
+        """Get the total number of seconds spent waiting across all steps."""
+        return sum(record.total for record in self.records.values())
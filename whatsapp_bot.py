@@ -12,28 +12,50 @@ Repository: https://github.com/DiegoBloise/whatsapp-bot-smgm
 
 import os
 import sys
-from typing import List, Optional
-from time import sleep
+import time
+from typing import Any, Callable, Dict, Iterator, List, NoReturn, Optional, Set, Tuple
 
-import pyautogui
-import pyperclip
 from selenium import webdriver
-from selenium.webdriver.common.by import By
+from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.firefox.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import (
+    NoSuchElementException, StaleElementReferenceException, TimeoutException
+)
 
 from config import (
-    QR_CODE_BOX_XPATH, QR_CODE_XPATH, MESSAGES_XPATH, STATUS_XPATH,
-    GROUP_MEMBERS_XPATH, CONTACT_INFO_XPATH, CONTACT_PHONE_XPATH,
-    BUSINESS_PHONE_XPATHS, SEND_BUTTON_XPATH, INITIAL_STARTUP_ID,
-    PANE_SIDE_ID, QR_CODE_TIMEOUT, ELEMENT_WAIT_TIMEOUT,
-    SHORT_WAIT_TIMEOUT, DEFAULT_SLEEP, DEFAULT_WINDOW_SIZE,
-    QR_CODE_IMAGE_PATH, IS_DEBUG
+    SEARCH_RESULT_TITLE_SELECTOR, GROUP_PARTICIPANTS_SCRIPT, SELF_MEMBER_LABELS,
+    QR_CODE_TIMEOUT, ELEMENT_WAIT_TIMEOUT, SHORT_WAIT_TIMEOUT, DELIVERY_TIMEOUT,
+    HEALTH_CHECK_TIMEOUT,
+    DEFAULT_WINDOW_SIZE, QR_CODE_IMAGE_PATH, DEFAULT_ACCOUNT, WHATSAPP_WEB_URL,
+    THROTTLE_STATE_FILE, ACTIVE_CHAT_SCRIPT, OPEN_CHAT_LINK_SCRIPT, LAST_OUTGOING_STATUS_SCRIPT,
+    IN_APP_NAVIGATION, IN_APP_OPEN_TIMEOUT, IN_APP_MAX_FAILURES,
+    FORWARD_RESULT_SELECTOR, FORWARD_BATCH_SIZE, MEDIA_EXTENSIONS, UPLOAD_TIMEOUT,
+    PARTICIPANT_ROWS_SCRIPT, PARTICIPANT_SCROLL_SCRIPT, PARTICIPANT_PAGE_TIMEOUT,
+    PARTICIPANT_SCROLL_FRACTION, PARTICIPANT_MAX_STALLS,
+    LEAN_BROWSER, LEAN_FIREFOX_PREFS, IS_DEBUG,
+    RECYCLE_ENABLED, MEMORY_SAMPLE_INTERVAL, RECYCLE_RSS_MB, RECYCLE_PAGE_MESSAGES,
+    RECYCLE_BROWSER_MESSAGES, RECYCLE_MAX_UPTIME
 )
+import browser_stats
+from contact_cache import ContactCache
+from journal import SendOutcome
+from locators import LocatorRegistry
 from logger import Logger
+from members import GroupMember
+from phone_index import PhoneIndex, normalize_phone, phone_digits
+from profile_manager import BrowserProfile, ProfileLockError
+from templates import url_encode
+from throttle import RateGovernor
+from waiter import Waiter
+
+
+class InvalidPhoneError(Exception):
+    """Raised when WhatsApp reports that a phone number is not on WhatsApp."""
+
+
+class BotError(Exception):
+    """Raised instead of exiting on a fatal error when exit_on_error is off."""
 
 
 class WhatsAppBot:
@@ -48,61 +70,270 @@ class WhatsAppBot:
     Attributes:
         browser (Optional[webdriver.Firefox]): The Firefox WebDriver instance
         headless (bool): Whether to run in headless mode (except in debug)
+        lean (bool): Whether Firefox runs with LEAN_FIREFOX_PREFS
+        profile (BrowserProfile): Persisted Firefox profile of the account
+        qr_code_image_path (str): Where the account's QR code is saved
+        contact_cache (ContactCache): Persistent contact-name to phone cache
+        base_url (str): Address of WhatsApp Web without trailing slash
+        interactive (bool): Whether errors may prompt on the terminal
+        exit_on_error (bool): Whether fatal errors exit the process, or raise
+            BotError for a supervisor to handle
+        throttle (RateGovernor): Paces the messages sent by the account
+        in_app_navigation (bool): Whether chats are opened inside the loaded
+            app, falling back to a full reload when that fails
+        contact_names (Dict[str, str]): Display name of every extracted phone
+            (E.164) that has one
+        messages (int): Messages sent (or forwarded) since the browser started
+        page_reloads (int): Times WhatsApp Web was reloaded to free memory
+        memory (Optional[browser_stats.MemoryUsage]): Latest memory sample
+        peak_memory (Optional[browser_stats.MemoryUsage]): Largest sample so far
+        waiter (Optional[Waiter]): Wait engine bound to the current browser
+        locators (LocatorRegistry): Fallback chains for every element used
     """
 
-    def __init__(self, headless: bool = False) -> None:
+    # Finds the search result whose title matches arguments[1], either
+    # exactly or as a substring, ignoring case
+    _SEARCH_RESULT_JS = (
+        "var spans = document.querySelectorAll(arguments[0]);"
+        "var name = arguments[1].trim().toLowerCase();"
+        "for (var i = 0; i < spans.length; i++) {"
+        "  var title = (spans[i].getAttribute('title') || '').trim().toLowerCase();"
+        "  if (arguments[2] ? title === name : title.indexOf(name) !== -1) return spans[i];"
+        "}"
+        "return null;"
+    )
+
+    # Finds the unselected row of the forward dialog whose text contains the
+    # digits in arguments[1], ignoring how the number is formatted
+    _FORWARD_RESULT_JS = (
+        "var rows = document.querySelectorAll(arguments[0]);"
+        "for (var i = 0; i < rows.length; i++) {"
+        "  var box = rows[i].querySelector('[role=\"checkbox\"], input[type=\"checkbox\"]');"
+        "  if (box && (box.checked || box.getAttribute('aria-checked') === 'true')) continue;"
+        "  if (rows[i].textContent.replace(/\\D/g, '').indexOf(arguments[1]) !== -1) return rows[i];"
+        "}"
+        "return null;"
+    )
+
+    # Tick statuses of LAST_OUTGOING_STATUS_SCRIPT that settle a send
+    _ACK_STATUSES: Dict[str, SendOutcome] = {
+        "sent": SendOutcome.SENT,
+        "delivered": SendOutcome.DELIVERED,
+        "read": SendOutcome.DELIVERED,
+        "error": SendOutcome.FAILED,
+    }
+
+    def __init__(
+        self,
+        headless: bool = False,
+        account: str = DEFAULT_ACCOUNT,
+        contact_cache: Optional[ContactCache] = None,
+        base_url: str = WHATSAPP_WEB_URL,
+        interactive: bool = True,
+        throttle: Optional[RateGovernor] = None,
+        lean: bool = LEAN_BROWSER,
+        exit_on_error: bool = True
+    ) -> None:
         """
         Initialize the WhatsApp bot with WebDriver configuration.
         
         Args:
             headless (bool): Whether to run in headless mode. Ignored if
                            IS_DEBUG is True to allow visual debugging.
+            account (str): WhatsApp account whose persisted profile is used
+            contact_cache (Optional[ContactCache]): Cache of saved contact
+                           phones. A cache at the default location is opened
+                           if none is given.
+            base_url (str): Address of WhatsApp Web, overridable so the bot
+                           can be driven against a local stand-in
+            interactive (bool): Whether errors may wait for the user to press
+                           Enter. Disabled for unattended runs.
+            throttle (Optional[RateGovernor]): Send pacing of the account. A
+                           governor keeping its state in the profile is
+                           created if none is given.
+            lean (bool): Whether to block images, media and animations and
+                           shrink Firefox's caches and process count
+            exit_on_error (bool): Whether fatal errors close the browser and
+                           exit the process. When off, BotError is raised
+                           and the browser is left to the caller.
         """
         self.browser: Optional[webdriver.Firefox] = None
+        self.waiter: Optional[Waiter] = None
+        self.locators = LocatorRegistry()
         self.headless = headless and not IS_DEBUG
+        self.lean = lean
+        self.profile = BrowserProfile(account)
+        self.qr_code_image_path = os.path.join(self.profile.path, QR_CODE_IMAGE_PATH)
+        self.contact_cache = contact_cache or ContactCache()
+        self.base_url = base_url.rstrip("/")
+        self.interactive = interactive
+        self.exit_on_error = exit_on_error
+        self.throttle = throttle or RateGovernor(
+            state_path=os.path.join(self.profile.path, THROTTLE_STATE_FILE)
+        )
+        self.in_app_navigation = IN_APP_NAVIGATION
+        self._in_app_failures = 0
+        self._main_window: Optional[str] = None
+        # Set once the send being made got as far as its send button
+        self._send_clicked = False
+        self.contact_names: Dict[str, str] = {}
+        self.messages = 0
+        self.page_reloads = 0
+        self.memory: Optional[browser_stats.MemoryUsage] = None
+        self.peak_memory: Optional[browser_stats.MemoryUsage] = None
+        self._messages_since_reload = 0
+        self._sampled_at: Optional[float] = None
+        self._reloaded_over_limit = False
+        self._launched_at = time.monotonic()
         self._setup_driver()
 
     def _setup_driver(self) -> None:
-        """Setup Firefox WebDriver with appropriate options."""
+        """Setup Firefox WebDriver with the account profile and options."""
+        try:
+            self.profile.acquire()
+        except ProfileLockError as e:
+            self._abort(f"Could not start WebDriver: {e}")
+
         try:
             options = Options()
             options.add_argument(f"window-size={DEFAULT_WINDOW_SIZE}")
+            options.add_argument("-profile")
+            options.add_argument(self.profile.path)
             if self.headless:
                 options.add_argument("--headless")
+            if self.lean:
+                for name, value in LEAN_FIREFOX_PREFS.items():
+                    options.set_preference(name, value)
 
             self.browser = webdriver.Firefox(options=options)
+            self.waiter = Waiter(self.browser)
             Logger.success("WebDriver started successfully")
         except Exception as e:
-            Logger.error(f"Could not start WebDriver: {e}")
-            sys.exit(1)
+            self.profile.release()
+            self._abort(f"Could not start WebDriver: {e}")
 
+    def _abort(self, message: str) -> NoReturn:
+        """
+        Give up after a fatal error.
+
+        Standalone bots close the browser and exit the process; supervised
+        bots raise BotError and leave the browser to the supervisor.
+
+        Args:
+            message (str): What went wrong
+        """
+        Logger.error(message)
+        if not self.exit_on_error:
+            raise BotError(message)
+        self.cleanup()
+        sys.exit(1)
+
+    @Logger.timed("start_whatsapp")
     def start_whatsapp(self) -> None:
-        """Start WhatsApp Web and handle QR code authentication."""
+        """
+        Start WhatsApp Web, reusing the persisted session when it is valid.
+
+        The chat list and the QR code are raced against each other: if the
+        profile still holds a valid session the chat list wins and the QR code
+        step is skipped entirely.
+        """
         if not self.browser:
             Logger.error("Browser not initialized")
             return
 
         try:
             Logger.info("Accessing WhatsApp Web...")
-            self.browser.get("https://web.whatsapp.com/")
+            self.browser.get(f"{self.base_url}/")
 
             # Wait for initial startup
-            wait = WebDriverWait(self.browser, QR_CODE_TIMEOUT)
-            wait.until(EC.visibility_of_element_located((By.ID, INITIAL_STARTUP_ID)))
+            self.waiter.until(
+                "startup",
+                self.locators.visible("app"),
+                QR_CODE_TIMEOUT
+            )
 
-            # Handle QR code
-            self._handle_qr_code()
+            # Reuse the persisted session or fall back to QR code login
+            session_state = self.waiter.until(
+                "session_state", self._detect_session_state, QR_CODE_TIMEOUT
+            )
+            if session_state == "authenticated":
+                Logger.success(f"Session restored for account '{self.profile.account}'")
+            else:
+                if self.profile.has_session():
+                    Logger.warn("Saved session expired, a new QR code scan is required")
+                self._handle_qr_code()
 
             # Wait for main interface to load
             Logger.info("Loading main interface...")
-            wait.until(EC.visibility_of_element_located((By.ID, PANE_SIDE_ID)))
+            self.waiter.until(
+                "main_interface",
+                self.locators.visible("pane_side"),
+                QR_CODE_TIMEOUT
+            )
+            self.waiter.until(
+                "navigation_ready",
+                self.locators.clickable("status_button"),
+                ELEMENT_WAIT_TIMEOUT
+            )
+            self._main_window = self.browser.current_window_handle
             Logger.success("WhatsApp Web ready!")
-            sleep(DEFAULT_SLEEP * 2)
+            self._log_browser_stats()
 
         except Exception as e:
-            Logger.error(f"Could not access WhatsApp Web: {e}")
-            self.cleanup()
-            sys.exit(1)
+            self._abort(f"Could not access WhatsApp Web: {e}")
+
+    def check_health(self) -> Optional[str]:
+        """
+        Check that the session can still be driven.
+
+        Cheap enough to run between any two operations: a healthy session
+        answers on the first poll.
+
+        Returns:
+            Optional[str]: None if healthy, otherwise why not: "no_browser",
+            "browser_dead" (Firefox or geckodriver is gone), "logged_out" or
+            "unresponsive" (the chat list did not show up)
+        """
+        if not self.browser:
+            return "no_browser"
+
+        try:
+            # Fails as soon as Firefox or geckodriver has died
+            self.browser.window_handles
+            state = self.waiter.until(
+                "health_check", self._detect_session_state, HEALTH_CHECK_TIMEOUT
+            )
+        except TimeoutException:
+            return "unresponsive"
+        except Exception:
+            # A dead geckodriver surfaces as a connection error, not only
+            # as a WebDriverException
+            return "browser_dead"
+
+        return "logged_out" if state == "qr_code" else None
+
+    def _log_browser_stats(self) -> None:
+        """Log what the browser costs the host once WhatsApp Web is loaded."""
+        stats = self.get_browser_stats()
+        memory = (
+            f"{stats['rss_mb']} MB RSS across {stats['processes']} processes"
+            if stats.get("rss_mb") is not None else "memory unavailable"
+        )
+        load = f", page loaded in {stats['load_s']} s" if stats.get("load_s") is not None else ""
+        Logger.info(f"Browser{' (lean)' if self.lean else ''}: {memory}{load}")
+
+    def _detect_session_state(self, driver: Any) -> Optional[str]:
+        """
+        Tell whether the page settled on the chat list or on the QR code.
+
+        Returns:
+            Optional[str]: "authenticated", "qr_code", or None while loading
+        """
+        if self.locators.visible("pane_side")(driver):
+            return "authenticated"
+        if self.locators.visible("qr_code")(driver):
+            return "qr_code"
+        return None
 
     def _handle_qr_code(self) -> None:
         """Handle QR code scanning process."""
@@ -111,47 +342,51 @@ class WhatsAppBot:
 
         try:
             Logger.info("Loading QR Code...")
-            wait = WebDriverWait(self.browser, ELEMENT_WAIT_TIMEOUT)
-            wait.until(EC.visibility_of_element_located((By.XPATH, QR_CODE_XPATH)))
+            self.waiter.until(
+                "qr_code",
+                self.locators.visible("qr_code"),
+                ELEMENT_WAIT_TIMEOUT
+            )
 
             # Save and display QR code
-            qr_element = self.browser.find_element(By.XPATH, QR_CODE_BOX_XPATH)
-            qr_element.screenshot(QR_CODE_IMAGE_PATH)
+            qr_element = self.locators.find(self.browser, "qr_code_box")
+            qr_element.screenshot(self.qr_code_image_path)
 
             Logger.success("Scan the QR code to continue...")
             self._open_qr_code_image()
 
             # Wait for QR code to disappear (login successful)
-            wait.until(EC.invisibility_of_element_located((By.XPATH, QR_CODE_BOX_XPATH)))
+            self.waiter.until_not(
+                "qr_code_scanned",
+                self.locators.visible("qr_code_box"),
+                ELEMENT_WAIT_TIMEOUT
+            )
             self._cleanup_qr_code()
 
         except TimeoutException:
-            Logger.error("QR code loading timeout")
-            self.cleanup()
-            sys.exit(1)
+            self._abort("QR code loading timeout")
         except Exception as e:
-            Logger.error(f"QR code handling failed: {e}")
-            self.cleanup()
-            sys.exit(1)
+            self._abort(f"QR code handling failed: {e}")
 
     def _open_qr_code_image(self) -> None:
         """Open QR code image for scanning."""
         try:
             if os.name == 'nt':  # Windows
-                os.startfile(QR_CODE_IMAGE_PATH)
+                os.startfile(self.qr_code_image_path)
             elif os.name == 'posix':  # macOS and Linux
-                os.system(f'open "{QR_CODE_IMAGE_PATH}"' if sys.platform == 'darwin' else f'xdg-open "{QR_CODE_IMAGE_PATH}"')
+                os.system(f'open "{self.qr_code_image_path}"' if sys.platform == 'darwin' else f'xdg-open "{self.qr_code_image_path}"')
         except Exception as e:
             Logger.warn(f"Could not open QR code image: {e}")
 
     def _cleanup_qr_code(self) -> None:
         """Clean up QR code image file."""
         try:
-            if os.path.exists(QR_CODE_IMAGE_PATH):
-                os.remove(QR_CODE_IMAGE_PATH)
+            if os.path.exists(self.qr_code_image_path):
+                os.remove(self.qr_code_image_path)
         except Exception as e:
             Logger.warn(f"Could not remove QR code image: {e}")
 
+    @Logger.timed("find_group")
     def find_group(self, group_name: str) -> None:
         """Find and navigate to a specific WhatsApp group."""
         if not self.browser:
@@ -160,78 +395,411 @@ class WhatsAppBot:
         try:
             Logger.info("Searching for group...")
 
-            # Navigate to messages
-            self.browser.find_element(By.XPATH, STATUS_XPATH).click()
-            sleep(DEFAULT_SLEEP * 2)
-            self.browser.find_element(By.XPATH, MESSAGES_XPATH).click()
-            sleep(DEFAULT_SLEEP)
-            self.browser.find_element(By.XPATH, MESSAGES_XPATH).click()
-            sleep(DEFAULT_SLEEP)
-            self.browser.find_element(By.XPATH, MESSAGES_XPATH).click()
+            # Make sure the side panel shows the chat list and its search box
+            if not self.locators.visible("search_box")(self.browser):
+                self.locators.find(self.browser, "status_button").click()
+                self.waiter.until(
+                    "messages_button",
+                    self.locators.clickable("messages_button"),
+                    SHORT_WAIT_TIMEOUT
+                ).click()
 
-            sleep(DEFAULT_SLEEP * 2)
+            search_box = self.waiter.until(
+                "search_box",
+                self.locators.clickable("search_box"),
+                SHORT_WAIT_TIMEOUT
+            )
 
             # Search for group
-            pyautogui.press('tab', presses=4)
-            sleep(DEFAULT_SLEEP)
+            search_box.click()
+            search_box.send_keys(Keys.CONTROL + "a", Keys.BACKSPACE)
+            search_box.send_keys(group_name)
 
-            pyautogui.hotkey('ctrl', 'a')
-            pyautogui.hotkey('delete')
-            sleep(DEFAULT_SLEEP * 4)
+            self._find_search_result(group_name).click()
+            self.waiter.until(
+                "conversation_open",
+                lambda d: group_name.lower() in self.locators.find(
+                    d, "conversation_header"
+                ).text.lower(),
+                ELEMENT_WAIT_TIMEOUT
+            )
 
-            pyperclip.copy(group_name)
-            sleep(DEFAULT_SLEEP / 2)
+            Logger.success(f"Group '{group_name}' found")
 
-            pyautogui.hotkey('ctrl', 'v')
-            sleep(DEFAULT_SLEEP)
+        except (NoSuchElementException, TimeoutException) as e:
+            if self.interactive and self.exit_on_error:
+                Logger.error(f"Group not found: {e}")
+                input("Press Enter to exit...")
+                self.cleanup()
+                sys.exit(1)
+            self._abort(f"Group not found: {e}")
 
-            sleep(DEFAULT_SLEEP)
-            pyautogui.press('down')
-            sleep(DEFAULT_SLEEP / 5)
-            pyautogui.press('space')
-            sleep(DEFAULT_SLEEP)
+    def _find_search_result(self, name: str) -> Any:
+        """
+        Wait for the search result matching a chat name.
 
-            Logger.success(f"Group '{group_name}' found")
+        An exact (case-insensitive) title match is preferred so that a group
+        is never confused with another one containing its name. A partial
+        match is accepted only when no exact one shows up.
 
-        except NoSuchElementException as e:
-            Logger.error(f"Group not found: {e}")
-            input("Press Enter to exit...")
-            self.cleanup()
-            sys.exit(1)
+        Args:
+            name (str): Chat name typed in the search box
+
+        Returns:
+            WebElement: The title element of the matching result
+
+        Raises:
+            TimeoutException: If no result matches the name
+        """
+        try:
+            return self.waiter.until(
+                "search_result",
+                lambda d: d.execute_script(
+                    self._SEARCH_RESULT_JS, SEARCH_RESULT_TITLE_SELECTOR, name, True
+                ),
+                SHORT_WAIT_TIMEOUT
+            )
+        except TimeoutException:
+            return self.waiter.until(
+                "search_result_partial",
+                lambda d: d.execute_script(
+                    self._SEARCH_RESULT_JS, SEARCH_RESULT_TITLE_SELECTOR, name, False
+                ),
+                ELEMENT_WAIT_TIMEOUT,
+                f"No chat matching '{name}'"
+            )
 
     def get_group_phones(self) -> List[str]:
-        """Extract phone numbers from group members."""
+        """
+        Extract phone numbers from group members.
+
+        The in-page bulk backend is tried first; the group header is read and
+        each saved contact resolved through the interface only when the bulk
+        backend is unavailable.
+        """
+        return list(self.iter_group_phones())
+
+    def iter_group_phones(self) -> Iterator[str]:
+        """
+        Yield the phone numbers of group members as soon as each is known.
+
+        Members come from WhatsApp's in-page collections when available, or
+        else from walking the participant list of the group info panel; the
+        group header, which WhatsApp truncates for large groups, is the last
+        resort. Numbers that are readable straight away are yielded first; saved
+        contacts that need the slow contact-drawer lookup come last, so a
+        consumer can start working on the first numbers right away. Numbers
+        are normalized to E.164 and each one is yielded only once; the names
+        seen along the way are kept in contact_names.
+
+        Yields:
+            str: Phone number of a group member
+        """
         if not self.browser:
-            return []
+            return
 
-        try:
+        # Timed here rather than in get_group_phones, so streamed extractions count too
+        with Logger.span("get_group_phones"):
             Logger.info("Extracting phone numbers from group members...")
 
-            wait = WebDriverWait(self.browser, SHORT_WAIT_TIMEOUT)
-            wait.until(EC.text_to_be_present_in_element((By.XPATH, GROUP_MEMBERS_XPATH), ", "))
+            members = self.get_group_members()
+            if members is not None:
+                phones = self._phones_from_members(members)
+            else:
+                Logger.warn("Bulk extraction unavailable, walking the participant list instead")
+                phones = self._phones_from_participant_list()
 
-            members = self.browser.find_element(By.XPATH, GROUP_MEMBERS_XPATH).text.split(", ")
-            phones = []
+            index = PhoneIndex()
+            for phone, name in phones:
+                normalized = index.add(phone)
+                if normalized:
+                    if name:
+                        self.contact_names[normalized] = name
+                    yield normalized
+                elif phone not in index:
+                    Logger.warn(f"Skipping unreadable phone number: {phone}")
 
-            for index, member in enumerate(members):
-                if member.replace("+", "").replace(" ", "").replace("-", "").isnumeric():
-                    phones.append(member)
-                else:
-                    Logger.info(f"Saved contact found: {member}")
-                    phone = self._extract_phone_from_contact(member)
-                    if phone:
-                        Logger.success(f"Phone extracted: {phone}")
-                        phones.append(phone)
-                    else:
-                        Logger.warn(f"Could not extract phone for: {member}")
+            cache_stats = self.contact_cache.stats()
+            Logger.info(
+                f"Contact cache: {cache_stats['hits']} hits, "
+                f"{cache_stats['misses']} misses, {cache_stats['size']} entries"
+            )
+
+    def get_group_members(self) -> Optional[List[GroupMember]]:
+        """
+        Collect every participant of the open group in a single script call.
+
+        Returns:
+            Optional[List[GroupMember]]: The participants, or None if the page
+            does not expose WhatsApp's collections or no group is open
+        """
+        if not self.browser:
+            return None
+
+        try:
+            data = self.browser.execute_script(GROUP_PARTICIPANTS_SCRIPT)
+        except Exception as e:
+            Logger.warn(f"Bulk member extraction failed: {e}")
+            return None
+
+        if data is None:
+            return None
+
+        members = [GroupMember.from_script(item) for item in data]
+        Logger.success(f"Bulk extraction returned {len(members)} participants")
+        return members
+
+    def _phones_from_members(self, members: List[GroupMember]) -> Iterator[Tuple[str, str]]:
+        """
+        Turn bulk extraction results into phones and names, caching saved contacts.
+
+        Only names saved by the account are cached: profile names are not
+        unique and cannot be searched for in the contact drawer.
+        """
+        account = self.profile.account
+        hidden_contacts = []
+
+        for member in members:
+            if member.is_me:
+                continue
 
-            return phones
+            if member.phone:
+                yield member.formatted_phone, member.name
+                if member.is_saved:
+                    self.contact_cache.put(account, member.name, member.formatted_phone)
+            elif member.name:
+                hidden_contacts.append(member.name)
+            else:
+                Logger.warn(f"Skipping participant with hidden number: {member.id}")
 
+        # WhatsApp hides the number of some participants; fall back to the
+        # contact drawer for those we know by name
+        for name in hidden_contacts:
+            Logger.info(f"Hidden number for saved contact: {name}")
+            phone = self._resolve_contact_phone(name)
+            if phone:
+                yield phone, name
+            else:
+                Logger.warn(f"Could not extract phone for: {name}")
+
+    def _phones_from_participant_list(self) -> Iterator[Tuple[str, str]]:
+        """
+        Extract phones and names by scrolling the group's participant list.
+
+        WhatsApp only renders the rows near the visible part of the list, so
+        it is read a page at a time. Pages overlap, and rows already read on
+        the previous two pages are skipped, so deduplicating the rows only
+        keeps two pages in memory. Saved contacts, whose phones are resolved
+        once the walk ends, are still collected for the whole group.
+
+        A walk cut short by the page going stale or not loading keeps what
+        was read; any other error ends the extraction.
+        """
+        participant_list = self._open_participant_list()
+        if participant_list is None:
+            Logger.warn("Participant list unavailable, reading group header instead")
+            yield from self._get_group_phones_from_header()
+            return
+
+        total = self._participant_total()
+        saved_contacts: List[str] = []
+        recent: List[Set[str]] = [set(), set()]
+        read = 0
+        stalls = 0
+
+        try:
+            rows = self._participant_rows(participant_list)
+            while True:
+                page = set()
+                for row in rows:
+                    key = row["text"] or row["title"]
+                    page.add(key)
+                    if key in recent[0] or key in recent[1]:
+                        continue
+                    read += 1
+
+                    title = row["title"].strip()
+                    if title in SELF_MEMBER_LABELS:
+                        continue
+                    if self._is_phone_text(title):
+                        yield title, self._push_name(row["text"])
+                    elif title:
+                        saved_contacts.append(title)
+                recent = [recent[1], page]
+
+                Logger.info(
+                    f"Participants read: {read}/{total}" if total else f"Participants read: {read}"
+                )
+                if not self.browser.execute_script(
+                    PARTICIPANT_SCROLL_SCRIPT, participant_list, PARTICIPANT_SCROLL_FRACTION
+                ):
+                    break
+
+                try:
+                    rows = self.waiter.until(
+                        "participant_page",
+                        lambda driver, shown=rows: self._next_participant_page(participant_list, shown),
+                        PARTICIPANT_PAGE_TIMEOUT
+                    )
+                    stalls = 0
+                except TimeoutException:
+                    stalls += 1
+                    if stalls >= PARTICIPANT_MAX_STALLS:
+                        Logger.warn("Participant list stopped loading, ending the walk early")
+                        break
+                    rows = self._participant_rows(participant_list)
+        except (TimeoutException, StaleElementReferenceException) as e:
+            Logger.warn(f"Participant list walk interrupted after {read} rows: {e}")
+        finally:
+            self._close_participant_dialog()
+
+        if total and read < total:
+            Logger.warn(f"Read {read} of {total} participants")
+
+        for name in dict.fromkeys(saved_contacts):
+            Logger.info(f"Saved contact found: {name}")
+            phone = self._resolve_contact_phone(name)
+            if phone:
+                yield phone, name
+            else:
+                Logger.warn(f"Could not extract phone for: {name}")
+
+    def _open_participant_list(self) -> Optional[Any]:
+        """
+        Open the group info panel and its full participant list.
+
+        Returns:
+            Optional[Any]: The participant list element, or None if it could
+            not be opened
+        """
+        try:
+            self.waiter.until(
+                "contact_info_button",
+                self.locators.clickable("contact_info_button"),
+                SHORT_WAIT_TIMEOUT
+            ).click()
+            self.waiter.until(
+                "participant_list",
+                self.locators.present("participant_list"),
+                SHORT_WAIT_TIMEOUT
+            )
+        except Exception as e:
+            Logger.warn(f"Could not open group info: {e}")
+            return None
+
+        # Large groups only list a few participants until "View all" is clicked
+        view_all = self.locators.find_optional(self.browser, "participants_view_all")
+        if view_all is not None:
+            try:
+                view_all.click()
+                self.waiter.until(
+                    "participant_dialog",
+                    self.locators.visible("participant_dialog"),
+                    SHORT_WAIT_TIMEOUT
+                )
+            except Exception as e:
+                Logger.warn(f"Could not expand the participant list: {e}")
+
+        return self.locators.find_optional(self.browser, "participant_list")
+
+    def _close_participant_dialog(self) -> None:
+        """Close the "View all" participant dialog, if it is open."""
+        try:
+            if self.locators.find_optional(self.browser, "participant_dialog") is not None:
+                ActionChains(self.browser).send_keys(Keys.ESCAPE).perform()
+        except Exception:
+            pass
+
+    def _participant_total(self) -> Optional[int]:
+        """Get the participant count shown in group info, if any."""
+        count = self.locators.find_optional(self.browser, "participant_count")
+        digits = phone_digits(count.text) if count is not None else ""
+        return int(digits) if digits else None
+
+    def _participant_rows(self, participant_list: Any) -> List[Dict[str, str]]:
+        """Read the participant rows currently rendered."""
+        return self.browser.execute_script(PARTICIPANT_ROWS_SCRIPT, participant_list) or []
+
+    def _next_participant_page(
+        self,
+        participant_list: Any,
+        shown: List[Dict[str, str]]
+    ) -> Optional[List[Dict[str, str]]]:
+        """Get the rendered rows once they differ from the ones already shown."""
+        rows = self._participant_rows(participant_list)
+        return rows if rows != shown else None
+
+    @staticmethod
+    def _is_phone_text(text: str) -> bool:
+        """Check whether a displayed label is a phone number rather than a name."""
+        # Names may contain digits too; a phone label has no letters at all
+        return not any(c.isalpha() for c in text) and normalize_phone(text) is not None
+
+    @staticmethod
+    def _push_name(text: str) -> str:
+        """Get the "~ name" an unsaved member chose for themselves from a row's text."""
+        for line in text.splitlines():
+            line = line.strip()
+            if line.startswith("~"):
+                return line.lstrip("~ ").strip()
+        return ""
+
+    def _get_group_phones_from_header(self) -> Iterator[Tuple[str, str]]:
+        """Extract phones and names from the group header, resolving saved contacts."""
+        try:
+            self.waiter.until(
+                "group_members",
+                self.locators.text_contains("group_members", ", "),
+                SHORT_WAIT_TIMEOUT
+            )
+
+            members = self.locators.find(self.browser, "group_members").text.split(", ")
         except NoSuchElementException as e:
-            Logger.error(f"Could not access group members: {e}")
-            self.cleanup()
-            sys.exit(1)
+            self._abort(f"Could not access group members: {e}")
+
+        if any(label in members[-1] for label in ("…", "...", " others", " more")):
+            Logger.warn("The group header is truncated, members not listed in it are skipped")
+
+        saved_contacts = []
+        for member in members:
+            if member in SELF_MEMBER_LABELS:
+                continue
+            if self._is_phone_text(member):
+                yield member, ""
+            else:
+                saved_contacts.append(member)
+
+        for member in saved_contacts:
+            Logger.info(f"Saved contact found: {member}")
+            phone = self._resolve_contact_phone(member)
+            if phone:
+                yield phone, member
+            else:
+                Logger.warn(f"Could not extract phone for: {member}")
+
+    def _resolve_contact_phone(self, contact_name: str) -> Optional[str]:
+        """
+        Get the phone of a saved contact, from the cache when possible.
+
+        Args:
+            contact_name (str): Contact display name
+
+        Returns:
+            Optional[str]: The phone number, or None if it could not be found
+        """
+        account = self.profile.account
+        phone = self.contact_cache.get(account, contact_name)
+        if phone:
+            Logger.success(f"Phone found in cache: {phone}")
+            return phone
+
+        phone = self._extract_phone_from_contact(contact_name)
+        if phone:
+            Logger.success(f"Phone extracted: {phone}")
+            self.contact_cache.put(account, contact_name, phone)
+        return phone
 
+    @Logger.timed("extract_phone_from_contact", falsy_is_error=True)
     def _extract_phone_from_contact(self, contact_name: str) -> Optional[str]:
         """Extract phone number from a saved contact."""
         if not self.browser:
@@ -240,61 +808,722 @@ class WhatsAppBot:
         try:
             # Navigate to contact info
             self.find_group(contact_name)
-            sleep(DEFAULT_SLEEP * 2)
 
-            self.browser.find_element(By.XPATH, CONTACT_INFO_XPATH).click()
-            sleep(DEFAULT_SLEEP * 2)
+            self.waiter.until(
+                "contact_info_button",
+                self.locators.clickable("contact_info_button"),
+                SHORT_WAIT_TIMEOUT
+            ).click()
 
-            # Try to get phone number
+            # Regular and business layouts are both candidates of the same locator
             try:
-                phone = self.browser.find_element(By.XPATH, CONTACT_PHONE_XPATH).text
-                return phone
-            except NoSuchElementException:
-                Logger.info("Business account detected, trying alternative XPaths...")
-
-                for xpath in BUSINESS_PHONE_XPATHS:
-                    try:
-                        phone = self.browser.find_element(By.XPATH, xpath).text
-                        return phone
-                    except NoSuchElementException:
-                        continue
-
-                Logger.error("Phone number not found for business account")
+                return self.waiter.until(
+                    "contact_drawer",
+                    self.locators.present("contact_phone"),
+                    SHORT_WAIT_TIMEOUT
+                ).text
+            except TimeoutException:
+                Logger.error("Phone number not found in contact info")
                 return None
 
         except Exception as e:
             Logger.error(f"Error extracting phone from contact: {e}")
             return None
 
-    def send_message(self, phone: str, message: str) -> bool:
-        """Send a message to a specific phone number."""
+    @Logger.timed("send_message", falsy_is_error=True)
+    def send_message(self, phone: str, message: str) -> SendOutcome:
+        """
+        Send a message to a specific phone number.
+
+        The chat is opened inside the already loaded app and the message typed
+        in its compose box. When that fails, the chat is opened by reloading
+        WhatsApp Web on its send?phone= address instead; after
+        IN_APP_MAX_FAILURES failures in a row the session only uses reloads.
+
+        Phones WhatsApp reports as not on WhatsApp are remembered in the
+        contact cache and skipped without touching the browser until the mark
+        expires.
+
+        Returns:
+            SendOutcome: SENT or DELIVERED once the message shows a tick,
+            UNCONFIRMED if it shows no known tick after DELIVERY_TIMEOUT or the
+            browser failed after the send button was clicked, INVALID for
+            phones not on WhatsApp, FAILED otherwise. Only SENT and DELIVERED
+            are truthy.
+        """
+        if self._known_invalid(phone):
+            return SendOutcome.INVALID
+
         if not self.browser:
-            return False
+            return SendOutcome.FAILED
 
-        try:
-            # Format message for URL
-            formatted_message = message.replace("\\n", "%0A")
-            url = f"https://web.whatsapp.com/send?phone={phone}&text={formatted_message}"
+        if not self._acquire_send_slot():
+            return SendOutcome.FAILED
 
-            self.browser.get(url)
+        self._send_clicked = False
+        try:
             Logger.info(f"Preparing message for {phone}...")
+            self._open_chat(phone, message)
 
-            # Wait for send button to be available
-            wait = WebDriverWait(self.browser, ELEMENT_WAIT_TIMEOUT)
-            wait.until(EC.visibility_of_element_located((By.TAG_NAME, "footer")))
-
-            send_button = self.browser.find_element(By.XPATH, SEND_BUTTON_XPATH)
-            sleep(DEFAULT_SLEEP * 6)
+            send_button = self.waiter.until(
+                "send_button",
+                self.locators.clickable("send_button"),
+                ELEMENT_WAIT_TIMEOUT
+            )
 
+            before = self._last_outgoing()
+            self._send_clicked = True
             send_button.click()
-            Logger.success(f"Message sent to {phone}")
-            sleep(DEFAULT_SLEEP * 2)
+            outcome = self._confirm_delivery(before)
+
+        except InvalidPhoneError as e:
+            return self._reject_invalid(phone, e)
+        except Exception as e:
+            outcome = self._send_error(phone, "message", e)
+        else:
+            if outcome == SendOutcome.UNCONFIRMED:
+                Logger.warn(f"Message to {phone} not acknowledged yet", phone=phone)
+            elif outcome:
+                Logger.success(f"Message sent to {phone}", phone=phone)
+            else:
+                Logger.error(f"WhatsApp rejected the message to {phone}", phone=phone)
+
+        self.throttle.record(bool(outcome))
+        return outcome
+
+    def _last_outgoing(self) -> Dict[str, Any]:
+        """Read the count, ID and tick status of the last message sent in the open chat."""
+        return self.browser.execute_script(LAST_OUTGOING_STATUS_SCRIPT) or {}
+
+    def _confirm_delivery(self, before: Dict[str, Any]) -> SendOutcome:
+        """
+        Wait for the message just sent to leave the outbox.
+
+        Returns as soon as a new outgoing message shows a tick, instead of
+        sleeping for a fixed time, so navigating to the next chat cannot
+        drop a message that is still pending. Only a recognized tick counts:
+        a message whose icon is missing or unknown is waited for like a
+        pending one, so a renamed icon cannot pass for a confirmation.
+
+        Args:
+            before (Dict[str, Any]): _last_outgoing() from before the send
+
+        Returns:
+            SendOutcome: Status of the new message, UNCONFIRMED if it showed
+            no tick after DELIVERY_TIMEOUT
+        """
+        def acknowledged(driver: Any) -> Optional[Dict[str, Any]]:
+            last = self._last_outgoing()
+            is_new = (last.get("id"), last.get("count")) != (before.get("id"), before.get("count"))
+            return last if is_new and last.get("status") in self._ACK_STATUSES else None
+
+        try:
+            last = self.waiter.until("delivery_ack", acknowledged, DELIVERY_TIMEOUT)
+        except TimeoutException:
+            return SendOutcome.UNCONFIRMED
+
+        return self._ACK_STATUSES[last["status"]]
+
+    @Logger.timed("send_attachment", falsy_is_error=True)
+    def send_attachment(
+        self,
+        phone: str,
+        path: str,
+        caption: str = "",
+        slot_acquired: bool = False
+    ) -> SendOutcome:
+        """
+        Upload a file to the chat with a phone number.
+
+        Args:
+            phone (str): Recipient phone number
+            path (str): File to send. Extensions in MEDIA_EXTENSIONS are sent
+                as photo/video, anything else as a document.
+            caption (str): Text sent along with the file, "\\n" breaking lines
+            slot_acquired (bool): Whether the throttle already let this send
+                through, so it does not count against the caps twice
+
+        Returns:
+            SendOutcome: SENT once the upload has completed, UNCONFIRMED if
+            the browser failed after the send button was clicked, INVALID for
+            phones not on WhatsApp, FAILED otherwise
+        """
+        if self._known_invalid(phone):
+            return SendOutcome.INVALID
+
+        if not self.browser:
+            return SendOutcome.FAILED
 
+        if not slot_acquired and not self._acquire_send_slot():
+            return SendOutcome.FAILED
+
+        self._send_clicked = False
+        try:
+            Logger.info(f"Uploading {os.path.basename(path)} to {phone}...")
+            self._open_chat(phone)
+            self._upload_attachment(path, caption)
+            Logger.success(f"Attachment sent to {phone}", phone=phone)
+            self.throttle.record(True)
+
+            return SendOutcome.SENT
+
+        except InvalidPhoneError as e:
+            return self._reject_invalid(phone, e)
+        except Exception as e:
+            self.throttle.record(False)
+            return self._send_error(phone, "attachment", e)
+
+    def _send_error(self, phone: str, what: str, error: Exception) -> SendOutcome:
+        """
+        Report a send that raised.
+
+        Once the send button was clicked the message may have gone out, so
+        the send is UNCONFIRMED rather than FAILED: a failed send is retried,
+        which could deliver it twice.
+        """
+        if self._send_clicked:
+            Logger.warn(f"Could not confirm the {what} to {phone}: {error}", phone=phone)
+            return SendOutcome.UNCONFIRMED
+        Logger.error(f"Could not send {what} to {phone}: {error}", phone=phone)
+        return SendOutcome.FAILED
+
+    def send_attachment_to_many(
+        self,
+        phones: List[str],
+        path: str,
+        caption: str = ""
+    ) -> Iterator[Tuple[str, SendOutcome]]:
+        """
+        Send a file to many phones, uploading it only once.
+
+        The file is uploaded to the first phone that accepts it, and the
+        resulting message is then forwarded to the other phones,
+        FORWARD_BATCH_SIZE chats at a time. Phones the forward dialog cannot
+        find (it only lists existing chats and contacts) get their own upload
+        once every batch has been forwarded. A forward whose dialog did not
+        close is reported UNCONFIRMED rather than uploaded again, and once the
+        send cap is reached the phones left are reported FAILED.
+
+        Args:
+            phones (List[str]): Recipient phone numbers
+            path (str): File to send
+            caption (str): Text sent along with the file
+
+        Yields:
+            Tuple[str, SendOutcome]: Each phone with the outcome of its send,
+            batch by batch. Stop iterating to stop sending.
+        """
+        pending = list(phones)
+        source = None
+        while pending and source is None:
+            phone = pending.pop(0)
+            sent = self.send_attachment(phone, path, caption)
+            yield phone, sent
+            if sent:
+                source = phone
+
+        # Phones that hold a throttle slot but still need their own upload
+        unreached: List[str] = []
+        forwarding = True
+        capped = False
+        while pending and forwarding and not capped:
+            batch: List[str] = []
+            while pending and len(batch) < FORWARD_BATCH_SIZE:
+                if not self._acquire_send_slot():
+                    capped = True
+                    break
+                batch.append(pending.pop(0))
+            if not batch:
+                break
+
+            try:
+                forwarded, confirmed = self._forward_batch(batch)
+            except Exception as e:
+                Logger.warn(f"Forwarding failed, uploading to each recipient instead: {e}")
+                self.throttle.record(False)
+                forwarded, confirmed = [], True
+                forwarding = False
+
+            if not confirmed:
+                # The send button was clicked, uploading again could send twice
+                forwarding = False
+            for phone in batch:
+                if phone not in forwarded:
+                    unreached.append(phone)
+                elif confirmed:
+                    self.throttle.record(True)
+                    yield phone, SendOutcome.SENT
+                else:
+                    yield phone, SendOutcome.UNCONFIRMED
+
+        for phone in unreached:
+            yield phone, self.send_attachment(phone, path, caption, slot_acquired=True)
+        for phone in pending:
+            if capped:
+                yield phone, SendOutcome.FAILED
+            else:
+                yield phone, self.send_attachment(phone, path, caption)
+
+    def _upload_attachment(self, path: str, caption: str) -> None:
+        """
+        Attach a file in the open chat and wait until it has been uploaded.
+
+        Args:
+            path (str): File to send
+            caption (str): Text sent along with the file
+        """
+        is_media = os.path.splitext(path)[1].lower() in MEDIA_EXTENSIONS
+        file_input = "attach_media_input" if is_media else "attach_document_input"
+
+        self.waiter.until(
+            "attach_button",
+            self.locators.clickable("attach_button"),
+            ELEMENT_WAIT_TIMEOUT
+        ).click()
+        # The hidden file input takes the path directly, no file picker opens
+        self.waiter.until(
+            file_input,
+            self.locators.present(file_input),
+            SHORT_WAIT_TIMEOUT
+        ).send_keys(os.path.abspath(path))
+
+        if caption:
+            caption_box = self.waiter.until(
+                "media_caption",
+                self.locators.clickable("media_caption"),
+                ELEMENT_WAIT_TIMEOUT
+            )
+            caption_box.click()
+            self._type_lines(caption_box, caption)
+
+        send_button = self.waiter.until(
+            "media_send_button",
+            self.locators.clickable("media_send_button"),
+            ELEMENT_WAIT_TIMEOUT
+        )
+        self._send_clicked = True
+        send_button.click()
+
+        # The preview closes right away, but the message keeps its clock
+        # icon until the file has reached WhatsApp's servers
+        self.waiter.until_not(
+            "media_preview_closed",
+            self.locators.visible("media_send_button"),
+            ELEMENT_WAIT_TIMEOUT
+        )
+        self.waiter.until_not(
+            "attachment_upload",
+            self.locators.present("message_pending"),
+            UPLOAD_TIMEOUT
+        )
+
+    @Logger.timed("forward_attachment")
+    def _forward_batch(self, phones: List[str]) -> Tuple[List[str], bool]:
+        """
+        Forward the last message of the open chat to several phones at once.
+
+        Args:
+            phones (List[str]): Recipients, at most FORWARD_BATCH_SIZE
+
+        Returns:
+            Tuple[List[str], bool]: The phones the message was forwarded to
+            (the others were not found in the forward dialog), and whether
+            the dialog closed after sending, confirming the forward
+        """
+        messages = self.locators.find_all(self.browser, "outgoing_message")
+        if not messages:
+            raise NoSuchElementException("No sent message to forward")
+        message = messages[-1]
+
+        # The message menu only shows while the pointer is over the message
+        ActionChains(self.browser).move_to_element(message).perform()
+        self.waiter.until(
+            "message_menu",
+            lambda driver: self.locators.find_optional(message, "message_menu"),
+            SHORT_WAIT_TIMEOUT
+        ).click()
+        self.waiter.until(
+            "forward_option",
+            self.locators.clickable("forward_option"),
+            SHORT_WAIT_TIMEOUT
+        ).click()
+        self.waiter.until(
+            "forward_dialog",
+            self.locators.visible("forward_dialog"),
+            ELEMENT_WAIT_TIMEOUT
+        )
+
+        selected = []
+        for phone in phones:
+            digits = phone_digits(phone)
+            search = self.waiter.until(
+                "forward_search",
+                self.locators.clickable("forward_search"),
+                SHORT_WAIT_TIMEOUT
+            )
+            search.click()
+            search.send_keys(Keys.CONTROL + "a", Keys.BACKSPACE)
+            search.send_keys(digits)
+
+            try:
+                row = self.waiter.until(
+                    "forward_result",
+                    lambda driver: driver.execute_script(
+                        self._FORWARD_RESULT_JS, FORWARD_RESULT_SELECTOR, digits
+                    ),
+                    SHORT_WAIT_TIMEOUT
+                )
+            except TimeoutException:
+                Logger.warn(f"{phone} is not in the forward list, it will get its own upload")
+                continue
+            row.click()
+            selected.append(phone)
+
+        if not selected:
+            ActionChains(self.browser).send_keys(Keys.ESCAPE).perform()
+            return [], True
+
+        self.waiter.until(
+            "forward_send_button",
+            self.locators.clickable("forward_send_button"),
+            SHORT_WAIT_TIMEOUT
+        ).click()
+        try:
+            self.waiter.until_not(
+                "forward_dispatched",
+                self.locators.visible("forward_dialog"),
+                ELEMENT_WAIT_TIMEOUT
+            )
+        except Exception as e:
+            Logger.warn(f"Could not confirm the forward to {', '.join(selected)}: {e}")
+            return selected, False
+        Logger.success(f"Attachment forwarded to {', '.join(selected)}")
+        return selected, True
+
+    def _known_invalid(self, phone: str) -> bool:
+        """Check the contact cache for a phone recently found not to be on WhatsApp."""
+        if not self.contact_cache.is_invalid(phone):
+            return False
+        Logger.warn(f"Skipping {phone}, it is not on WhatsApp", phone=phone)
+        return True
+
+    def _reject_invalid(self, phone: str, error: InvalidPhoneError) -> SendOutcome:
+        """Remember a phone WhatsApp rejected, so later campaigns skip it."""
+        Logger.warn(str(error), phone=phone)
+        self.contact_cache.mark_invalid(phone)
+        return SendOutcome.INVALID
+
+    def _acquire_send_slot(self) -> bool:
+        """
+        Wait for the throttle to allow one more message.
+
+        Returns:
+            bool: False if the account's send cap is reached
+        """
+        if self.throttle.acquire():
+            self.messages += 1
+            self._messages_since_reload += 1
             return True
+        Logger.warn(
+            f"Send cap reached for account '{self.profile.account}', "
+            f"next message allowed in {self.throttle.cap_wait() / 60:.0f} min"
+        )
+        return False
+
+    def _open_chat(self, phone: str, message: str = "") -> None:
+        """
+        Open the chat with a phone, in-app when possible, with a draft typed.
+
+        After IN_APP_MAX_FAILURES in-app failures in a row the session only
+        opens chats by reloading WhatsApp Web.
+
+        Args:
+            phone (str): Recipient phone number
+            message (str): Draft left in the compose box, if any
+        """
+        if self.in_app_navigation and self._open_chat_in_app(phone):
+            self._in_app_failures = 0
+            if message:
+                self._type_message(message)
+            return
+
+        if self.in_app_navigation:
+            self._in_app_failures += 1
+            if self._in_app_failures >= IN_APP_MAX_FAILURES:
+                Logger.warn("In-app navigation keeps failing, reloading for every chat")
+                self.in_app_navigation = False
+        self._open_chat_by_url(phone, message)
+
+    @Logger.timed("open_chat_in_app", falsy_is_error=True)
+    def _open_chat_in_app(self, phone: str) -> bool:
+        """
+        Open the chat with a phone through an in-app deep link.
 
+        The chat is confirmed through the active chat in WhatsApp's
+        collections when they are available, or else by the conversation
+        header changing and a compose box showing up.
+
+        Args:
+            phone (str): Recipient phone number
+
+        Returns:
+            bool: True once the chat is open and ready for typing
+
+        Raises:
+            InvalidPhoneError: If WhatsApp reports the phone is not on WhatsApp
+        """
+        digits = phone_digits(phone)
+        header = self.locators.find_optional(self.browser, "conversation_header")
+        previous_header = header.text if header is not None else None
+
+        def chat_opened(driver: Any) -> bool:
+            if not self.locators.visible("compose_box")(driver):
+                return False
+            active = driver.execute_script(ACTIVE_CHAT_SCRIPT)
+            if active is not None:
+                return active == digits
+            header = self.locators.find_optional(driver, "conversation_header")
+            return header is not None and header.text != previous_header
+
+        try:
+            self.browser.execute_script(OPEN_CHAT_LINK_SCRIPT, digits)
+            self._wait_for_chat(phone, "chat_open_in_app", chat_opened, IN_APP_OPEN_TIMEOUT)
+            return True
+        except InvalidPhoneError:
+            raise
         except Exception as e:
-            Logger.error(f"Could not send message to {phone}: {e}")
+            Logger.warn(f"In-app navigation to {phone} failed, reloading instead: {e}")
             return False
+        finally:
+            self._close_extra_windows()
+
+    def _close_extra_windows(self) -> None:
+        """Close tabs opened by a deep link the app did not intercept."""
+        if not self._main_window or len(self.browser.window_handles) < 2:
+            return
+        for handle in self.browser.window_handles:
+            if handle != self._main_window:
+                self.browser.switch_to.window(handle)
+                self.browser.close()
+        self.browser.switch_to.window(self._main_window)
+
+    def _type_message(self, message: str) -> None:
+        """
+        Type a message in the compose box of the open chat.
+
+        Lines separated by "\\n" are joined with Shift+Enter, which breaks the
+        line without sending.
+
+        Args:
+            message (str): Message text with "\\n" line markers
+        """
+        compose_box = self.waiter.until(
+            "compose_box",
+            self.locators.clickable("compose_box"),
+            SHORT_WAIT_TIMEOUT
+        )
+        compose_box.click()
+        # Drop any draft left in the chat
+        compose_box.send_keys(Keys.CONTROL + "a", Keys.BACKSPACE)
+        self._type_lines(compose_box, message)
+
+    @staticmethod
+    def _type_lines(element: Any, text: str) -> None:
+        """Type text in an editable element, breaking lines at "\\n" with Shift+Enter."""
+        for index, line in enumerate(text.split("\\n")):
+            if index:
+                element.send_keys(Keys.SHIFT + Keys.ENTER)
+            if line:
+                element.send_keys(line)
+
+    def _open_chat_by_url(self, phone: str, message: str) -> None:
+        """
+        Open the chat with a phone by reloading WhatsApp Web on its send URL.
+
+        Args:
+            phone (str): Recipient phone number
+            message (str): Message text, prefilled through the URL
+
+        Raises:
+            InvalidPhoneError: If WhatsApp reports the phone is not on WhatsApp
+        """
+        url = f"{self.base_url}/send?phone={phone_digits(phone)}&text={url_encode(message)}"
+
+        self.browser.get(url)
+
+        # Wait for the chat footer to be available
+        self._wait_for_chat(
+            phone, "chat_footer", self.locators.visible("chat_footer"), ELEMENT_WAIT_TIMEOUT
+        )
+
+    def _wait_for_chat(
+        self,
+        phone: str,
+        step: str,
+        opened: Callable[[Any], Any],
+        timeout: float
+    ) -> None:
+        """
+        Wait for a chat to open, or for WhatsApp to reject its phone.
+
+        The invalid number dialog is raced against the chat, so a phone that
+        is not on WhatsApp fails as soon as the dialog shows up instead of
+        after the whole timeout.
+
+        Args:
+            phone (str): Phone of the chat being opened
+            step (str): Name of the wait in the wait statistics
+            opened (Callable[[Any], Any]): Condition met once the chat is open
+            timeout (float): Seconds to wait for either outcome
+
+        Raises:
+            InvalidPhoneError: If the invalid number dialog showed up
+            TimeoutException: If neither happened within the timeout
+        """
+        def opened_or_rejected(driver: Any) -> Optional[str]:
+            if self.locators.find_optional(driver, "invalid_phone_dialog") is not None:
+                return "invalid"
+            return "opened" if opened(driver) else None
+
+        if self.waiter.until(step, opened_or_rejected, timeout) != "invalid":
+            return
+
+        ok_button = self.locators.find_optional(self.browser, "popup_ok_button")
+        if ok_button is not None:
+            ok_button.click()
+        else:
+            ActionChains(self.browser).send_keys(Keys.ESCAPE).perform()
+        try:
+            # A dialog left open would reject the next in-app chat as well
+            self.waiter.until_not(
+                "invalid_dialog_closed",
+                self.locators.present("invalid_phone_dialog"),
+                SHORT_WAIT_TIMEOUT
+            )
+        except TimeoutException:
+            Logger.warn("The invalid number dialog did not close")
+        raise InvalidPhoneError(f"{phone} is not on WhatsApp")
+
+    def get_wait_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get how long each wait step actually took.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Aggregated timings keyed by step name
+        """
+        return self.waiter.stats() if self.waiter else {}
+
+    def get_locator_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get how often each locator resolved and through which candidate.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Resolution counters keyed by locator name
+        """
+        return self.locators.stats()
+
+    def get_browser_stats(self) -> Dict[str, Any]:
+        """
+        Get the memory used by the browser processes and the page load time.
+
+        Returns:
+            Dict[str, Any]: Browser resource figures, see browser_stats.collect,
+            plus the peak memory sampled, the uptime and the messages and page
+            reloads since the browser started
+        """
+        if not self.browser:
+            return {}
+        stats = browser_stats.collect(self.browser)
+        stats.update({
+            "lean": self.lean,
+            "peak_rss_mb": self.peak_memory.rss_mb if self.peak_memory else stats["rss_mb"],
+            "uptime_s": round(time.monotonic() - self._launched_at, 1),
+            "messages": self.messages,
+            "page_reloads": self.page_reloads,
+        })
+        return stats
+
+    def sample_memory(self, force: bool = False) -> Optional[browser_stats.MemoryUsage]:
+        """
+        Measure the browser's resident memory, at most every MEMORY_SAMPLE_INTERVAL.
+
+        Args:
+            force (bool): Measure even if the last sample is recent
+
+        Returns:
+            Optional[browser_stats.MemoryUsage]: The latest sample, None if
+            memory cannot be read on this host
+        """
+        now = time.monotonic()
+        if not force and self._sampled_at is not None and now - self._sampled_at < MEMORY_SAMPLE_INTERVAL:
+            return self.memory
+        self._sampled_at = now
+
+        pid = browser_stats.browser_pid(self.browser) if self.browser else None
+        self.memory = browser_stats.process_tree_memory(pid) if pid else None
+        if self.memory:
+            if not self.peak_memory or self.memory.rss_bytes > self.peak_memory.rss_bytes:
+                self.peak_memory = self.memory
+            Logger.event(
+                "browser_memory", rss_mb=self.memory.rss_mb,
+                processes=self.memory.processes, messages=self.messages
+            )
+        return self.memory
+
+    def recycle_due(self) -> Optional[str]:
+        """
+        Tell whether the browser should be recycled before the next recipient.
+
+        A page reload releases what WhatsApp Web has piled up; when memory is
+        still over RECYCLE_RSS_MB after one, or the browser has been up for
+        too long or sent too many messages, only a relaunch helps.
+
+        Returns:
+            Optional[str]: "page" to reload WhatsApp Web, "browser" to
+            relaunch the whole browser, None if neither is needed
+        """
+        if not RECYCLE_ENABLED or not self.browser:
+            return None
+
+        if RECYCLE_MAX_UPTIME and time.monotonic() - self._launched_at >= RECYCLE_MAX_UPTIME:
+            return "browser"
+        if RECYCLE_BROWSER_MESSAGES and self.messages >= RECYCLE_BROWSER_MESSAGES:
+            return "browser"
+
+        memory = self.sample_memory()
+        if RECYCLE_RSS_MB and memory and memory.rss_mb >= RECYCLE_RSS_MB:
+            if self._reloaded_over_limit:
+                return "browser"
+            self._reloaded_over_limit = True
+            return "page"
+        self._reloaded_over_limit = False
+
+        if RECYCLE_PAGE_MESSAGES and self._messages_since_reload >= RECYCLE_PAGE_MESSAGES:
+            return "page"
+        return None
+
+    @Logger.timed("reload_page")
+    def reload_page(self) -> None:
+        """Reload WhatsApp Web on its main page, releasing the memory it holds."""
+        self.browser.get(f"{self.base_url}/")
+        self.waiter.until(
+            "page_reload",
+            self.locators.visible("pane_side"),
+            ELEMENT_WAIT_TIMEOUT
+        )
+        self.page_reloads += 1
+        self._messages_since_reload = 0
+        # Measure the effect of the reload before the next decision
+        self._sampled_at = None
+
+    def get_throttle_stats(self) -> Dict[str, Any]:
+        """
+        Get the current send rate and how much of the send caps is used.
+
+        Returns:
+            Dict[str, Any]: Throttle state of the account
+        """
+        return self.throttle.stats()
 
     def cleanup(self) -> None:
         """Clean up browser resources."""
@@ -303,4 +1532,7 @@ class WhatsAppBot:
                 self.browser.quit()
                 Logger.info("Browser closed")
             except Exception as e:
-                Logger.error(f"Error closing browser: {e}")
\ No newline at end of file
+                Logger.error(f"Error closing browser: {e}")
+            finally:
+                self.browser = None
+        self.profile.release()
\ No newline at end of file